@@ -0,0 +1,138 @@
+import argparse
+import copy
+import json
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, Set
+
+# Local imports
+from config import LLM_CONFIG, BATCH_CONFIG, TRACING_CONFIG
+from research_agent import build_research_agents, run_research_query
+from tools import tracing
+from tools.evaluation_tool import evaluate_response, evaluate_responses
+
+
+# ======================
+# Batch Query Runner
+# ======================
+def load_queries(input_path: str) -> Iterator[Dict]:
+    """
+    Reads a JSONL file of queries. Each line is either {"id": ..., "query": ...}
+    or a bare JSON string; missing ids default to the 1-based line number.
+    """
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, str):
+                record = {"query": record}
+            record.setdefault("id", str(line_number))
+            record["id"] = str(record["id"])
+            yield record
+
+
+def load_checkpoint(checkpoint_path: str) -> Set[str]:
+    if not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def per_worker_llm_config(max_workers: int) -> Dict:
+    """
+    autogen applies api_rate_limit per client, and every worker owns its own
+    agents, so the configured rate is split across workers to keep the
+    aggregate request rate at or below the value in config.py.
+    """
+    llm_config = copy.deepcopy(LLM_CONFIG)
+    for entry in llm_config["config_list"]:
+        if entry.get("api_rate_limit"):
+            entry["api_rate_limit"] = entry["api_rate_limit"] / max_workers
+    return llm_config
+
+
+def run_batch(input_path: str, output_path: str, checkpoint_path: str = None,
+              max_workers: int = BATCH_CONFIG["max_workers"], evaluate: bool = True,
+              deferred_evaluation: bool = False) -> Dict:
+    """
+    Runs every query in input_path through its own agent pair on a bounded
+    thread pool. Each result is appended to output_path as soon as it finishes,
+    and its id is recorded in checkpoint_path so an interrupted run can resume.
+    With deferred_evaluation, the critic scores all responses of this run in
+    batches at the end and writes them to <output_path>.evaluations.jsonl.
+    """
+    checkpoint_path = checkpoint_path or f"{output_path}.done"
+    completed = load_checkpoint(checkpoint_path)
+    records = list(load_queries(input_path))
+    pending = [record for record in records if record["id"] not in completed]
+    llm_config = per_worker_llm_config(max_workers)
+    write_lock = threading.Lock()
+    # The checkpoint may also hold ids of other input files written to the same output.
+    summary = {"skipped": len(records) - len(pending), "succeeded": 0, "failed": 0}
+    finished = []
+
+    print(f"Batch: {len(pending)} queries to run, {summary['skipped']} already completed, {max_workers} workers.")
+
+    def process(record: Dict) -> Dict:
+        result = {"id": record["id"], "query": record["query"]}
+        try:
+            response = run_research_query(record["query"], agents=build_research_agents(llm_config))
+            result["response"] = response
+            if evaluate and not deferred_evaluation:
+                result["evaluation"] = evaluate_response(record["query"], response, llm_config)
+        except Exception as e:
+            result["error"] = str(e)
+            traceback.print_exc()
+        return result
+
+    with open(output_path, "a", encoding="utf-8") as output_file, \
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint_file, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(process, record) for record in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            with write_lock:
+                output_file.write(json.dumps(result) + "\n")
+                output_file.flush()
+                if "error" in result:
+                    summary["failed"] += 1
+                else:
+                    # Failed queries are left out of the checkpoint so a rerun retries them.
+                    checkpoint_file.write(result["id"] + "\n")
+                    checkpoint_file.flush()
+                    summary["succeeded"] += 1
+                    finished.append(result)
+            print(f"[{result['id']}] {'failed' if 'error' in result else 'done'}")
+
+    if evaluate and deferred_evaluation and finished:
+        evaluations = evaluate_responses([(result["query"], result["response"]) for result in finished])
+        with open(f"{output_path}.evaluations.jsonl", "a", encoding="utf-8") as evaluations_file:
+            for result, evaluation in zip(finished, evaluations):
+                evaluations_file.write(json.dumps({"id": result["id"], "evaluation": evaluation}) + "\n")
+        summary["evaluated"] = len(evaluations)
+
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a JSONL file of research queries through the agent pipeline.")
+    parser.add_argument("input", help="JSONL file of queries.")
+    parser.add_argument("output", help="JSONL file results are appended to.")
+    parser.add_argument("--checkpoint", help="File of completed query ids (default: <output>.done).")
+    parser.add_argument("--workers", type=int, default=BATCH_CONFIG["max_workers"], help="Number of concurrent queries.")
+    parser.add_argument("--no-evaluate", action="store_true", help="Skip critic evaluation.")
+    parser.add_argument("--deferred-evaluation", action="store_true",
+                        help="Evaluate all responses in batched critic calls after the run.")
+    args = parser.parse_args()
+
+    if TRACING_CONFIG["prometheus_port"]:
+        tracing.METRICS.serve(TRACING_CONFIG["prometheus_port"])
+
+    summary = run_batch(args.input, args.output, args.checkpoint, args.workers, evaluate=not args.no_evaluate,
+                        deferred_evaluation=args.deferred_evaluation)
+    print(json.dumps(summary, indent=2))
+    tracing.export_telemetry(TRACING_CONFIG)
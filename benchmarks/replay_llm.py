@@ -0,0 +1,139 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Union
+
+from tools.model_clients import register_model_client_class
+from tools.query_parser import parse_structured_query, project_tool_result
+
+
+# ======================
+# Replay Model Client
+# ======================
+@register_model_client_class
+class ReplayModelClient:
+    """
+    autogen custom model client that answers from recorded completions instead of
+    calling an LLM. Enable it with a config_list entry such as
+
+        {"model": "replay", "model_client_cls": "ReplayModelClient",
+         "recordings_path": "benchmarks/fixtures/llm_recordings.json"}
+
+    Recordings are keyed by the user query and hold the assistant's tool call
+    arguments, its final answer, the critic's evaluation and the recorded latency
+    of each. Queries without a recording fall back to the rule-based parser and a
+    projection of the tool output, so any simple query can be replayed.
+    """
+
+    # Shared across instances so the harness can attribute time to LLM turns.
+    stats_lock = threading.Lock()
+    stats = {"calls": 0, "seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def __init__(self, config: Dict, **kwargs):
+        self.model = config.get("model", "replay")
+        self.latency_scale = float(config.get("latency_scale", 1.0))
+        self.recordings = {}
+        if config.get("recordings_path"):
+            with open(config["recordings_path"], "r", encoding="utf-8") as f:
+                self.recordings = {record["query"]: record for record in json.load(f)}
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        with cls.stats_lock:
+            cls.stats = {"calls": 0, "seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def create(self, params: Dict) -> SimpleNamespace:
+        started = time.perf_counter()
+        messages = params.get("messages", [])
+        recording = self._find_recording(messages)
+
+        if any(m.get("role") == "system" and "AI Critic" in (m.get("content") or "") for m in messages):
+            message = self._critic_message(recording)
+            latency_ms = recording.get("critic_latency_ms", 0) if recording else 0
+        elif messages and messages[-1].get("role") == "tool":
+            message = self._final_answer_message(recording, messages[-1].get("content") or "[]")
+            latency_ms = recording.get("final_latency_ms", 0) if recording else 0
+        else:
+            message = self._tool_call_message(recording, messages)
+            latency_ms = recording.get("tool_call_latency_ms", 0) if recording else 0
+
+        if latency_ms and self.latency_scale:
+            time.sleep(latency_ms * self.latency_scale / 1000)
+
+        prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+        completion_tokens = len(json.dumps(message)) // 4
+        with self.stats_lock:
+            self.stats["calls"] += 1
+            self.stats["seconds"] += time.perf_counter() - started
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)],
+            model=self.model,
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                  total_tokens=prompt_tokens + completion_tokens),
+        )
+
+    def message_retrieval(self, response) -> List[Union[str, Dict]]:
+        message = response.choices[0].message
+        if message.get("tool_calls"):
+            return [message]
+        return [message["content"]]
+
+    def cost(self, response) -> float:
+        return 0.0
+
+    @staticmethod
+    def get_usage(response) -> Dict:
+        return {
+            "prompt_tokens": response.usage.prompt_tokens,
+            "completion_tokens": response.usage.completion_tokens,
+            "total_tokens": response.usage.total_tokens,
+            "cost": 0.0,
+            "model": response.model,
+        }
+
+    def _find_recording(self, messages: List[Dict]) -> Optional[Dict]:
+        for message in messages:
+            content = message.get("content")
+            if message.get("role") != "user" or not isinstance(content, str):
+                continue
+            for query, recording in self.recordings.items():
+                if query in content:
+                    return recording
+        return None
+
+    @staticmethod
+    def _critic_message(recording: Optional[Dict]) -> Dict:
+        evaluation = (recording or {}).get("evaluation") or {
+            "completeness": 3, "quality": 3, "robustness": 3, "consistency": 3, "specificity": 3,
+            "feedback": "Replayed default evaluation."
+        }
+        return {"role": "assistant", "content": json.dumps(evaluation)}
+
+    @staticmethod
+    def _final_answer_message(recording: Optional[Dict], tool_content: str) -> Dict:
+        final = (recording or {}).get("final")
+        if final is None:
+            final = project_tool_result(tool_content) or "[]"
+        return {"role": "assistant", "content": final}
+
+    @staticmethod
+    def _tool_call_message(recording: Optional[Dict], messages: List[Dict]) -> Dict:
+        arguments = (recording or {}).get("tool_call")
+        if arguments is None:
+            query = next((m.get("content") for m in messages if m.get("role") == "user"), "") or ""
+            arguments = parse_structured_query(query) or {
+                "topic": query, "year": 2000, "comparison": "after", "min_citations": 0
+            }
+        return {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": f"call_{abs(hash(json.dumps(arguments, sort_keys=True))) % 10 ** 8}",
+                "type": "function",
+                "function": {"name": "search_research_papers", "arguments": json.dumps(arguments)},
+            }],
+        }
@@ -0,0 +1,222 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+# Local imports
+import research_agent
+from benchmarks.replay_llm import ReplayModelClient
+from benchmarks.stub_arxiv_server import StubArxivServer
+from config import RESULT_PAYLOAD_CONFIG
+from tools.atom_parser import AtomFeedParser
+from tools.evaluation_tool import evaluate_response
+from tools.http_client import HttpClient
+from tools.websearch_tool import ResearchPaperSearchTool
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+# ======================
+# Timing Helpers
+# ======================
+class StageTimer:
+    """Thread-safe collection of per-stage durations in seconds."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - started)
+        return timed
+
+    def summary(self) -> Dict:
+        return {stage: summarize(values) for stage, values in self.samples.items()}
+
+
+def summarize(values: List[float]) -> Dict:
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def replay_llm_config(recordings_path: str, latency_scale: float) -> Dict:
+    return {
+        "config_list": [{
+            "model": "replay",
+            "model_client_cls": ReplayModelClient.__name__,
+            "recordings_path": recordings_path,
+            "latency_scale": latency_scale,
+        }],
+        "cache_seed": None,
+    }
+
+
+def load_queries(path: str) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line)["query"] for line in f if line.strip()]
+
+
+# ======================
+# Benchmarks
+# ======================
+def bench_xml_parse(feed_paths: List[str], repeats: int, scale: int) -> Dict:
+    """Parses the recorded feeds directly, plus one feed scaled up to `scale` times the entries."""
+    stub = StubArxivServer(feed_paths, repeat=scale)
+    feed = stub.render({"max_results": [str(len(stub.entries))]})
+
+    durations = []
+    entries = 0
+    for _ in range(repeats):
+        parser = AtomFeedParser()
+        started = time.perf_counter()
+        entries = sum(1 for _ in parser.iter_papers(_BytesReader(feed)))
+        durations.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    list(AtomFeedParser().iter_papers(_BytesReader(feed)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "feed_bytes": len(feed),
+        "entries": entries,
+        "timing": summarize(durations),
+        "entries_per_second": entries / statistics.fmean(durations) if durations else 0,
+        "peak_memory_bytes": peak,
+    }
+
+
+def bench_pipeline(queries: List[str], llm_config: Dict, search_tool: ResearchPaperSearchTool,
+                   concurrency: int, evaluate: bool) -> Dict:
+    """Runs every query end to end (agent chat, tool call, critic) on `concurrency` threads."""
+    timer = StageTimer()
+    ReplayModelClient.reset_stats()
+    research_agent.search_tool = search_tool
+    search_tool.search = timer.wrap("tool_call", search_tool.search)
+
+    def run_one(query: str) -> None:
+        started = time.perf_counter()
+        agents = research_agent.build_research_agents(llm_config)
+        response = timer.wrap("agent_chat", research_agent.run_research_query)(
+            query, agents=agents, use_rules=False, use_cache=False
+        )
+        if evaluate:
+            # The evaluation cache persists across runs and iterations repeat queries, so it would time cache hits.
+            timer.wrap("critic_evaluation", evaluate_response)(query, response, llm_config, use_cache=False)
+        timer.record("end_to_end", time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(run_one, queries))
+    wall_seconds = time.perf_counter() - started
+
+    llm_stats = dict(ReplayModelClient.stats)
+    stages = timer.summary()
+    stages["llm_turn"] = {
+        "count": llm_stats["calls"],
+        "mean_ms": llm_stats["seconds"] / llm_stats["calls"] * 1000 if llm_stats["calls"] else 0,
+    }
+    return {
+        "concurrency": concurrency,
+        "queries": len(queries),
+        "wall_seconds": wall_seconds,
+        "throughput_qps": len(queries) / wall_seconds if wall_seconds else 0,
+        "stages": stages,
+        "llm_tokens": {"prompt": llm_stats["prompt_tokens"], "completion": llm_stats["completion_tokens"]},
+        # tracemalloc would distort the timings here, so report the process high-water mark instead.
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+class _BytesReader:
+    def __init__(self, data: bytes):
+        self._data = memoryview(data)
+        self._offset = 0
+
+    def read(self, size: int) -> bytes:
+        chunk = self._data[self._offset:self._offset + size].tobytes()
+        self._offset += len(chunk)
+        return chunk
+
+
+def run(args) -> Dict:
+    feed_paths = args.feed or [os.path.join(FIXTURES_DIR, "arxiv_horses_feed.xml")]
+    queries = load_queries(args.queries) * args.iterations
+    llm_config = replay_llm_config(args.recordings, args.llm_latency_scale)
+
+    stub = StubArxivServer(feed_paths, latency_ms=args.http_latency_ms)
+    stub.start()
+    try:
+        results = {
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            "settings": {
+                "queries": len(queries),
+                "llm_latency_scale": args.llm_latency_scale,
+                "http_latency_ms": args.http_latency_ms,
+                "fast_path": research_agent.FAST_PATH_CONFIG,
+            },
+            "xml_parse": bench_xml_parse(feed_paths, args.parse_repeats, args.parse_scale),
+            "pipeline": [],
+        }
+        for concurrency in args.concurrency:
+            search_tool = ResearchPaperSearchTool(http_client=HttpClient(), api_url=stub.url,
+                                                  payload_config=RESULT_PAYLOAD_CONFIG)
+            results["pipeline"].append(
+                bench_pipeline(queries, llm_config, search_tool, concurrency, evaluate=not args.no_evaluate)
+            )
+        results["http_requests"] = stub.requests
+        return results
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmark of the research agent pipeline.")
+    parser.add_argument("--queries", default=os.path.join(FIXTURES_DIR, "queries.jsonl"))
+    parser.add_argument("--recordings", default=os.path.join(FIXTURES_DIR, "llm_recordings.json"))
+    parser.add_argument("--feed", action="append", help="Recorded Atom feed to replay (repeatable).")
+    parser.add_argument("--iterations", type=int, default=5, help="How many times the query set is run.")
+    parser.add_argument("--concurrency", type=lambda value: [int(v) for v in value.split(",")], default=[1, 4, 8])
+    parser.add_argument("--llm-latency-scale", type=float, default=0.0,
+                        help="Multiplier for recorded LLM latencies (0 measures pipeline overhead only).")
+    parser.add_argument("--http-latency-ms", type=float, default=0.0)
+    parser.add_argument("--parse-repeats", type=int, default=20)
+    parser.add_argument("--parse-scale", type=int, default=50, help="Entry multiplier for the large-feed parse test.")
+    parser.add_argument("--no-evaluate", action="store_true")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    args = parser.parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
@@ -0,0 +1,97 @@
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+_ENTRY_PATTERN = re.compile(rb"<entry>.*?</entry>", re.DOTALL)
+_PUBLISHED_PATTERN = re.compile(rb"<published>(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2})")
+_DATE_RANGE_PATTERN = re.compile(r"submittedDate:\[(\d{12}) TO (\d{12})\]")
+
+FEED_HEADER = (
+    b'<?xml version="1.0" encoding="UTF-8"?>\n'
+    b'<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">\n'
+    b'  <title type="html">ArXiv Query (replayed)</title>\n'
+)
+
+
+# ======================
+# Stub arXiv API Server
+# ======================
+class StubArxivServer:
+    """
+    Local HTTP server that replays recorded arXiv Atom feeds. The entries of all
+    feeds are pooled, filtered by the submittedDate range in search_query (so the
+    pushed-down year filter behaves like the real API), and paged with
+    start/max_results. latency_ms adds a fixed delay per request.
+    """
+
+    def __init__(self, feed_paths: List[str], latency_ms: float = 0.0, repeat: int = 1):
+        self.latency_ms = latency_ms
+        self.entries: List[Tuple[str, bytes]] = []
+        for path in feed_paths:
+            with open(path, "rb") as f:
+                for entry in _ENTRY_PATTERN.findall(f.read()):
+                    published = _PUBLISHED_PATTERN.search(entry)
+                    if published:
+                        self.entries.append((b"".join(published.groups()).decode(), entry))
+        self.entries = self.entries * repeat
+        self.entries.sort(key=lambda item: item[0], reverse=True)
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/query"
+
+    def start(self) -> str:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency_ms:
+                    time.sleep(stub.latency_ms / 1000)
+                body = stub.render(parse_qs(urlparse(self.path).query))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/atom+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def render(self, params) -> bytes:
+        start = int(params.get("start", ["0"])[0])
+        max_results = int(params.get("max_results", ["10"])[0])
+        entries = self.entries
+        date_range = _DATE_RANGE_PATTERN.search(params.get("search_query", [""])[0])
+        if date_range:
+            low, high = date_range.groups()
+            entries = [item for item in entries if low <= item[0] <= high]
+        page = entries[start:start + max_results]
+        return b"".join([
+            FEED_HEADER,
+            f"  <opensearch:totalResults>{len(entries)}</opensearch:totalResults>\n".encode(),
+            f"  <opensearch:startIndex>{start}</opensearch:startIndex>\n".encode(),
+            f"  <opensearch:itemsPerPage>{max_results}</opensearch:itemsPerPage>\n".encode(),
+            *(entry + b"\n" for _, entry in page),
+            b"</feed>\n",
+        ])
@@ -0,0 +1,156 @@
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import json
+import sys
+from typing import Dict, Optional
+
+# Only light modules are imported here; each command imports what it needs, so
+# `search` never loads autogen and no command builds agents it doesn't use.
+from config import BATCH_CONFIG, TRACING_CONFIG
+from tools import tracing
+
+
+# ======================
+# Startup Timings
+# ======================
+class PhaseTimer:
+    """Wall time per startup phase, measured from when this module began importing."""
+
+    def __init__(self, started: float):
+        self.started = started
+        self._last = started
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        """Attributes the time since the previous mark to phase."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def report(self) -> Dict:
+        return {
+            "phases_ms": {phase: round(seconds * 1000, 1) for phase, seconds in self.phases.items()},
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "modules_loaded": len(sys.modules),
+        }
+
+
+# ======================
+# Commands
+# ======================
+def run_search(args, timer: PhaseTimer) -> None:
+    from research_agent import get_search_tool
+    timer.mark("import")
+    search_tool = get_search_tool()
+    timer.mark("setup")
+    payload = search_tool.search(args.topic, args.year, args.comparison, args.min_citations,
+                                 bypass_cache=args.bypass_cache, include_summary=args.include_summary or None)
+    timer.mark("run")
+    print(json.dumps(json.loads(payload), indent=2))
+
+
+def run_agent(args, timer: PhaseTimer) -> None:
+    from research_agent import is_final_json_list, run_research_query
+    timer.mark("import")
+    # Agents are only built if neither the semantic cache nor the rule-based fast path answers.
+    response = run_research_query(args.query, use_rules=args.rules, use_cache=not args.no_cache)
+    timer.mark("run")
+    # Fallback answers can be free text that merely starts with "[", so only a valid list is pretty-printed.
+    print(json.dumps(json.loads(response), indent=2) if is_final_json_list({"content": response}) else response)
+    if args.evaluate:
+        from tools.evaluation_tool import evaluate_response
+        timer.mark("import")
+        print(json.dumps(evaluate_response(args.query, response), indent=2))
+        timer.mark("evaluate")
+
+
+def run_evaluate(args, timer: PhaseTimer) -> None:
+    from tools.evaluation_tool import evaluate_response, evaluate_responses
+    timer.mark("import")
+    if args.pairs:
+        with open(args.pairs, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        evaluations = evaluate_responses([(record["query"], record["response"]) for record in records])
+        for record, evaluation in zip(records, evaluations):
+            print(json.dumps({"id": record.get("id"), "evaluation": evaluation}))
+    else:
+        if args.query is None or args.response is None:
+            raise SystemExit("evaluate needs QUERY and RESPONSE, or --pairs FILE.")
+        response = args.response
+        if response.startswith("@"):
+            with open(response[1:], "r", encoding="utf-8") as f:
+                response = f.read()
+        print(json.dumps(evaluate_response(args.query, response), indent=2))
+    timer.mark("run")
+
+
+def run_batch_command(args, timer: PhaseTimer) -> None:
+    from batch_runner import run_batch
+    timer.mark("import")
+    summary = run_batch(args.input, args.output, args.checkpoint, args.workers,
+                        evaluate=not args.no_evaluate, deferred_evaluation=args.deferred_evaluation)
+    timer.mark("run")
+    print(json.dumps(summary, indent=2))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Research paper agent. Add --timings to report startup cost; "
+                    "`python -X importtime cli.py ...` breaks imports down per module."
+    )
+    parser.add_argument("--timings", action="store_true", help="Print per-phase startup timings to stderr.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    search = subcommands.add_parser("search", help="Run the search tool directly, without the LLM.")
+    search.add_argument("topic")
+    search.add_argument("--year", type=int, required=True)
+    search.add_argument("--comparison", choices=["after", "before", "in"], default="after")
+    search.add_argument("--min-citations", type=int, default=0)
+    search.add_argument("--include-summary", action="store_true")
+    search.add_argument("--bypass-cache", action="store_true")
+    search.set_defaults(handler=run_search)
+
+    agent = subcommands.add_parser("agent", help="Answer a natural-language query with the agent pair.")
+    agent.add_argument("query")
+    agent.add_argument("--rules", action="store_true", help="Answer simple queries with the rule-based parser.")
+    agent.add_argument("--no-cache", action="store_true", help="Skip the semantic query cache.")
+    agent.add_argument("--evaluate", action="store_true", help="Also score the response with the critic.")
+    agent.set_defaults(handler=run_agent)
+
+    evaluate = subcommands.add_parser("evaluate", help="Score responses with the critic.")
+    evaluate.add_argument("query", nargs="?")
+    evaluate.add_argument("response", nargs="?", help="Response text, or @FILE to read it from a file.")
+    evaluate.add_argument("--pairs", help="JSONL file of {\"id\", \"query\", \"response\"} to evaluate in batches.")
+    evaluate.set_defaults(handler=run_evaluate)
+
+    batch = subcommands.add_parser("batch", help="Run a JSONL file of queries (see batch_runner.py).")
+    batch.add_argument("input")
+    batch.add_argument("output")
+    batch.add_argument("--checkpoint")
+    batch.add_argument("--workers", type=int, default=BATCH_CONFIG["max_workers"])
+    batch.add_argument("--no-evaluate", action="store_true")
+    batch.add_argument("--deferred-evaluation", action="store_true")
+    batch.set_defaults(handler=run_batch_command)
+    return parser
+
+
+def main(argv: Optional[list] = None) -> None:
+    timer = PhaseTimer(_STARTED)
+    args = build_parser().parse_args(argv)
+    timer.mark("startup")
+
+    if TRACING_CONFIG["prometheus_port"]:
+        tracing.METRICS.serve(TRACING_CONFIG["prometheus_port"])
+    with tracing.span("cli.command", command=args.command):
+        args.handler(args, timer)
+    tracing.export_telemetry(TRACING_CONFIG)
+
+    if args.timings:
+        print(json.dumps(timer.report(), indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,14 @@
 import os
 
+try:
+    from dotenv import load_dotenv
+except ImportError:  # python-dotenv is optional when the environment is set directly
+    load_dotenv = None
+
+# Loaded before any setting below reads os.environ, so values from .env apply to all of them.
+if load_dotenv is not None:
+    load_dotenv()
+
 # ======================
 # Configuration
 # ======================
@@ -18,4 +27,144 @@ LLM_CONFIG = {
             "cache_seed": None,
         }
     ]
-}
\ No newline at end of file
+}
+
+# ======================
+# Search Cache
+# ======================
+SEARCH_CACHE_CONFIG = {
+    "path": os.getenv("SEARCH_CACHE_PATH", ".search_cache.sqlite"),
+    "ttl_seconds": 24 * 3600,
+    "max_entries": 1000,
+}
+
+# ======================
+# Batch Runs
+# ======================
+BATCH_CONFIG = {
+    "max_workers": 4,
+}
+
+# ======================
+# Fast Path
+# ======================
+FAST_PATH_CONFIG = {
+    # End the chat once the search tool returns valid papers instead of asking
+    # the LLM to re-serialize them.
+    "project_tool_results": True,
+    # Answer queries the rule-based parser understands without calling the LLM.
+    "rule_based_queries": False,
+}
+
+# ======================
+# Local Paper Index
+# ======================
+LOCAL_INDEX_CONFIG = {
+    # Path of a LocalPaperIndex database built with `python -m tools.local_index ingest`.
+    # When set, searches run offline against it instead of the arXiv API.
+    "path": os.getenv("LOCAL_INDEX_PATH"),
+}
+
+# ======================
+# Citation Store
+# ======================
+CITATION_STORE_CONFIG = {
+    # Path of a CitationStore file built with `python -m tools.citation_store`.
+    # When set, results carry citation counts and min_citations is enforced.
+    "path": os.getenv("CITATION_STORE_PATH"),
+}
+
+# ======================
+# Tool Result Payload
+# ======================
+RESULT_PAYLOAD_CONFIG = {
+    # Fields returned to the LLM for each paper; citations are only included when numeric
+    # and sources only when federated search is enabled.
+    "fields": ["title", "authors", "year", "link", "citations", "sources"],
+    # Abstracts dominate the token count, so they are only sent on request.
+    "include_summary": False,
+    "summary_max_chars": 300,
+    "max_authors": 10,
+    # Drop whitespace from the JSON encoding.
+    "compact_json": True,
+}
+
+# ======================
+# Tracing & Metrics
+# ======================
+TRACING_CONFIG = {
+    # OTLP/JSON trace export written at the end of a run.
+    "otlp_json_path": os.getenv("TRACE_OTLP_JSON_PATH"),
+    # Prometheus text-format metrics file (e.g. for node_exporter's textfile collector).
+    "prometheus_textfile": os.getenv("METRICS_TEXTFILE_PATH"),
+    # Port for a /metrics HTTP endpoint; unset to disable.
+    "prometheus_port": int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None,
+}
+
+# ======================
+# Critic Evaluation
+# ======================
+EVALUATION_CONFIG = {
+    # SQLite cache of critic scores keyed by a hash of (query, response, model); unset to disable.
+    "cache_path": os.getenv("EVALUATION_CACHE_PATH", ".evaluation_cache.sqlite"),
+    "ttl_seconds": 30 * 24 * 3600,
+    "max_entries": 50000,
+    # Number of (query, response) pairs scored per critic call by evaluate_responses.
+    "batch_size": 8,
+    # Score empty/malformed responses with fixed rules instead of calling the critic.
+    "rule_based": True,
+}
+
+# ======================
+# Semantic Query Cache
+# ======================
+SEMANTIC_CACHE_CONFIG = {
+    # Caches final answers per research question (e.g. ".semantic_cache.sqlite"). Off unless both
+    # the path and the embedding model are set.
+    "path": os.getenv("SEMANTIC_CACHE_PATH"),
+    # sentence-transformers model (e.g. "all-MiniLM-L6-v2") run on the CPU to embed the topic text.
+    "embedding_model": os.getenv("SEMANTIC_CACHE_MODEL"),
+    # Minimum cosine similarity between topic embeddings for a cached answer to be reused.
+    "similarity_threshold": 0.85,
+    "max_entries": 2000,
+    "ttl_seconds": 7 * 24 * 3600,
+}
+
+# ======================
+# Federated Search
+# ======================
+FEDERATED_SEARCH_CONFIG = {
+    # Extra sources queried in parallel with arXiv (or the local index), e.g. "openalex";
+    # empty keeps single-source search.
+    "backends": [name.strip() for name in os.getenv("SEARCH_BACKENDS", "").split(",") if name.strip()],
+    # Sources that haven't answered by then are left out of the merged result.
+    "deadline_seconds": 10.0,
+}
+
+# ======================
+# Topic Watch Mode
+# ======================
+WATCH_CONFIG = {
+    # Per-topic high-water marks (newest published timestamp and recently seen arXiv ids).
+    "state_path": os.getenv("WATCH_STATE_PATH", ".watch_state.json"),
+    # Entries per request; a quiet topic needs just one request of this size.
+    "page_size": 10,
+    # Upper bound on new papers reported per topic and run.
+    "max_new_per_run": 100,
+    # With --forever, each topic is checked once per interval, staggered across it.
+    "interval_seconds": 24 * 3600,
+}
+
+# ======================
+# Columnar Result Store
+# ======================
+RESULT_STORE_CONFIG = {
+    # Directory of an append-only columnar store every search result is written to (e.g. "result_store");
+    # unset to disable.
+    "path": os.getenv("RESULT_STORE_PATH"),
+    # Answer repeat searches from the store instead of the search cache and arXiv. Off by default:
+    # rows are append-only, so stored citation counts and local-index results never refresh.
+    "serve_queries": False,
+    # With serve_queries, how long a stored search is reused before arXiv is asked again.
+    "query_ttl_seconds": 24 * 3600,
+}
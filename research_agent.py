@@ -1,25 +1,80 @@
-from autogen import AssistantAgent, UserProxyAgent, register_function
 import json
-from dotenv import load_dotenv
+import threading
 import traceback
+from typing import Optional
 
 # Local imports
-from config import LLM_CONFIG
-from tools.websearch_tool import ResearchPaperSearchTool
-from tools.evaluation_tool import evaluate_response
-
-load_dotenv() # load config
+from config import (
+    LLM_CONFIG, SEARCH_CACHE_CONFIG, FAST_PATH_CONFIG, LOCAL_INDEX_CONFIG, CITATION_STORE_CONFIG,
+    RESULT_PAYLOAD_CONFIG, TRACING_CONFIG, SEMANTIC_CACHE_CONFIG, FEDERATED_SEARCH_CONFIG,
+    RESULT_STORE_CONFIG,
+)
+from tools import tracing
+from tools.model_clients import activate_custom_model_clients
+from tools.query_parser import parse_structured_query, project_tool_result
 
 # ======================
 # Agent Setup
 # ======================
-search_tool = ResearchPaperSearchTool()
+# The search tool, the query cache and the agents are built on first use rather than
+# at import time, so importing this module (or running a command that never reaches
+# them) doesn't pay for autogen, the HTTP stack or opening the stores.
+search_tool = None
+query_cache = None
+_query_cache_ready = False
+_setup_lock = threading.Lock()
+
+def get_search_tool():
+    """Returns the shared ResearchPaperSearchTool, building it from config.py on first use."""
+    global search_tool
+    with _setup_lock:
+        if search_tool is None:
+            from tools.citation_store import CitationStore
+            from tools.local_index import LocalPaperIndex
+            from tools.result_store import ColumnarResultStore
+            from tools.search_backends import build_search_backends
+            from tools.search_cache import SearchCache
+            from tools.websearch_tool import ResearchPaperSearchTool
+
+            search_tool = ResearchPaperSearchTool(
+                cache=SearchCache(**SEARCH_CACHE_CONFIG),
+                local_index=LocalPaperIndex(LOCAL_INDEX_CONFIG["path"]) if LOCAL_INDEX_CONFIG["path"] else None,
+                citation_store=CitationStore(CITATION_STORE_CONFIG["path"]) if CITATION_STORE_CONFIG["path"] else None,
+                payload_config=RESULT_PAYLOAD_CONFIG,
+                backends=build_search_backends(FEDERATED_SEARCH_CONFIG["backends"]),
+                deadline_seconds=FEDERATED_SEARCH_CONFIG["deadline_seconds"],
+                result_store=ColumnarResultStore(
+                    RESULT_STORE_CONFIG["path"], query_ttl_seconds=RESULT_STORE_CONFIG["query_ttl_seconds"]
+                ) if RESULT_STORE_CONFIG["path"] else None,
+                serve_from_result_store=RESULT_STORE_CONFIG["serve_queries"]
+            )
+        return search_tool
+
+def get_query_cache():
+    """Returns the shared SemanticQueryCache, or None if it is disabled in config.py."""
+    global query_cache, _query_cache_ready
+    with _setup_lock:
+        if not _query_cache_ready:
+            if SEMANTIC_CACHE_CONFIG["path"] and SEMANTIC_CACHE_CONFIG["embedding_model"]:
+                from tools.semantic_cache import SemanticQueryCache, get_embedder
+
+                embedder = get_embedder(SEMANTIC_CACHE_CONFIG["embedding_model"])
+                if embedder is not None:
+                    query_cache = SemanticQueryCache(
+                        path=SEMANTIC_CACHE_CONFIG["path"],
+                        embedder=embedder,
+                        similarity_threshold=SEMANTIC_CACHE_CONFIG["similarity_threshold"],
+                        max_entries=SEMANTIC_CACHE_CONFIG["max_entries"],
+                        ttl_seconds=SEMANTIC_CACHE_CONFIG["ttl_seconds"],
+                    )
+            _query_cache_ready = True
+        return query_cache
 
 search_tool_spec = {
     "type": "function",
     "function": {
         "name": "search_research_papers",
-        "description": "Search academic papers on arXiv based on topic, year, and comparison type.",
+        "description": "Search academic papers on arXiv (and any other configured sources) based on topic, year, and comparison type.",
         "parameters": {
             "type": "object",
             "properties": {
@@ -31,7 +86,9 @@ search_tool_spec = {
                     "description": "Specify relation to the year: 'after' (published after year), 'before' (published before year), 'in' (published in that exact year)."
                 },
                 "min_citations": {"type": "integer",
-                                  "description": "Minimum number of citations."}
+                                  "description": "Minimum number of citations."},
+                "include_summary": {"type": "boolean",
+                                    "description": "Include a truncated abstract for each paper. Only set this when the user asks about paper contents."}
             },
             "required": ["topic", "year", "comparison"]
         }
@@ -46,15 +103,6 @@ If no papers are found for the query, you MUST return an empty JSON list: [].
 Do NOT include any introductory text, concluding text, explanations, apologies, summaries, or any other conversational filler in your response. Your entire output must be the JSON list itself, starting with '[' and ending with ']'.
 Adhere strictly to the 'comparison' parameter values ('after', 'before', 'in') when searching by year."""
 
-assistant = AssistantAgent(
-    name="research_assistant",
-    system_message=ASSISTANT_SYSTEM_MESSAGE,
-    llm_config={
-        **LLM_CONFIG,
-        "tools": [search_tool_spec]
-    }
-)
-
 def is_final_json_list(message_dict) -> bool:
     """
     Checks if the message content is a string that starts with '[' and ends with ']',
@@ -71,59 +119,224 @@ def is_final_json_list(message_dict) -> bool:
                 return False
     return False
 
-def search_wrapper(topic: str, year: int, comparison: str, min_citations: int) -> str:
-    try:
-        return search_tool.search(topic, year, comparison, min_citations)
-    except Exception as e:
-        print(f"Error during search_tool.search: {e}")
-        return "[]"
-
-user_proxy = UserProxyAgent(
-    name="user_proxy",
-    human_input_mode="NEVER",
-    max_consecutive_auto_reply=3,
-    code_execution_config=False,
-    is_termination_msg=is_final_json_list
-)
+def project_tool_message(message_dict) -> Optional[str]:
+    """
+    If the message carries search tool output that is a clean list of papers,
+    returns it projected onto the final answer schema; otherwise None.
+    """
+    if message_dict.get("tool_responses"):
+        contents = [response.get("content") for response in message_dict["tool_responses"]]
+    elif message_dict.get("role") in ("tool", "function"):
+        contents = [message_dict.get("content")]
+    else:
+        return None
 
-register_function(
-    search_wrapper,
-    caller=assistant,
-    executor=user_proxy,
-    name="search_research_papers",
-    description="Search arXiv for academic papers based on topic, year, and comparison type."
-)
+    papers = []
+    for content in contents:
+        projected = project_tool_result(content)
+        if projected is None:
+            return None
+        papers.extend(json.loads(projected))
+    return json.dumps(papers)
+
+def is_final_tool_result(message_dict) -> bool:
+    """
+    Termination check for the assistant in fast-path mode: once the tool has returned
+    valid papers, the answer is already known and the second LLM turn is skipped.
+    """
+    return project_tool_message(message_dict) is not None
+
+def search_wrapper(topic: str, year: int, comparison: str, min_citations: int, include_summary: bool = False) -> str:
+    with tracing.span("tool.search_research_papers"):
+        try:
+            return get_search_tool().search(topic, year, comparison, min_citations, include_summary=include_summary)
+        except Exception as e:
+            print(f"Error during search_tool.search: {e}")
+            return "[]"
+
+async def asearch_wrapper(topic: str, year: int, comparison: str, min_citations: int, include_summary: bool = False) -> str:
+    with tracing.span("tool.search_research_papers"):
+        try:
+            return await get_search_tool().asearch(topic, year, comparison, min_citations, include_summary=include_summary)
+        except Exception as e:
+            print(f"Error during search_tool.asearch: {e}")
+            return "[]"
+
+def build_research_agents(llm_config: dict = LLM_CONFIG, use_async: bool = False,
+                          fast_path: bool = FAST_PATH_CONFIG["project_tool_results"]):
+    """
+    Creates a fresh (assistant, user_proxy) pair with the search tool registered.
+    Each pair keeps its own chat_messages, so concurrent queries must not share one.
+    With use_async the tool is backed by asearch_wrapper, for use with a_initiate_chat.
+    With fast_path the chat ends as soon as the tool returns valid papers.
+    """
+    from autogen import AssistantAgent, UserProxyAgent, register_function
+
+    assistant = AssistantAgent(
+        name="research_assistant",
+        system_message=ASSISTANT_SYSTEM_MESSAGE,
+        llm_config={
+            **llm_config,
+            "tools": [search_tool_spec]
+        },
+        is_termination_msg=is_final_tool_result if fast_path else None
+    )
+
+    user_proxy = UserProxyAgent(
+        name="user_proxy",
+        human_input_mode="NEVER",
+        max_consecutive_auto_reply=3,
+        code_execution_config=False,
+        is_termination_msg=is_final_json_list
+    )
+
+    register_function(
+        asearch_wrapper if use_async else search_wrapper,
+        caller=assistant,
+        executor=user_proxy,
+        name="search_research_papers",
+        description="Search arXiv for academic papers based on topic, year, and comparison type."
+    )
+    activate_custom_model_clients(assistant, llm_config)
+    tracing.trace_llm_calls(assistant)
+    return assistant, user_proxy
+
+def extract_final_response(assistant, user_proxy) -> str:
+    """
+    Picks the final JSON list out of the conversation (the assistant's answer, or the
+    projected tool output when the fast path ended the chat early), falling back to
+    the last assistant or user_proxy message, and finally to an empty list.
+    """
+    all_messages = user_proxy.chat_messages.get(assistant, [])
+    for msg in reversed(all_messages):
+        if msg.get("role") == "assistant" and is_final_json_list(msg):
+            return msg["content"].strip()
+        projected = project_tool_message(msg)
+        if projected is not None:
+            return projected
+
+    last_assistant_message = next((m for m in reversed(all_messages) if m.get("role") == "assistant"), None)
+    if last_assistant_message and last_assistant_message.get("content"):
+        return str(last_assistant_message["content"]).strip()
+
+    last_user_proxy_message = user_proxy.last_message(assistant)
+    if last_user_proxy_message and last_user_proxy_message.get("content"):
+        return str(last_user_proxy_message["content"]).strip()
+
+    print("Warning: No substantive response captured from the assistant. Defaulting to empty list.")
+    return "[]"
+
+def answer_structured_query(query: str) -> Optional[str]:
+    """
+    Answers simple queries without the LLM: the rule-based parser extracts the
+    search arguments and the tool output is projected straight to the final list.
+    Returns None if the query can't be parsed or the search reported an error.
+    """
+    search_args = parse_structured_query(query)
+    if search_args is None:
+        return None
+    return project_tool_result(search_wrapper(**search_args))
+
+def _cached_answer(query: str) -> Optional[str]:
+    cache = get_query_cache()
+    if cache is None:
+        return None
+    answer = cache.get(query, scope=get_search_tool().config_fingerprint())
+    if answer is not None:
+        tracing.set_attribute("fast_path", "semantic_cache")
+    return answer
+
+def _remember_answer(query: str, answer: str) -> None:
+    # Empty lists are also what a failed chat falls back to, so only real answers are kept.
+    if not (is_final_json_list({"content": answer}) and json.loads(answer)):
+        return
+    cache = get_query_cache()
+    if cache is not None:
+        cache.set(query, answer, scope=get_search_tool().config_fingerprint())
+
+async def aanswer_structured_query(query: str) -> Optional[str]:
+    search_args = parse_structured_query(query)
+    if search_args is None:
+        return None
+    return project_tool_result(await asearch_wrapper(**search_args))
+
+def run_research_query(query: str, agents=None, use_rules: bool = FAST_PATH_CONFIG["rule_based_queries"],
+                       use_cache: bool = True) -> str:
+    """
+    Runs one query through an agent pair and returns the final response content.
+    A new pair is built unless one is passed in. With use_cache, an answer to a
+    similar earlier question is returned from the semantic query cache; with
+    use_rules, queries the rule-based parser understands skip the LLM entirely.
+    """
+    with tracing.span("agent.query", query=query) as query_span:
+        cached = _cached_answer(query) if use_cache else None
+        if cached is not None:
+            return cached
+
+        answer = _rule_based_answer(answer_structured_query(query)) if use_rules else None
+        if answer is None:
+            assistant, user_proxy = agents or build_research_agents()
+            with tracing.span("agent.chat"):
+                user_proxy.initiate_chat(
+                    assistant,
+                    message=query,
+                    clear_history=True
+                )
+            answer = _chat_answer(query_span, assistant, user_proxy)
+        if use_cache:
+            _remember_answer(query, answer)
+        return answer
+
+async def arun_research_query(query: str, agents=None, use_rules: bool = FAST_PATH_CONFIG["rule_based_queries"],
+                              use_cache: bool = True) -> str:
+    """
+    Async counterpart of run_research_query; agents must be built with use_async=True.
+    The semantic cache (sqlite plus the embedding model) is consulted in a worker
+    thread. Searches use a per-loop arXiv client, so await
+    tools.http_client.aclose_async_clients() before the event loop ends.
+    """
+    import asyncio
+
+    with tracing.span("agent.query", query=query) as query_span:
+        cached = await asyncio.to_thread(_cached_answer, query) if use_cache else None
+        if cached is not None:
+            return cached
+
+        answer = _rule_based_answer(await aanswer_structured_query(query)) if use_rules else None
+        if answer is None:
+            assistant, user_proxy = agents or build_research_agents(use_async=True)
+            with tracing.span("agent.chat"):
+                await user_proxy.a_initiate_chat(
+                    assistant,
+                    message=query,
+                    clear_history=True
+                )
+            answer = _chat_answer(query_span, assistant, user_proxy)
+        if use_cache:
+            await asyncio.to_thread(_remember_answer, query, answer)
+        return answer
+
+def _rule_based_answer(answer: Optional[str]) -> Optional[str]:
+    if answer is not None:
+        tracing.set_attribute("fast_path", "rule_based")
+    return answer
+
+def _chat_answer(query_span, assistant, user_proxy) -> str:
+    if query_span is not None:
+        query_span.set_attribute("chat.messages", len(user_proxy.chat_messages.get(assistant, [])))
+    return extract_final_response(assistant, user_proxy)
 
 if __name__ == "__main__":
+    if TRACING_CONFIG["prometheus_port"]:
+        tracing.METRICS.serve(TRACING_CONFIG["prometheus_port"])
+
     query = "Find papers about horses published after 2020 and has 10 citations"
 
     final_response_content = None
 
     try:
         print(f"User Query: {query}\n")
-        user_proxy.initiate_chat(
-            assistant,
-            message=query,
-            clear_history=True
-        )
-
-        all_messages = user_proxy.chat_messages.get(assistant, [])
-        for msg in reversed(all_messages):
-            if msg.get("role") == "assistant" and is_final_json_list(msg):
-                final_response_content = msg["content"].strip()
-                break
-
-        if final_response_content is None:
-            last_assistant_message = next((m for m in reversed(all_messages) if m.get("role") == "assistant"), None)
-            if last_assistant_message and last_assistant_message.get("content"):
-                final_response_content = str(last_assistant_message["content"]).strip()
-            else:
-                last_user_proxy_message = user_proxy.last_message(assistant)
-                if last_user_proxy_message and last_user_proxy_message.get("content"):
-                    final_response_content = str(last_user_proxy_message["content"]).strip()
-                else:
-                    final_response_content = "[]"
-                    print("Warning: No substantive response captured from the assistant. Defaulting to empty list.")
+        final_response_content = run_research_query(query)
 
         print("=== Formatted Agent Response ===")
         parsed_successfully = False
@@ -142,9 +355,20 @@ if __name__ == "__main__":
             final_response_content = str(final_response_content if final_response_content is not None else "[]")
 
         print("\n=== Evaluation ===")
+        from tools.evaluation_tool import evaluate_response
+
         evaluation = evaluate_response(query, final_response_content)
         print(json.dumps(evaluation, indent=2))
 
+        print("\n=== Tool Payload ===")
+        print(json.dumps(get_search_tool().payload_stats.snapshot(), indent=2))
+
+        if get_query_cache() is not None:
+            print("\n=== Semantic Query Cache ===")
+            print(json.dumps(get_query_cache().stats(), indent=2))
+
+        tracing.export_telemetry(TRACING_CONFIG)
+
     except Exception as e:
         print(f"\nMain execution failed: {str(e)}")
         traceback.print_exc()
\ No newline at end of file
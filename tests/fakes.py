@@ -0,0 +1,61 @@
+import io
+import re
+from contextlib import asynccontextmanager
+
+_DATE_RANGE_PATTERN = re.compile(r"submittedDate:\[(\d{12}) TO (\d{12})\]")
+
+
+class FakeResponse:
+    def __init__(self, body: bytes):
+        self.raw = io.BytesIO(body)
+
+    def close(self):
+        pass
+
+
+class FakeArxivClient:
+    """Serves an Atom feed from in-memory papers, honoring the date range, sort order and paging params."""
+
+    def __init__(self, published):
+        self.published = list(published)
+        self.requests = []
+
+    def get(self, url, params=None, stream=False):
+        self.requests.append(dict(params))
+        entries = self.published
+        date_range = _DATE_RANGE_PATTERN.search(params["search_query"])
+        if date_range:
+            low, high = date_range.groups()
+            entries = [p for p in entries if low <= "".join(ch for ch in p if ch.isdigit())[:12] <= high]
+        entries = sorted(entries, reverse=params["sortOrder"] == "descending")
+        page = entries[params["start"]:params["start"] + params["max_results"]]
+        body = (
+            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+            f"<opensearch:totalResults>{len(entries)}</opensearch:totalResults>"
+        )
+        for published in page:
+            arxiv_id = "".join(ch for ch in published if ch.isdigit())[2:12]
+            body += (
+                f"<entry><id>http://arxiv.org/abs/{arxiv_id[:4]}.{arxiv_id[4:]}v1</id>"
+                f"<published>{published}</published><title>Paper {published}</title>"
+                "<summary>s</summary><author><name>A</name></author></entry>"
+            )
+        return FakeResponse((body + "</feed>").encode())
+
+
+class FakeAsyncResponse:
+    def __init__(self, body: bytes, chunk_size: int = 64):
+        self.body = body
+        self.chunk_size = chunk_size
+
+    async def aiter_bytes(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+
+
+class FakeAsyncArxivClient(FakeArxivClient):
+    """Async counterpart of FakeArxivClient, streaming the same feed in small chunks."""
+
+    @asynccontextmanager
+    async def stream(self, url, params=None):
+        yield FakeAsyncResponse(self.get(url, params=params).raw.getvalue())
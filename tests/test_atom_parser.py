@@ -0,0 +1,53 @@
+import io
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from tools.atom_parser import AtomFeedParser
+
+FIXTURE = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "fixtures", "arxiv_horses_feed.xml")
+
+
+def test_iter_papers_reads_entries_and_total_results():
+    parser = AtomFeedParser()
+    with open(FIXTURE, "rb") as f:
+        papers = list(parser.iter_papers(f, chunk_size=1024))
+
+    assert parser.total_results == 60
+    assert parser.entry_count == len(papers) == 60
+    assert papers[0] == {
+        "title": "Horse behaviour with inertial sensors: study 1",
+        "authors": ["B. Dubois", "F. Smith", "M. Garcia", "A. Silva"],
+        "year": 2024,
+        "link": "http://arxiv.org/abs/2412.10000v1",
+        "summary": papers[0]["summary"],
+        "published": "2024-12-01T12:00:00Z",
+    }
+    assert papers[0]["summary"].startswith("We study horse behaviour")
+
+
+def test_feed_accepts_pushed_chunks():
+    with open(FIXTURE, "rb") as f:
+        data = f.read()
+    parser = AtomFeedParser()
+    papers = [paper for start in range(0, len(data), 100) for paper in parser.feed(data[start:start + 100])]
+    parser.close()
+
+    assert len(papers) == 60
+    assert parser.bytes_parsed == len(data)
+
+
+def test_entries_without_a_published_date_are_skipped():
+    feed = (b'<feed xmlns="http://www.w3.org/2005/Atom"><entry><title>No date</title></entry>'
+            b"<entry><title>Dated</title><published>2021-01-01T00:00:00Z</published></entry></feed>")
+    parser = AtomFeedParser()
+
+    assert [paper["title"] for paper in parser.iter_papers(io.BytesIO(feed))] == ["Dated"]
+    assert parser.entry_count == 2
+
+
+def test_truncated_feed_raises_parse_error():
+    parser = AtomFeedParser()
+    with pytest.raises(ET.ParseError):
+        list(parser.iter_papers(io.BytesIO(b'<feed xmlns="http://www.w3.org/2005/Atom"><entry>')))
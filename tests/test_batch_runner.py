@@ -0,0 +1,25 @@
+import json
+
+import batch_runner
+
+
+def test_resume_counts_only_this_input_and_splits_the_critic_rate(tmp_path, monkeypatch):
+    input_path = tmp_path / "queries.jsonl"
+    input_path.write_text('{"id": "a", "query": "horses"}\n"graph neural networks"\n', encoding="utf-8")
+    output_path = tmp_path / "results.jsonl"
+    # "a" is done already; "other" belongs to a different input file.
+    (tmp_path / "results.jsonl.done").write_text("a\nother\n", encoding="utf-8")
+
+    critic_configs = []
+    monkeypatch.setattr(batch_runner, "build_research_agents", lambda llm_config: None)
+    monkeypatch.setattr(batch_runner, "run_research_query", lambda query, agents=None: "[]")
+    monkeypatch.setattr(batch_runner, "evaluate_response",
+                        lambda query, response, llm_config: critic_configs.append(llm_config) or {"score": 1})
+
+    summary = batch_runner.run_batch(str(input_path), str(output_path), max_workers=4)
+
+    assert summary == {"skipped": 1, "succeeded": 1, "failed": 0}
+    assert [json.loads(line)["id"] for line in output_path.read_text().splitlines()] == ["2"]
+    expected = batch_runner.per_worker_llm_config(4)
+    assert critic_configs == [expected]
+    assert expected["config_list"][0]["api_rate_limit"] == batch_runner.LLM_CONFIG["config_list"][0]["api_rate_limit"] / 4
@@ -0,0 +1,31 @@
+from tools.citation_store import CitationStore, normalize_arxiv_id
+
+
+def test_normalize_arxiv_id():
+    assert normalize_arxiv_id("http://arxiv.org/abs/2101.00001v2") == "2101.00001"
+    assert normalize_arxiv_id("https://arxiv.org/pdf/2101.00001v1.pdf") == "2101.00001"
+    assert normalize_arxiv_id("arXiv:2101.00001") == "2101.00001"
+    assert normalize_arxiv_id("math.AG/0601001") == "math/0601001"
+    assert normalize_arxiv_id("") is None
+
+
+def test_build_and_lookup_with_collisions(tmp_path):
+    path = str(tmp_path / "citations.bin")
+    counts = [(f"2101.{n:05d}", n) for n in range(200)]
+
+    assert CitationStore.build(path, counts, load_factor=0.9) == 200
+    store = CitationStore(path)
+    assert all(store.get(f"http://arxiv.org/abs/2101.{n:05d}v3") == n for n in range(200))
+    assert store.get("2101.99999") is None
+    assert len(store) == 200
+    store.close()
+
+
+def test_build_merges_existing_entries(tmp_path):
+    path = str(tmp_path / "citations.bin")
+    CitationStore.build(path, [("2101.00001", 5), ("2101.00002", 7)])
+    CitationStore.build(path, [("2101.00002", 9), ("2101.00003", 1)])
+
+    store = CitationStore(path)
+    assert dict(store.items()) == {"2101.00001": 5, "2101.00002": 9, "2101.00003": 1}
+    store.close()
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+import cli
+import research_agent
+
+
+class StubSearchTool:
+    def __init__(self):
+        self.calls = []
+
+    def search(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return '[{"title": "A"}]'
+
+
+def test_parser_applies_defaults_and_rejects_unknown_comparisons():
+    args = cli.build_parser().parse_args(["search", "horses", "--year", "2020"])
+    assert (args.topic, args.year, args.comparison, args.min_citations) == ("horses", 2020, "after", 0)
+    assert not args.bypass_cache and not args.include_summary and args.handler is cli.run_search
+
+    args = cli.build_parser().parse_args(["agent", "papers about horses", "--rules", "--no-cache"])
+    assert args.rules and args.no_cache and not args.evaluate and args.handler is cli.run_agent
+
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(["search", "horses", "--year", "2020", "--comparison", "during"])
+
+
+def test_search_command_passes_flags_to_the_tool(monkeypatch, capsys):
+    tool = StubSearchTool()
+    monkeypatch.setattr(research_agent, "get_search_tool", lambda: tool)
+
+    cli.main(["search", "horses", "--year", "2020", "--comparison", "in", "--min-citations", "5", "--bypass-cache"])
+
+    assert tool.calls == [(("horses", 2020, "in", 5), {"bypass_cache": True, "include_summary": None})]
+    assert json.loads(capsys.readouterr().out) == [{"title": "A"}]
+
+
+@pytest.mark.parametrize("response, expected", [
+    ('[{"title": "A"}]', json.dumps([{"title": "A"}], indent=2)),
+    ("[Sorry] no papers matched.", "[Sorry] no papers matched."),
+])
+def test_agent_command_only_pretty_prints_json_lists(monkeypatch, capsys, response, expected):
+    calls = []
+
+    def run_research_query(query, use_rules, use_cache):
+        calls.append((query, use_rules, use_cache))
+        return response
+
+    monkeypatch.setattr(research_agent, "run_research_query", run_research_query)
+
+    cli.main(["agent", "papers about horses", "--no-cache"])
+
+    assert calls == [("papers about horses", False, False)]
+    assert capsys.readouterr().out.strip() == expected
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import threading
+
+from tools import evaluation_tool
+from tools.evaluation_tool import (
+    _build_batch_critic_prompt, _collect_critic_evaluation, _evaluation_cache_key, _parse_critic_batch_evaluation,
+    aevaluate_response, is_critic_evaluation_message, is_valid_json_array_message, is_valid_json_object_message,
+    rule_based_evaluation,
+)
+from tools.search_cache import SearchCache
+
+PAIRS = [("papers about horses", '[{"title": "A"}]'), ("papers about graphs", '[{"title": "B"}]')]
+
+
+class StubAgent:
+    def __init__(self, name, chat_messages=None):
+        self.name = name
+        self.chat_messages = chat_messages or {}
+
+
+def scores(index, value):
+    return {"index": index, "completeness": value, "quality": value, "robustness": value,
+            "consistency": value, "specificity": value, "feedback": f"response {index}"}
+
+
+def stub_chat(history):
+    critic = StubAgent("critic_agent")
+    return critic, StubAgent("evaluation_request_proxy", {critic: history})
+
+
+def test_batch_evaluation_reads_the_critic_reply_not_the_prompt():
+    reply = json.dumps([scores(1, 4), scores(2, 2)])
+    critic, proxy = stub_chat([
+        {"content": _build_batch_critic_prompt(PAIRS), "role": "assistant", "name": "evaluation_request_proxy"},
+        {"content": reply, "role": "user", "name": "critic_agent"},
+    ])
+
+    evaluations = _collect_critic_evaluation(critic, proxy, "", "", expected_count=2)
+
+    assert [evaluation["completeness"] for evaluation in evaluations] == [4, 2]
+    assert evaluations[1]["feedback"] == "response 2"
+
+
+def test_critic_reply_is_matched_by_role_without_names():
+    critic, proxy = stub_chat([
+        {"content": _build_batch_critic_prompt(PAIRS), "role": "assistant"},
+        {"content": "```json\n" + json.dumps([scores(1, 5), scores(2, 3)]) + "\n```", "role": "user"},
+    ])
+
+    evaluations = _collect_critic_evaluation(critic, proxy, "", "", expected_count=2)
+
+    assert [evaluation["quality"] for evaluation in evaluations] == [5, 3]
+
+
+def test_batch_parse_marks_missing_and_invalid_entries_as_failed():
+    invalid = {**scores(2, 3), "quality": "high"}
+    evaluations = _parse_critic_batch_evaluation(json.dumps([scores(1, 4), invalid]), expected_count=3)
+
+    assert evaluations[0]["completeness"] == 4
+    assert evaluations[1]["completeness"] == 0 and "validation error" in evaluations[1]["feedback"]
+    assert evaluations[2]["feedback"].startswith("Evaluation parsing failed")
+
+
+def test_rule_based_evaluation_only_scores_trivial_responses():
+    assert rule_based_evaluation("")["completeness"] == 1
+    assert rule_based_evaluation("[]")["quality"] == 3
+    assert rule_based_evaluation('[{"title": "A"}]') is None
+
+
+def test_failed_batch_entries_are_independent_objects():
+    evaluations = _parse_critic_batch_evaluation("no json here", expected_count=3)
+    evaluations[0]["feedback"] = "changed"
+
+    assert evaluations[1]["feedback"] != "changed"
+    assert len({id(evaluation) for evaluation in evaluations}) == 3
+
+
+def test_termination_checks_accept_single_and_batched_evaluations():
+    single = {"content": json.dumps(scores(1, 4))}
+    batch = {"content": "```json\n" + json.dumps([scores(1, 4)]) + "\n```"}
+    prompt = {"content": _build_batch_critic_prompt(PAIRS)}
+
+    assert is_valid_json_object_message(single) and not is_valid_json_object_message(batch)
+    assert is_valid_json_array_message(batch) and not is_valid_json_array_message(single)
+    assert is_critic_evaluation_message(single) and is_critic_evaluation_message(batch)
+    assert not is_critic_evaluation_message(prompt)
+
+
+def test_async_evaluation_reads_the_cache_off_the_event_loop(tmp_path, monkeypatch):
+    cache_threads = []
+
+    class RecordingCache(SearchCache):
+        def get(self, key):
+            cache_threads.append(threading.get_ident())
+            return super().get(key)
+
+    cache = RecordingCache(str(tmp_path / "evaluations.sqlite"), table="evaluation_cache")
+    monkeypatch.setitem(evaluation_tool.EVALUATION_CONFIG, "cache_path", str(tmp_path / "evaluations.sqlite"))
+    monkeypatch.setattr(evaluation_tool, "_evaluation_cache", cache)
+    llm_config = {"config_list": [{"model": "critic"}]}
+    cache.set(_evaluation_cache_key(*PAIRS[0], llm_config), scores(1, 4))
+
+    async def evaluate():
+        return await aevaluate_response(*PAIRS[0], llm_config=llm_config), threading.get_ident()
+
+    evaluation, loop_thread = asyncio.run(evaluate())
+
+    assert evaluation == scores(1, 4)
+    assert cache_threads and loop_thread not in cache_threads
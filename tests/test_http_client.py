@@ -0,0 +1,113 @@
+import asyncio
+from email.utils import formatdate
+
+import pytest
+import requests
+
+from tools import http_client
+
+
+def test_async_clients_are_per_loop_and_closed_on_request():
+    async def use_client():
+        client = http_client.get_async_arxiv_client()
+        assert http_client.get_async_arxiv_client() is client
+        await http_client.aclose_async_clients()
+        assert client.client.is_closed
+        assert http_client.get_async_arxiv_client() is not client
+        await http_client.aclose_async_clients()
+        return client
+
+    first = asyncio.run(use_client())
+    second = asyncio.run(use_client())
+
+    assert first is not second
+    assert not http_client._async_arxiv_clients
+
+
+def test_token_bucket_allows_a_burst_then_waits():
+    limiter = http_client.TokenBucketRateLimiter(rate_per_second=10, capacity=2)
+
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.0
+    assert 0.0 < limiter.acquire() <= 0.1
+
+
+class TrackedResponse(requests.Response):
+    def __init__(self, status_code, headers=None):
+        super().__init__()
+        self.status_code = status_code
+        self.headers.update(headers or {})
+        self.url = "http://arxiv.test/api/query"
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ScriptedSession:
+    """Plays back responses (or raises exceptions) in order, one per get()."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def make_client(monkeypatch, session, **kwargs):
+    sleeps = []
+    monkeypatch.setattr(http_client.time, "sleep", sleeps.append)
+    client = http_client.HttpClient(backoff_factor=0.0, **kwargs)
+    client.session = session
+    return client, sleeps
+
+
+def test_retryable_status_honors_retry_after_and_closes_the_failed_response(monkeypatch):
+    throttled, ok = TrackedResponse(503, {"Retry-After": "2"}), TrackedResponse(200)
+    client, sleeps = make_client(monkeypatch, ScriptedSession(throttled, ok))
+
+    assert client.get("http://arxiv.test/api/query", stream=True) is ok
+    assert sleeps == [2.0]
+    assert throttled.closed and not ok.closed
+
+
+def test_connection_errors_back_off_until_retries_run_out(monkeypatch):
+    error = requests.exceptions.ConnectionError("reset")
+    client, sleeps = make_client(monkeypatch, ScriptedSession(error, error, error), max_retries=2)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("http://arxiv.test/api/query")
+    assert client.session.calls == 3
+    assert sleeps == [0.0, 0.0]
+
+
+def test_non_retried_error_closes_the_streamed_response(monkeypatch):
+    missing = TrackedResponse(404)
+    client, sleeps = make_client(monkeypatch, ScriptedSession(missing))
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get("http://arxiv.test/api/query", stream=True)
+    assert missing.closed and sleeps == []
+
+
+def test_exhausted_retries_raise_and_close_the_last_response(monkeypatch):
+    first, last = TrackedResponse(429), TrackedResponse(429)
+    client, sleeps = make_client(monkeypatch, ScriptedSession(first, last), max_retries=1)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get("http://arxiv.test/api/query", stream=True)
+    assert first.closed and last.closed and len(sleeps) == 1
+
+
+def test_retry_after_accepts_seconds_and_http_dates_capped_at_max_backoff(monkeypatch):
+    monkeypatch.setattr(http_client.time, "time", lambda: 1_700_000_000.0)
+
+    assert http_client._retry_after_delay("5", max_backoff=60) == 5.0
+    assert http_client._retry_after_delay("600", max_backoff=60) == 60
+    assert http_client._retry_after_delay(formatdate(1_700_000_030.0, usegmt=True), max_backoff=60) == 30.0
+    assert http_client._retry_after_delay("soon", max_backoff=60) is None
@@ -0,0 +1,58 @@
+from tools.citation_store import CitationStore
+from tools.local_index import LocalPaperIndex
+from tools.websearch_tool import ResearchPaperSearchTool
+
+
+def record(n: int, title: str, year: int = 2024):
+    return {
+        "arxiv_id": f"2401.{n:05d}",
+        "title": title,
+        "authors": ["A. Author"],
+        "year": year,
+        "published": f"{year}-01-01T00:00:00Z",
+        "summary": "An abstract.",
+        "updated": f"{year}-01-01",
+    }
+
+
+def make_index(tmp_path, records):
+    index = LocalPaperIndex(str(tmp_path / "index.sqlite"))
+    index._ingest(iter(records), batch_size=100)
+    return index
+
+
+def test_search_filters_years_and_falls_back_to_any_term(tmp_path):
+    index = make_index(tmp_path, [
+        record(1, "Horse gait analysis", 2024),
+        record(2, "Horse gait analysis", 2019),
+        record(3, "Equine welfare", 2024),
+    ])
+
+    assert [p["link"] for p in index.search("horse gait", 2020, "after")] == ["http://arxiv.org/abs/2401.00001"]
+    assert {p["link"] for p in index.search("gait welfare", 2020, "after")} == {
+        "http://arxiv.org/abs/2401.00001", "http://arxiv.org/abs/2401.00003"
+    }
+    assert index.search("zebra", 2020, "after") == []
+
+
+def test_reingesting_an_unchanged_record_is_a_no_op(tmp_path):
+    index = make_index(tmp_path, [record(1, "Horse gait analysis")])
+
+    assert index._ingest(iter([record(1, "Horse gait analysis")]), batch_size=100) == {
+        "inserted": 0, "updated": 0, "unchanged": 1
+    }
+    assert index.count() == 1
+
+
+def test_citation_floor_still_fills_max_results(tmp_path):
+    # Only every fifth paper clears the floor, so a single LIMIT max_results fetch would return one.
+    index = make_index(tmp_path, [record(n, f"Horse study {n}") for n in range(1, 41)])
+    store_path = str(tmp_path / "citations.bin")
+    CitationStore.build(store_path, [(f"2401.{n:05d}", 100 if n % 5 == 0 else 1) for n in range(1, 41)])
+    tool = ResearchPaperSearchTool(max_results=5, local_index=index, citation_store=CitationStore(store_path),
+                                   http_client=object())
+
+    papers = tool._search_local("horse study", 2023, "after", min_citations_requested=50)
+
+    assert len(papers) == 5
+    assert all(paper["citations"] == 100 for paper in papers)
@@ -0,0 +1,50 @@
+import json
+
+from tools.payload import compact_results, dedupe_authors, encode_results, truncate_text
+from tools.query_parser import project_tool_result
+
+
+def test_dedupe_authors_reports_truncation_separately():
+    authors = ["A. One", "a.  one", "B. Two", "C. Three", "D. Four"]
+
+    assert dedupe_authors(authors, None) == (["A. One", "B. Two", "C. Three", "D. Four"], 0)
+    assert dedupe_authors(authors, 2) == (["A. One", "B. Two"], 2)
+
+
+def test_compact_results_projects_fields_and_keeps_only_real_author_names():
+    papers = [{
+        "title": "T",
+        "authors": [f"Author {i}" for i in range(5)],
+        "year": 2024,
+        "link": "http://arxiv.org/abs/2401.00001v1",
+        "summary": "word " * 100,
+        "citations": "N/A (arXiv API)",
+    }]
+
+    compacted = compact_results(papers, fields=("title", "authors", "year", "citations"), max_authors=3)
+
+    assert compacted == [{
+        "title": "T",
+        "authors": ["Author 0", "Author 1", "Author 2"],
+        "authors_truncated": 2,
+        "year": 2024,
+    }]
+
+
+def test_fast_path_projection_has_no_placeholder_authors():
+    papers = [{"title": "T", "authors": [f"Author {i}" for i in range(5)], "year": 2024, "link": "L"}]
+    payload = encode_results(compact_results(papers, fields=("title", "authors", "year", "link"), max_authors=3))
+
+    answer = json.loads(project_tool_result(payload))
+
+    assert answer == [{"title": "T", "authors": ["Author 0", "Author 1", "Author 2"], "year": 2024, "link": "L"}]
+
+
+def test_summary_is_only_included_on_request_and_truncated():
+    papers = [{"title": "T", "summary": "alpha beta gamma delta"}]
+
+    assert compact_results(papers, fields=("title",)) == [{"title": "T"}]
+    assert compact_results(papers, fields=("title",), include_summary=True, summary_max_chars=12) == [
+        {"title": "T", "summary": "alpha beta..."}
+    ]
+    assert truncate_text("short", 12) == "short"
@@ -0,0 +1,36 @@
+import json
+
+from tools.query_parser import extract_query_constraints, parse_structured_query, project_tool_result
+
+
+def test_parse_structured_query():
+    assert parse_structured_query("Find papers about horses published after 2020 and has 10 citations") == {
+        "topic": "horses", "year": 2020, "comparison": "after", "min_citations": 10
+    }
+    assert parse_structured_query("Research on graph neural networks prior to 2019 with more than 5 citations") == {
+        "topic": "graph neural networks", "year": 2019, "comparison": "before", "min_citations": 6
+    }
+
+
+def test_since_includes_the_year_itself():
+    assert parse_structured_query("articles about diffusion models since 2022")["year"] == 2021
+    assert parse_structured_query("articles about diffusion models since 2022")["comparison"] == "after"
+
+
+def test_unstructured_query_falls_back_to_the_llm():
+    assert parse_structured_query("What's new in reinforcement learning?") is None
+
+
+def test_extract_query_constraints_leaves_the_topic_text():
+    assert extract_query_constraints("equine research post-2020 with at least 3 citations") == {
+        "year": 2020, "comparison": "after", "min_citations": 3, "text": "equine research with"
+    }
+    assert extract_query_constraints("horses") == {"year": None, "comparison": None, "min_citations": 0, "text": "horses"}
+
+
+def test_project_tool_result_keeps_answer_fields_and_rejects_errors():
+    payload = json.dumps([{"title": "T", "authors": ["A"], "year": 2024, "link": "L", "citations": 3}])
+
+    assert json.loads(project_tool_result(payload)) == [{"title": "T", "authors": ["A"], "year": 2024, "link": "L"}]
+    assert project_tool_result(json.dumps([{"error": "Failed to connect to arXiv API."}])) is None
+    assert project_tool_result("not json") is None
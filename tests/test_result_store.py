@@ -0,0 +1,98 @@
+from tests.fakes import FakeArxivClient
+from tools.result_store import ColumnarResultStore
+from tools.search_cache import SearchCache
+from tools.websearch_tool import ResearchPaperSearchTool
+
+
+def paper(arxiv_id, year, citations="N/A (arXiv API)", authors=("A. Author",)):
+    return {
+        "title": f"Paper {arxiv_id}",
+        "authors": list(authors),
+        "year": year,
+        "link": f"http://arxiv.org/abs/{arxiv_id}v1",
+        "summary": f"Summary of {arxiv_id}",
+        "citations": citations,
+    }
+
+
+def test_roundtrip_dedupes_by_arxiv_id_and_survives_reopen(tmp_path):
+    store = ColumnarResultStore(str(tmp_path / "store"))
+    first = [paper("2401.00001", 2024, 12, ("A. One", "B. Two")), paper("2301.00002", 2023)]
+    assert store.append(first) == [0, 1]
+    assert store.append([paper("2401.00001", 2024, 99)]) == [0]
+    store.close()
+
+    reopened = ColumnarResultStore(str(tmp_path / "store"))
+    assert len(reopened) == 2
+    assert reopened.rows([0, 1]) == first
+    reopened.close()
+
+
+def test_filter_by_year_and_title_terms(tmp_path):
+    store = ColumnarResultStore(str(tmp_path / "store"))
+    store.append([paper("2401.00001", 2024), paper("2301.00002", 2023), paper("2201.00003", 2022)])
+
+    assert store.filter(2022, "after") == [1, 0]
+    assert store.filter(topic="paper 2301.00002") == [1]
+    store.close()
+
+
+def test_lookup_query_expires(tmp_path):
+    store = ColumnarResultStore(str(tmp_path / "store"), query_ttl_seconds=None)
+    store.record_query("k", store.append([paper("2401.00001", 2024)]))
+    assert store.lookup_query("k")[0]["title"] == "Paper 2401.00001"
+
+    store.query_ttl_seconds = -1
+    assert store.lookup_query("k") is None
+    store.close()
+
+
+def test_search_tool_only_writes_to_store_by_default(tmp_path):
+    client = FakeArxivClient(["2024-05-01T12:00:00Z"])
+    store = ColumnarResultStore(str(tmp_path / "store"))
+    cache = SearchCache(str(tmp_path / "cache.sqlite"))
+    tool = ResearchPaperSearchTool(http_client=client, cache=cache, result_store=store)
+
+    tool.search("horses", 2023, "after", 0)
+    tool.search("horses", 2023, "after", 0)
+
+    assert len(client.requests) == 1
+    assert len(store) == 1
+    assert cache.hits == 1
+    store.close()
+
+
+def test_torn_write_is_truncated_on_open(tmp_path):
+    path = tmp_path / "store"
+    store = ColumnarResultStore(str(path))
+    store.append([paper("2401.00001", 2024), paper("2301.00002", 2023)])
+    store.close()
+    # A crash after some columns and pool bytes were written, but before the rest.
+    with open(path / "arxiv_id.I", "ab") as f:
+        f.write(b"\x07\x00\x00\x00")
+    with open(path / "strings.bin", "ab") as f:
+        f.write(b"torn")
+
+    store = ColumnarResultStore(str(path))
+    assert len(store) == 2
+    assert store.append([paper("2201.00003", 2022)]) == [2]
+    store.close()
+
+    store = ColumnarResultStore(str(path))
+    assert store.append([paper("2201.00003", 2022), paper("2401.00001", 2024)]) == [2, 0]
+    assert len(store) == 3
+    assert store.rows([2])[0]["title"] == "Paper 2201.00003"
+    store.close()
+
+
+def test_summaries_are_not_loaded_when_interning(tmp_path):
+    path = str(tmp_path / "store")
+    store = ColumnarResultStore(path)
+    store.append([paper("2401.00001", 2024)])
+    store.close()
+
+    store = ColumnarResultStore(path)
+    store.append([paper("2301.00002", 2023)])
+    assert "Summary of 2401.00001" not in store._string_ids
+    assert "Paper 2401.00001" in store._string_ids
+    store.close()
@@ -0,0 +1,50 @@
+import pytest
+
+from tools.search_backends import SearchBackend, StaticBackend, merge_results, paper_identity_keys
+from tools.websearch_tool import ResearchPaperSearchTool
+
+
+def entry(title, link="N/A", year=2024, **extra):
+    return {"title": title, "authors": ["A"], "year": year, "link": link, "summary": "s", **extra}
+
+
+def test_backend_without_search_fails_at_construction():
+    class Incomplete(SearchBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_identity_keys_cover_doi_arxiv_id_and_title():
+    paper = entry("Horse Gait: A Study", "http://arxiv.org/abs/2401.00001v2", doi="https://doi.org/10.1/ABC")
+
+    assert paper_identity_keys(paper) == ["doi:10.1/abc", "arxiv:2401.00001", "title:horse gait a study"]
+
+
+def test_merge_dedupes_across_sources_and_ranks_shared_papers_first():
+    merged = merge_results({
+        "arxiv": [entry("Only arXiv", "http://arxiv.org/abs/2401.00001v1"),
+                  entry("Shared Paper", "http://arxiv.org/abs/2401.00002v1")],
+        "openalex": [entry("Shared paper", "https://doi.org/10.1/x", doi="10.1/x", citations=7)],
+    }, limit=10)
+
+    assert [paper["title"] for paper in merged] == ["Shared Paper", "Only arXiv"]
+    assert merged[0]["sources"] == ["arxiv", "openalex"]
+    assert merged[0]["doi"] == "10.1/x" and merged[0]["citations"] == 7
+
+
+def test_federated_search_drops_failed_and_late_sources():
+    papers = [entry("Horse gait", "http://arxiv.org/abs/2401.00001v1")]
+    tool = ResearchPaperSearchTool(http_client=object(), deadline_seconds=0.2, backends=[
+        StaticBackend("fast", papers),
+        StaticBackend("slow", [entry("Horse racing")], latency_seconds=1.0),
+        StaticBackend("broken", papers, error=RuntimeError("down")),
+    ])
+    tool._search_primary = lambda *args: []
+
+    results, statuses = tool.federated_search("horse", 2023, "after", 0)
+
+    assert [paper["title"] for paper in results] == ["Horse gait"]
+    assert statuses["fast"] == "ok" and statuses["slow"] == "timeout"
+    assert statuses["broken"].startswith("error")
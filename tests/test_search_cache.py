@@ -0,0 +1,67 @@
+import itertools
+
+from tests.fakes import FakeArxivClient
+from tools import search_cache
+from tools.citation_store import CitationStore
+from tools.search_cache import SearchCache
+from tools.websearch_tool import ResearchPaperSearchTool
+
+
+def test_make_key_normalizes_topic_and_comparison():
+    assert SearchCache.make_key("  Horse  Gait ", 2020, "After ") == SearchCache.make_key("horse gait", "2020", "after")
+    assert SearchCache.make_key("horse", 2020, "after", min_citations=1) != SearchCache.make_key("horse", 2020, "after")
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(search_cache.time, "time", lambda: now[0])
+    cache = SearchCache(str(tmp_path / "cache.sqlite"), ttl_seconds=15)
+
+    cache.set("k", [{"title": "A"}])
+    now[0] += 10
+    assert cache.get("k") == [{"title": "A"}]
+    now[0] += 10
+    assert cache.get("k") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 0}
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, monkeypatch):
+    clock = itertools.count(1000.0, 1.0)
+    monkeypatch.setattr(search_cache.time, "time", lambda: next(clock))
+    cache = SearchCache(str(tmp_path / "cache.sqlite"), ttl_seconds=None, max_entries=2)
+
+    cache.set("a", [])
+    cache.set("b", [])
+    cache.get("a")
+    cache.set("c", [])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [] and cache.get("c") == []
+
+
+def test_caches_sharing_a_file_keep_separate_tables(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    searches = SearchCache(path)
+    evaluations = SearchCache(path, table="evaluation_cache", metric_prefix="evaluation_cache")
+
+    evaluations.set("k", [{"score": 5}])
+
+    assert searches.get("k") is None
+    assert evaluations.get("k") == [{"score": 5}]
+    assert searches.stats()["size"] == 0 and evaluations.stats()["size"] == 1
+
+
+def test_results_cached_without_a_citation_store_are_not_served_with_one(tmp_path):
+    client = FakeArxivClient(["2024-05-01T12:00:00Z"])
+    cache = SearchCache(str(tmp_path / "cache.sqlite"))
+    store_path = str(tmp_path / "citations.bin")
+    CitationStore.build(store_path, [("2405.011200", 42)])
+
+    without_store = ResearchPaperSearchTool(http_client=client, cache=cache)
+    with_store = ResearchPaperSearchTool(http_client=client, cache=cache, citation_store=CitationStore(store_path))
+
+    assert without_store._search_primary("horses", 2023, "after", 0)[0]["citations"] == "N/A (arXiv API)"
+    assert with_store._search_primary("horses", 2023, "after", 0)[0]["citations"] == 42
+    assert len(client.requests) == 2
+    assert with_store._search_primary("horses", 2023, "after", 0)[0]["citations"] == 42
+    assert len(client.requests) == 2
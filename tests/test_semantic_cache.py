@@ -0,0 +1,99 @@
+import sqlite3
+import time
+from array import array
+
+from tools import semantic_cache
+from tools.semantic_cache import SemanticQueryCache, get_embedder, normalize_topic_text
+
+
+class StubEmbedder:
+    """Maps known topic texts to fixed unit vectors; anything else is orthogonal to them."""
+
+    name = "stub"
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed(self, text):
+        return array("f", self.vectors.get(text, [0.0, 0.0, 1.0]))
+
+
+def make_cache(tmp_path, vectors):
+    return SemanticQueryCache(str(tmp_path / "semantic.sqlite"), StubEmbedder(vectors))
+
+
+def test_get_embedder_without_model_disables_cache():
+    assert get_embedder(None) is None
+    assert get_embedder("") is None
+
+
+def test_paraphrase_above_threshold_is_a_hit(tmp_path):
+    cache = make_cache(tmp_path, {"horse": [1.0, 0.0, 0.0], "equine": [0.96, 0.28, 0.0]})
+    cache.set("papers about horses", '[{"title": "A"}]')
+
+    assert cache.get("studies on equine") == '[{"title": "A"}]'
+    assert cache.stats()["hits"] == 1
+
+
+def test_different_topic_is_a_miss(tmp_path):
+    cache = make_cache(tmp_path, {"horse": [1.0, 0.0, 0.0]})
+    cache.set("papers about horses", '[{"title": "A"}]')
+
+    assert cache.get("papers about graph neural networks") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_constraints_must_match_exactly(tmp_path):
+    cache = make_cache(tmp_path, {"horse": [1.0, 0.0, 0.0]})
+    cache.set("papers about horses published before 2020", '[{"title": "A"}]')
+
+    assert cache.get("papers about horses published after 2020") is None
+    assert cache.get("papers about horses published before 2020") == '[{"title": "A"}]'
+
+
+def test_normalize_topic_text_drops_filler_and_plurals():
+    assert normalize_topic_text("Find me papers about Horses") == "horse"
+
+
+def test_answers_are_scoped_to_the_search_configuration(tmp_path):
+    cache = make_cache(tmp_path, {"horse": [1.0, 0.0, 0.0]})
+    cache.set("papers about horses", '[{"title": "A"}]', scope="arxiv")
+
+    assert cache.get("papers about horses", scope="local-index") is None
+    assert cache.get("papers about horses", scope="arxiv") == '[{"title": "A"}]'
+
+
+def test_reopened_cache_matches_stored_vectors_and_skips_expired_ones(tmp_path, monkeypatch):
+    vectors = {"horse": [1.0, 0.0, 0.0], "zebra": [0.0, 1.0, 0.0]}
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "time", lambda: now[0])
+    cache = make_cache(tmp_path, vectors)
+    cache.set("papers about zebras", '[{"title": "Z"}]')
+    now[0] += 100
+    cache.set("papers about horses", '[{"title": "H"}]')
+
+    reopened = SemanticQueryCache(str(tmp_path / "semantic.sqlite"), StubEmbedder(vectors), ttl_seconds=50)
+
+    assert reopened.get("papers about horses") == '[{"title": "H"}]'
+    assert reopened.get("papers about zebras") is None
+
+
+def test_tables_without_a_scope_column_are_migrated(tmp_path):
+    path = str(tmp_path / "semantic.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE semantic_cache (id INTEGER PRIMARY KEY, embedder TEXT NOT NULL, year INTEGER NOT NULL,"
+        " comparison TEXT NOT NULL, min_citations INTEGER NOT NULL, query TEXT NOT NULL, embedding BLOB NOT NULL,"
+        " response TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO semantic_cache VALUES (1, 'stub', 0, '', 0, 'papers about horses', ?, '[{\"title\": \"A\"}]', ?, ?)",
+        (array("f", [1.0, 0.0, 0.0]).tobytes(), time.time(), time.time()),
+    )
+    conn.commit()
+    conn.close()
+
+    cache = SemanticQueryCache(path, StubEmbedder({"horse": [1.0, 0.0, 0.0]}))
+
+    assert cache.get("studies on horses") == '[{"title": "A"}]'
+    assert cache.get("studies on horses", scope="arxiv") is None
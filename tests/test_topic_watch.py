@@ -0,0 +1,69 @@
+from tests.fakes import FakeArxivClient
+from tools.topic_watch import TopicWatcher, WatchState
+
+
+def day(n: int) -> str:
+    return f"2024-05-{n:02d}T12:00:00Z"
+
+
+def make_watcher(tmp_path, client, max_new_per_run=100):
+    state = WatchState(str(tmp_path / "watch.json"))
+    return TopicWatcher(state, http_client=client, page_size=2, max_new_per_run=max_new_per_run)
+
+
+def test_first_check_returns_newest_page_as_baseline(tmp_path):
+    client = FakeArxivClient([day(n) for n in range(1, 6)])
+    watcher = make_watcher(tmp_path, client)
+
+    papers = watcher.check("horses")
+
+    assert [p["published"] for p in papers] == [day(5), day(4)]
+    assert watcher.state.get("horses")["published"] == day(5)
+
+
+def test_second_check_reports_only_new_papers(tmp_path):
+    client = FakeArxivClient([day(1), day(2)])
+    watcher = make_watcher(tmp_path, client)
+    watcher.check("horses")
+
+    client.published += [day(3), day(4), day(5)]
+    papers = watcher.check("horses")
+
+    assert [p["published"] for p in papers] == [day(5), day(4), day(3)]
+    assert watcher.check("horses") == []
+
+
+def test_capped_burst_is_reported_over_later_checks_without_gaps(tmp_path):
+    client = FakeArxivClient([day(1)])
+    watcher = make_watcher(tmp_path, client, max_new_per_run=2)
+    watcher.check("horses")
+
+    client.published += [day(n) for n in range(2, 8)]
+    reported = []
+    for _ in range(4):
+        reported += [p["published"] for p in watcher.check("horses")]
+
+    assert sorted(reported) == [day(n) for n in range(2, 8)]
+    assert watcher.state.get("horses")["published"] == day(7)
+
+
+def test_state_persists_between_watchers(tmp_path):
+    client = FakeArxivClient([day(1), day(2)])
+    make_watcher(tmp_path, client).check("Horses")
+
+    client.published.append(day(3))
+    papers = make_watcher(tmp_path, client).check("horses")
+
+    assert [p["published"] for p in papers] == [day(3)]
+
+
+def test_later_checks_query_ascending_from_the_high_water_mark(tmp_path):
+    client = FakeArxivClient([day(1), day(2)])
+    watcher = make_watcher(tmp_path, client)
+    watcher.check("horse gait")
+    watcher.check("horse gait")
+
+    first, second = client.requests[0], client.requests[-1]
+    assert (first["search_query"], first["sortOrder"]) == ("all:horse gait", "descending")
+    assert second["search_query"] == "(all:horse gait) AND submittedDate:[202405021200 TO 999912312359]"
+    assert second["sortOrder"] == "ascending"
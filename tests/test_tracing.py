@@ -0,0 +1,48 @@
+import pytest
+
+from tools.tracing import Metrics, Tracer
+
+
+def test_spans_nest_and_export_as_otlp():
+    tracer = Tracer(Metrics())
+    with tracer.span("agent.query", query="horses") as outer:
+        with tracer.span("search_tool.search") as inner:
+            inner.set_attribute("cache.hits", 1)
+
+    exported = tracer.export_otlp_json()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in exported] == ["search_tool.search", "agent.query"]
+    assert inner.trace_id == outer.trace_id and inner.parent_id == outer.span_id
+    assert "parentSpanId" not in exported[1]
+    assert {"key": "query", "value": {"stringValue": "horses"}} in exported[1]["attributes"]
+
+
+def test_errors_are_recorded_and_reraised():
+    tracer = Tracer(Metrics())
+    with pytest.raises(ValueError):
+        with tracer.span("critic.evaluate"):
+            raise ValueError("bad")
+
+    (span,) = tracer.finished_spans()
+    assert span.error == "ValueError: bad"
+    assert 'research_agent_span_errors_total{span="critic.evaluate"} 1' in tracer.metrics.render_prometheus()
+
+
+def test_counted_attributes_and_durations_feed_prometheus_metrics():
+    tracer = Tracer(Metrics())
+    for _ in range(2):
+        with tracer.span("search_tool.search") as span:
+            span.add("payload.bytes", 100)
+            span.set_attribute("result_store.hit", True)
+
+    text = tracer.metrics.render_prometheus()
+    assert 'research_agent_payload_bytes_total{span="search_tool.search"} 200' in text
+    assert "result_store_hit" not in text
+    assert 'research_agent_span_duration_seconds_count{span="search_tool.search"} 2' in text
+    assert 'research_agent_span_duration_seconds_bucket{span="search_tool.search",le="+Inf"} 2' in text
+
+
+def test_disabled_tracer_yields_none():
+    tracer = Tracer(Metrics(), enabled=False)
+    with tracer.span("agent.query") as span:
+        assert span is None
+    assert tracer.finished_spans() == []
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import threading
+
+from tests.fakes import FakeArxivClient, FakeAsyncArxivClient
+from tools.search_cache import SearchCache
+from tools.websearch_tool import ResearchPaperSearchTool, build_search_query
+
+
+def make_tool(client, **kwargs):
+    return ResearchPaperSearchTool(http_client=client, **kwargs)
+
+
+def test_year_filter_is_pushed_into_the_search_query():
+    assert build_search_query("horses", 2020, "after") == "(all:horses) AND submittedDate:[202101010000 TO 999912312359]"
+    assert build_search_query("horses", 2020, "before") == "(all:horses) AND submittedDate:[190001010000 TO 201912312359]"
+    assert build_search_query("horses", 2020, "in") == "(all:horses) AND submittedDate:[202001010000 TO 202012312359]"
+    assert build_search_query("horses", None, None) == "all:horses"
+
+
+def test_multi_word_topic_is_grouped_ahead_of_the_date_range():
+    client = FakeArxivClient(["2024-05-01T12:00:00Z"])
+    make_tool(client)._search_arxiv("horse gait analysis", 2023, "after", 0)
+
+    assert client.requests[0]["search_query"] == (
+        "(all:horse gait analysis) AND submittedDate:[202401010000 TO 999912312359]"
+    )
+
+
+def test_search_pages_until_max_results_are_found():
+    client = FakeArxivClient([f"2024-05-{day:02d}T12:00:00Z" for day in range(1, 21)])
+    tool = make_tool(client, max_results=5, page_size=2)
+
+    papers = tool._search_arxiv("horses", 2023, "after", 0)
+
+    assert len(papers) == 5
+    assert [request["start"] for request in client.requests] == [0, 2, 4]
+    assert papers[0]["link"].endswith("2405.201200v1")
+
+
+def test_search_stops_at_the_last_page_and_max_pages():
+    client = FakeArxivClient([f"2024-05-{day:02d}T12:00:00Z" for day in range(1, 4)])
+    assert len(make_tool(client, max_results=10, page_size=2)._search_arxiv("horses", 2023, "after", 0)) == 3
+    assert len(client.requests) == 2
+
+    client = FakeArxivClient([f"2024-05-{day:02d}T12:00:00Z" for day in range(1, 21)])
+    assert len(make_tool(client, max_results=10, page_size=2, max_pages=2)._search_arxiv("horses", 2023, "after", 0)) == 4
+
+
+def test_without_a_citation_store_min_citations_is_ignored_and_flagged():
+    client = FakeArxivClient(["2024-05-01T12:00:00Z"])
+    papers = make_tool(client)._search_arxiv("horses", 2023, "after", 50)
+
+    assert papers[0]["citations"] == "N/A (arXiv API)"
+
+
+def test_asearch_matches_search_and_keeps_the_cache_off_the_event_loop(tmp_path):
+    published = [f"2024-05-{day:02d}T12:00:00Z" for day in range(1, 21)]
+    cache_threads = []
+
+    class RecordingCache(SearchCache):
+        def get(self, key):
+            cache_threads.append(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key, value):
+            cache_threads.append(threading.get_ident())
+            super().set(key, value)
+
+    sync_tool = make_tool(FakeArxivClient(published), max_results=5, page_size=2)
+    client = FakeAsyncArxivClient(published)
+    async_tool = make_tool(object(), max_results=5, page_size=2, async_http_client=client,
+                           cache=RecordingCache(str(tmp_path / "cache.sqlite")))
+
+    async def search_twice():
+        first = await async_tool.asearch("horses", 2023, "after", 0)
+        second = await async_tool.asearch("horses", 2023, "after", 0)
+        return first, second, threading.get_ident()
+
+    first, second, loop_thread = asyncio.run(search_twice())
+
+    assert json.loads(first) == json.loads(second) == json.loads(sync_tool.search("horses", 2023, "after", 0))
+    assert len(client.requests) == 3
+    assert len(cache_threads) == 3 and loop_thread not in cache_threads
+
+
+def test_config_fingerprint_tracks_sources_and_result_shape():
+    tool = make_tool(object())
+
+    assert tool.config_fingerprint() == make_tool(object()).config_fingerprint()
+    assert tool.config_fingerprint() != make_tool(object(), max_results=5).config_fingerprint()
+    assert tool.config_fingerprint() != make_tool(object(), api_url="http://mirror.test/api").config_fingerprint()
+    assert tool.config_fingerprint() != make_tool(object(), payload_config={"fields": ["title"]}).config_fingerprint()
@@ -0,0 +1,109 @@
+import xml.etree.ElementTree as ET
+from typing import Dict, IO, Iterator
+
+# ======================
+# Atom Tag Constants
+# ======================
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+OPENSEARCH_NS = "{http://a9.com/-/spec/opensearch/1.1/}"
+
+ENTRY_TAG = ATOM_NS + "entry"
+TITLE_TAG = ATOM_NS + "title"
+ID_TAG = ATOM_NS + "id"
+PUBLISHED_TAG = ATOM_NS + "published"
+SUMMARY_TAG = ATOM_NS + "summary"
+AUTHOR_TAG = ATOM_NS + "author"
+NAME_TAG = ATOM_NS + "name"
+TOTAL_RESULTS_TAG = OPENSEARCH_NS + "totalResults"
+
+
+# ======================
+# Streaming Atom Parser
+# ======================
+class AtomFeedParser:
+    """
+    Incrementally parses an arXiv Atom feed, yielding one paper dict per <entry>
+    and clearing each element once it has been read so memory stays flat
+    regardless of feed size. Stop iterating early to skip the rest of the body.
+
+    Bytes can be pulled from a file-like object with iter_papers() or pushed in
+    chunks with feed(), which is what the async search path uses.
+
+    After (or during) iteration, total_results holds opensearch:totalResults,
+    entry_count the number of entries seen so far and bytes_parsed the amount of
+    input consumed.
+    """
+
+    def __init__(self):
+        self.total_results = 0
+        self.entry_count = 0
+        self.bytes_parsed = 0
+        self._pull_parser = ET.XMLPullParser(events=("start", "end"))
+        self._root = None
+
+    def iter_papers(self, source: IO[bytes], chunk_size: int = 64 * 1024) -> Iterator[Dict]:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield from self.feed(chunk)
+        self.close()
+
+    def feed(self, data: bytes) -> Iterator[Dict]:
+        self.bytes_parsed += len(data)
+        self._pull_parser.feed(data)
+        for event, elem in self._pull_parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                continue
+
+            tag = elem.tag
+            if tag == ENTRY_TAG:
+                self.entry_count += 1
+                paper = self._entry_to_dict(elem)
+                elem.clear()
+                self._root.clear()
+                if paper is not None:
+                    yield paper
+            elif tag == TOTAL_RESULTS_TAG:
+                try:
+                    self.total_results = int(elem.text or 0)
+                except ValueError:
+                    self.total_results = 0
+
+    def close(self) -> None:
+        """Signals end of input; raises ET.ParseError if the feed was truncated."""
+        self._pull_parser.close()
+
+    @staticmethod
+    def _entry_to_dict(entry) -> Dict:
+        title = link = summary = published = None
+        authors = []
+        for child in entry:
+            tag = child.tag
+            if tag == TITLE_TAG:
+                title = child.text
+            elif tag == ID_TAG:
+                link = child.text
+            elif tag == PUBLISHED_TAG:
+                published = child.text
+            elif tag == SUMMARY_TAG:
+                summary = child.text
+            elif tag == AUTHOR_TAG:
+                name = child.find(NAME_TAG)
+                authors.append(name.text if name is not None and name.text else "N/A")
+
+        # arXiv timestamps are fixed-format ISO 8601 ("2023-05-01T12:00:00Z"),
+        # so the year is always the first four characters.
+        if not published or len(published) < 4 or not published[:4].isdigit():
+            return None
+
+        return {
+            "title": (title or "N/A").strip(),
+            "authors": authors,
+            "year": int(published[:4]),
+            "link": link or "N/A",
+            "summary": (summary or "N/A").strip(),
+            "published": published,
+        }
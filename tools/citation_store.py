@@ -0,0 +1,193 @@
+import argparse
+import csv
+import json
+import mmap
+import os
+import re
+import struct
+import zlib
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+MAGIC = b"CITES01\0"
+HEADER = struct.Struct("<8sQ")
+SLOT = struct.Struct("<16sI")
+EMPTY_KEY = b"\0" * 16
+
+_VERSION_SUFFIX = re.compile(r"v\d+$")
+_OLD_STYLE_ID = re.compile(r"^([a-z\-]+)(?:\.[a-z\-]+)?/(\d{7})$")
+
+
+def normalize_arxiv_id(value: str) -> Optional[str]:
+    """
+    Reduces an arXiv id or abs/pdf URL to its canonical versionless form,
+    e.g. "http://arxiv.org/abs/2101.00001v2" -> "2101.00001" and
+    "math.AG/0601001" -> "math/0601001". Returns None if nothing is left.
+    """
+    if not value:
+        return None
+    arxiv_id = value.strip().lower()
+    for marker in ("arxiv.org/abs/", "arxiv.org/pdf/"):
+        if marker in arxiv_id:
+            arxiv_id = arxiv_id.split(marker, 1)[1]
+    if arxiv_id.startswith("arxiv:"):
+        arxiv_id = arxiv_id[len("arxiv:"):]
+    if arxiv_id.endswith(".pdf"):
+        arxiv_id = arxiv_id[:-len(".pdf")]
+    arxiv_id = _VERSION_SUFFIX.sub("", arxiv_id.strip("/"))
+    old_style = _OLD_STYLE_ID.match(arxiv_id)
+    if old_style:
+        arxiv_id = f"{old_style.group(1)}/{old_style.group(2)}"
+    if not arxiv_id or len(arxiv_id.encode("utf-8")) > SLOT.size - 4:
+        return None
+    return arxiv_id
+
+
+# ======================
+# Memory-mapped Citation Store
+# ======================
+class CitationStore:
+    """
+    Read-only arXiv-id -> citation count table in a memory-mapped file.
+
+    The file is an open-addressing hash table of fixed-size slots (16-byte id,
+    uint32 count) behind a small header, so a lookup hashes the id and probes a
+    slot or two directly in the mapped pages: O(1), no parsing at open time and
+    no per-paper network calls. Build it with CitationStore.build().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._slot_count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a citation store file.")
+        # Identifies this build of the file (build() replaces it), e.g. for cache keys.
+        stat = os.fstat(self._file.fileno())
+        self.generation = f"{self._slot_count}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def get(self, arxiv_id: str) -> Optional[int]:
+        key = normalize_arxiv_id(arxiv_id)
+        if key is None or self._slot_count == 0:
+            return None
+        key_bytes = key.encode("utf-8").ljust(16, b"\0")
+        slot = zlib.crc32(key_bytes) % self._slot_count
+        for _ in range(self._slot_count):
+            stored_key, count = SLOT.unpack_from(self._mmap, HEADER.size + slot * SLOT.size)
+            if stored_key == key_bytes:
+                return count
+            if stored_key == EMPTY_KEY:
+                return None
+            slot = (slot + 1) % self._slot_count
+        return None
+
+    def get_many(self, arxiv_ids: Iterable[str]) -> Dict[str, Optional[int]]:
+        return {arxiv_id: self.get(arxiv_id) for arxiv_id in arxiv_ids}
+
+    def __len__(self) -> int:
+        return sum(
+            1 for slot in range(self._slot_count)
+            if self._mmap[HEADER.size + slot * SLOT.size:HEADER.size + slot * SLOT.size + 16] != EMPTY_KEY
+        )
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        for slot in range(self._slot_count):
+            stored_key, count = SLOT.unpack_from(self._mmap, HEADER.size + slot * SLOT.size)
+            if stored_key != EMPTY_KEY:
+                yield stored_key.rstrip(b"\0").decode("utf-8"), count
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+    @classmethod
+    def build(cls, path: str, counts: Iterable[Tuple[str, int]], merge_existing: bool = True,
+              load_factor: float = 0.5) -> int:
+        """
+        Writes a store from (arxiv_id, citation_count) pairs. When merge_existing is
+        set, entries already in the file at path are kept unless overridden, so
+        snapshots can be imported incrementally. Returns the number of entries.
+        """
+        table: Dict[str, int] = {}
+        if merge_existing and os.path.exists(path):
+            existing = cls(path)
+            table.update(existing.items())
+            existing.close()
+        for arxiv_id, count in counts:
+            key = normalize_arxiv_id(arxiv_id)
+            if key is not None:
+                table[key] = max(0, min(int(count), 0xFFFFFFFF))
+
+        slot_count = max(1, int(len(table) / load_factor) + 1)
+        slots = bytearray(slot_count * SLOT.size)
+        for key, count in table.items():
+            key_bytes = key.encode("utf-8").ljust(16, b"\0")
+            slot = zlib.crc32(key_bytes) % slot_count
+            while slots[slot * SLOT.size:slot * SLOT.size + 16] != EMPTY_KEY:
+                slot = (slot + 1) % slot_count
+            SLOT.pack_into(slots, slot * SLOT.size, key_bytes, count)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, slot_count))
+            f.write(slots)
+        os.replace(tmp_path, path)
+        return len(table)
+
+
+# ======================
+# Snapshot Readers
+# ======================
+def iter_openalex_counts(path: str) -> Iterator[Tuple[str, int]]:
+    """(arxiv_id, cited_by_count) from an OpenAlex works JSON-lines snapshot."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            work = json.loads(line)
+            for location in work.get("locations") or []:
+                landing_page = (location or {}).get("landing_page_url") or ""
+                if "arxiv.org/abs/" in landing_page:
+                    yield landing_page, work.get("cited_by_count") or 0
+                    break
+
+
+def iter_semantic_scholar_counts(path: str) -> Iterator[Tuple[str, int]]:
+    """(arxiv_id, citationcount) from a Semantic Scholar papers JSON-lines snapshot."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            paper = json.loads(line)
+            external_ids = paper.get("externalids") or paper.get("externalIds") or {}
+            arxiv_id = external_ids.get("ArXiv")
+            if arxiv_id:
+                yield arxiv_id, paper.get("citationcount") or paper.get("citationCount") or 0
+
+
+def iter_csv_counts(path: str) -> Iterator[Tuple[str, int]]:
+    """(arxiv_id, citations) from a two-column CSV with an arxiv_id,citations header."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            yield row["arxiv_id"], int(row["citations"] or 0)
+
+
+SNAPSHOT_READERS = {
+    "openalex": iter_openalex_counts,
+    "semantic-scholar": iter_semantic_scholar_counts,
+    "csv": iter_csv_counts,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import citation counts into a memory-mapped citation store.")
+    parser.add_argument("store", help="Path of the citation store file.")
+    parser.add_argument("snapshots", nargs="+", help="Snapshot files to import.")
+    parser.add_argument("--format", choices=sorted(SNAPSHOT_READERS), default="openalex")
+    parser.add_argument("--replace", action="store_true", help="Discard existing entries instead of merging.")
+    args = parser.parse_args()
+
+    reader = SNAPSHOT_READERS[args.format]
+    counts = (pair for snapshot in args.snapshots for pair in reader(snapshot))
+    total = CitationStore.build(args.store, counts, merge_existing=not args.replace)
+    print(f"Citation store {args.store} now holds {total} entries.")
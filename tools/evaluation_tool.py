@@ -1,11 +1,127 @@
-from typing import Dict
-import autogen
+from typing import Dict, List, Optional, Tuple, Union
+import hashlib
 import json
 import os
-from config import LLM_CONFIG
+import threading
+from config import LLM_CONFIG, EVALUATION_CONFIG
+from tools import tracing
+from tools.model_clients import activate_custom_model_clients
+from tools.search_cache import SearchCache
 
 
-def _parse_critic_evaluation(content: str, user_query_for_debug: str, agent_response_for_debug: str) -> Dict:
+# Scoring rubric shared by the single and batched critic prompts.
+CRITIC_CRITERIA = """1.  **Completeness (1-5):**
+    * Did the agent address all aspects of the user's query? (e.g., topic, year constraints, number of citations if applicable).
+    * If the query had multiple parts, were all parts covered in the response?
+
+2.  **Quality (1-5):**
+    * Was the information provided accurate and correct? (e.g., are paper details plausible, year matching?).
+    * Was the response clear, well-organized, and easy to understand?
+    * If the response is expected to be JSON (as requested for the research assistant), is the JSON well-formed and does it contain the required fields (title, authors, year, link)?
+
+3.  **Robustness (1-5):**
+    * How well did the agent handle the specific query? (e.g., handling of year parameters like 'after', 'before', 'in').
+    * If the query had potentially tricky aspects (e.g., non-existent topics, impossible year constraints), how did it respond? (Score N/A or 3 if the query is straightforward and handled well. If the agent simply fails or errors out on tricky inputs that it *should* handle gracefully, score lower).
+    * Note: The 'min_citations' parameter might be 'Not available in this version' for the tool; assess how the agent handles this if queried.
+
+4.  **Consistency (1-5):**
+    * Is the response internally consistent?
+    * Does the response align with the requirements and constraints mentioned in the user query? (e.g., if the query asked for papers 'after' a year, are all results indeed after that year?).
+    * Is the agent's use of its tools (e.g. search_research_papers function) consistent with its instructions?
+
+5.  **Specificity (1-5):**
+    * Does the agent provide specific details for each paper (title, authors, year, link as requested)?
+    * Is the level of detail appropriate for a research assistant's findings?
+
+**Additional Checks (to be covered in feedback):**
+* **Context and Justifications:** Did the agent provide clear context for its response? (e.g. number of papers found, any issues encountered).
+* **Interpretation of Query:** Did the agent correctly interpret all parts of the query, including topic, year, and comparison type?
+* **Feasibility of Results:** Are the results (e.g. paper titles, authors) plausible for the given topic and year? (The critic cannot verify external links).
+* **Format Adherence:** Did the agent return results in the specified JSON format with all required fields?
+
+"""
+
+EXPECTED_EVALUATION_KEYS = ["completeness", "quality", "robustness", "consistency", "specificity", "feedback"]
+
+def _validate_evaluation(parsed_json: Dict) -> None:
+    """Checks keys and types of one evaluation in place (scores are coerced to int); raises ValueError."""
+    if not isinstance(parsed_json, dict):
+        raise ValueError(f"Evaluation must be a JSON object, got {type(parsed_json)}")
+    expected_keys = EXPECTED_EVALUATION_KEYS
+    missing_keys = [key for key in expected_keys if key not in parsed_json]
+    if missing_keys:
+        raise ValueError(f"Parsed JSON is missing expected keys: {missing_keys}")
+
+    for key in expected_keys:
+        if key == "feedback":
+            if not isinstance(parsed_json[key], str):
+                raise ValueError(f"Field '{key}' must be a string, got {type(parsed_json[key])}")
+        else:
+            if not isinstance(parsed_json[key], int):
+                try:
+                    parsed_json[key] = int(str(parsed_json[key]))
+                except (ValueError, TypeError):
+                     raise ValueError(f"Field '{key}' must be an integer, got {type(parsed_json[key])} with value '{parsed_json[key]}'")
+            if not (0 <= parsed_json[key] <= 5):
+                if parsed_json[key] == 0 and "parsing failed" in parsed_json.get("feedback","").lower():
+                    pass
+                else:
+                    raise ValueError(f"Score for '{key}' ({parsed_json[key]}) is out of valid range (0-5, typically 1-5 from critic).")
+
+def _parse_critic_batch_evaluation(content: str, expected_count: int) -> List[Dict]:
+    """
+    Parses a batched critic reply: a JSON array with one evaluation object per
+    response, each carrying the 1-based 'index' it refers to. Entries that are
+    missing or invalid come back as the usual parse-failure evaluation.
+    """
+    def failed(reason: str) -> Dict:
+        return {
+            "completeness": 0, "quality": 0, "robustness": 0,
+            "consistency": 0, "specificity": 0,
+            "feedback": f"Evaluation parsing failed: {reason}"
+        }
+
+    cleaned_content = (content or "").strip()
+    if cleaned_content.startswith("```json"):
+        cleaned_content = cleaned_content[len("```json"):]
+    if cleaned_content.endswith("```"):
+        cleaned_content = cleaned_content[:-len("```")]
+    json_start = cleaned_content.find("[")
+    json_end = cleaned_content.rfind("]") + 1
+    if json_start == -1 or json_end <= json_start:
+        reason = f"no JSON array in critic's batch response. Raw response snippet: {content[:200]}..."
+        return [failed(reason) for _ in range(expected_count)]
+    try:
+        parsed_list = json.loads(cleaned_content[json_start:json_end])
+    except json.JSONDecodeError as e:
+        return [failed(f"JSON decoding failed: {str(e)}.") for _ in range(expected_count)]
+
+    evaluations = [failed("critic returned no evaluation for this response.") for _ in range(expected_count)]
+    for position, item in enumerate(parsed_list if isinstance(parsed_list, list) else []):
+        index = item.get("index", position + 1) if isinstance(item, dict) else position + 1
+        try:
+            index = int(index)
+        except (ValueError, TypeError):
+            continue
+        if not 1 <= index <= expected_count:
+            continue
+        try:
+            evaluation = {key: item[key] for key in EXPECTED_EVALUATION_KEYS if key in item}
+            _validate_evaluation(evaluation)
+            evaluations[index - 1] = evaluation
+        except ValueError as e:
+            evaluations[index - 1] = failed(f"validation error in parsed JSON: {str(e)}.")
+    return evaluations
+
+def _parse_critic_evaluation(content: str, user_query_for_debug: str, agent_response_for_debug: str,
+                             expected_count: Optional[int] = None) -> Union[Dict, List[Dict]]:
+    """
+    Parses the critic's reply into one evaluation dict, or, when expected_count is
+    given, a batched reply into a list of expected_count evaluation dicts.
+    """
+    if expected_count is not None:
+        return _parse_critic_batch_evaluation(content, expected_count)
+
     default_error_response = {
         "completeness": 0, "quality": 0, "robustness": 0,
         "consistency": 0, "specificity": 0,
@@ -29,26 +145,7 @@ def _parse_critic_evaluation(content: str, user_query_for_debug: str, agent_resp
             json_str_for_error_reporting = json_str
             parsed_json = json.loads(json_str)
 
-            expected_keys = ["completeness", "quality", "robustness", "consistency", "specificity", "feedback"]
-            missing_keys = [key for key in expected_keys if key not in parsed_json]
-            if missing_keys:
-                raise ValueError(f"Parsed JSON is missing expected keys: {missing_keys}")
-
-            for key in expected_keys:
-                if key == "feedback":
-                    if not isinstance(parsed_json[key], str):
-                        raise ValueError(f"Field '{key}' must be a string, got {type(parsed_json[key])}")
-                else:
-                    if not isinstance(parsed_json[key], int):
-                        try:
-                            parsed_json[key] = int(str(parsed_json[key]))
-                        except (ValueError, TypeError):
-                             raise ValueError(f"Field '{key}' must be an integer, got {type(parsed_json[key])} with value '{parsed_json[key]}'")
-                    if not (0 <= parsed_json[key] <= 5):
-                        if parsed_json[key] == 0 and "parsing failed" in parsed_json.get("feedback","").lower():
-                            pass
-                        else:
-                            raise ValueError(f"Score for '{key}' ({parsed_json[key]}) is out of valid range (0-5, typically 1-5 from critic).")
+            _validate_evaluation(parsed_json)
             return parsed_json
         else:
             error_msg = "Could not find valid JSON object in critic's response."
@@ -70,14 +167,14 @@ def _parse_critic_evaluation(content: str, user_query_for_debug: str, agent_resp
         print(f"[Critic Evaluation Error] Unexpected parsing error: {str(e)}. Enable verbose logs for details.")
         return default_error_response
 
-def is_valid_json_object_message(message_dict) -> bool:
+def _parse_json_message(message_dict):
     """
-    Checks if the message content is a string that represents a valid JSON object.
-    Handles potential markdown code blocks around the JSON.
+    Returns the JSON value a message's content holds (markdown code fences are
+    allowed around it), or None if the content isn't a JSON object or array.
     """
     content = message_dict.get("content", "")
     if not isinstance(content, str):
-        return False
+        return None
 
     content_stripped = content.strip()
     if content_stripped.startswith("```json"):
@@ -86,30 +183,68 @@ def is_valid_json_object_message(message_dict) -> bool:
         content_stripped = content_stripped[:-len("```")]
     content_stripped = content_stripped.strip()
 
-    if content_stripped.startswith("{") and content_stripped.endswith("}"):
+    if (content_stripped.startswith("{") and content_stripped.endswith("}")) or \
+            (content_stripped.startswith("[") and content_stripped.endswith("]")):
         try:
-            json.loads(content_stripped)
-            return True
+            return json.loads(content_stripped)
         except json.JSONDecodeError:
-            return False
-    return False
+            return None
+    return None
+
+def is_valid_json_object_message(message_dict) -> bool:
+    """
+    Checks if the message content is a string that represents a valid JSON object.
+    Handles potential markdown code blocks around the JSON.
+    """
+    return isinstance(_parse_json_message(message_dict), dict)
 
-def evaluate_response(user_query: str, agent_response: str) -> Dict:
-    agent_type_description = "AI research assistant"
+def is_valid_json_array_message(message_dict) -> bool:
+    """Like is_valid_json_object_message, for the JSON array a batched critic returns."""
+    return isinstance(_parse_json_message(message_dict), list)
+
+def is_critic_evaluation_message(message_dict) -> bool:
+    """A single (JSON object) or batched (JSON array) critic evaluation."""
+    return isinstance(_parse_json_message(message_dict), (dict, list))
+
+AGENT_TYPE_DESCRIPTION = "AI research assistant"
+
+def _build_critic_agents(llm_config: Dict = LLM_CONFIG, batch: bool = False):
+    """Creates the critic agent and the proxy that prompts it."""
+    import autogen
+
+    agent_type_description = AGENT_TYPE_DESCRIPTION
+    json_kind = "JSON array" if batch else "JSON object"
     critic_system_message = (
         f"You are an AI Critic. Your task is to meticulously evaluate the response of an {agent_type_description} "
         "based on a user's query and a defined set of criteria. "
         "Provide your evaluation strictly in the specified JSON format. "
-        "Do not add any explanatory text before or after the JSON object. "
+        f"Do not add any explanatory text before or after the {json_kind}. "
         "Ensure all score fields (completeness, quality, robustness, consistency, specificity) are integers between 1 and 5."
     )
 
     critic_agent = autogen.AssistantAgent(
         name="critic_agent",
-        llm_config=LLM_CONFIG,
+        llm_config=llm_config,
         system_message=critic_system_message,
-        is_termination_msg=is_valid_json_object_message
+        is_termination_msg=is_valid_json_array_message if batch else is_valid_json_object_message
+    )
+    activate_custom_model_clients(critic_agent, llm_config)
+    tracing.trace_llm_calls(critic_agent)
+
+    evaluation_request_proxy = autogen.UserProxyAgent(
+        name="evaluation_request_proxy",
+        human_input_mode="NEVER",
+        # The critic answers once; an auto-reply would only prompt it again with an empty message.
+        max_consecutive_auto_reply=0,
+        is_termination_msg=is_critic_evaluation_message,
+        code_execution_config=False,
     )
+    return critic_agent, evaluation_request_proxy
+
+def _build_critic_chat(user_query: str, agent_response: str, llm_config: Dict = LLM_CONFIG):
+    """Creates the critic agent, the proxy that prompts it, and the critic prompt."""
+    agent_type_description = AGENT_TYPE_DESCRIPTION
+    critic_agent, evaluation_request_proxy = _build_critic_agents(llm_config)
 
     critic_prompt = f"""
 You are evaluating the response from an {agent_type_description}.
@@ -124,36 +259,7 @@ You are evaluating the response from an {agent_type_description}.
 Please evaluate the agent's response based on the following criteria. For each criterion, provide a score from 1 to 5 (1=Poor, 5=Excellent).
 Provide your evaluation as a single JSON object.
 
-1.  **Completeness (1-5):**
-    * Did the agent address all aspects of the user's query? (e.g., topic, year constraints, number of citations if applicable).
-    * If the query had multiple parts, were all parts covered in the response?
-
-2.  **Quality (1-5):**
-    * Was the information provided accurate and correct? (e.g., are paper details plausible, year matching?).
-    * Was the response clear, well-organized, and easy to understand?
-    * If the response is expected to be JSON (as requested for the research assistant), is the JSON well-formed and does it contain the required fields (title, authors, year, link)?
-
-3.  **Robustness (1-5):**
-    * How well did the agent handle the specific query? (e.g., handling of year parameters like 'after', 'before', 'in').
-    * If the query had potentially tricky aspects (e.g., non-existent topics, impossible year constraints), how did it respond? (Score N/A or 3 if the query is straightforward and handled well. If the agent simply fails or errors out on tricky inputs that it *should* handle gracefully, score lower).
-    * Note: The 'min_citations' parameter might be 'Not available in this version' for the tool; assess how the agent handles this if queried.
-
-4.  **Consistency (1-5):**
-    * Is the response internally consistent?
-    * Does the response align with the requirements and constraints mentioned in the user query? (e.g., if the query asked for papers 'after' a year, are all results indeed after that year?).
-    * Is the agent's use of its tools (e.g. search_research_papers function) consistent with its instructions?
-
-5.  **Specificity (1-5):**
-    * Does the agent provide specific details for each paper (title, authors, year, link as requested)?
-    * Is the level of detail appropriate for a research assistant's findings?
-
-**Additional Checks (to be covered in feedback):**
-* **Context and Justifications:** Did the agent provide clear context for its response? (e.g. number of papers found, any issues encountered).
-* **Interpretation of Query:** Did the agent correctly interpret all parts of the query, including topic, year, and comparison type?
-* **Feasibility of Results:** Are the results (e.g. paper titles, authors) plausible for the given topic and year? (The critic cannot verify external links).
-* **Format Adherence:** Did the agent return results in the specified JSON format with all required fields?
-
-**Output Format:**
+{CRITIC_CRITERIA}**Output Format:**
 Return your evaluation STRICTLY as a JSON object with the following fields:
 -   `completeness` (integer, 1-5)
 -   `quality` (integer, 1-5)
@@ -175,34 +281,231 @@ Example JSON output:
 Begin evaluation. Provide ONLY the JSON object.
 """
 
-    evaluation_request_proxy = autogen.UserProxyAgent(
-        name="evaluation_request_proxy",
-        human_input_mode="NEVER",
-        max_consecutive_auto_reply=1,
-        code_execution_config=False,
-    )
+    return critic_agent, evaluation_request_proxy, critic_prompt
 
-    evaluation_request_proxy.initiate_chat(
-        recipient=critic_agent,
-        message=critic_prompt,
-        clear_history=True,
+def _build_batch_critic_prompt(pairs: List[Tuple[str, str]]) -> str:
+    """Critic prompt that scores several (query, response) pairs in one call."""
+    responses = "\n".join(
+        f"**Response {index}**\nUser Query:\n{user_query}\n\nAgent's Response:\n{agent_response}\n"
+        for index, (user_query, agent_response) in enumerate(pairs, start=1)
     )
+    return f"""
+You are evaluating {len(pairs)} separate responses from an {AGENT_TYPE_DESCRIPTION}. Each response answers its own user query.
+
+{responses}
+**Evaluation Criteria & Instructions:**
+Please evaluate each agent response independently, against its own user query, based on the following criteria. For each criterion, provide a score from 1 to 5 (1=Poor, 5=Excellent).
+Provide your evaluation as a single JSON array with one object per response.
+
+{CRITIC_CRITERIA}**Output Format:**
+Return your evaluation STRICTLY as a JSON array containing exactly {len(pairs)} objects, in response order, each with the following fields:
+-   `index` (integer, the response number)
+-   `completeness` (integer, 1-5)
+-   `quality` (integer, 1-5)
+-   `robustness` (integer, 1-5)
+-   `consistency` (integer, 1-5)
+-   `specificity` (integer, 1-5)
+-   `feedback` (string, a concise explanation for the scores of that response, incorporating the additional checks.)
+
+Example JSON output for two responses:
+[
+  {{"index": 1, "completeness": 4, "quality": 5, "robustness": 3, "consistency": 5, "specificity": 4, "feedback": "..."}},
+  {{"index": 2, "completeness": 2, "quality": 3, "robustness": 3, "consistency": 2, "specificity": 3, "feedback": "..."}}
+]
 
+Begin evaluation. Provide ONLY the JSON array.
+"""
+
+def _critic_replies(chat_history: List[Dict], critic_name: str) -> List[Dict]:
+    """
+    The critic's messages in the proxy's chat history. The history also holds the
+    proxy's own prompt (role "assistant" from the proxy's side), so messages are
+    matched by sender name, falling back to the received role when no name is set.
+    """
+    return [
+        message for message in chat_history
+        if message.get("name") == critic_name or ("name" not in message and message.get("role") == "user")
+    ]
+
+def _collect_critic_evaluation(critic_agent, evaluation_request_proxy, user_query: str, agent_response: str,
+                               expected_count: Optional[int] = None) -> Union[Dict, List[Dict]]:
     critic_json_response = ""
     chat_history = evaluation_request_proxy.chat_messages.get(critic_agent, [])
+    critic_replies = _critic_replies(chat_history, critic_agent.name)
 
-    if chat_history:
-        critic_json_response = chat_history[0].get('content', "")
-        if len(chat_history) > 1:
-            print(f"Warning: Critic agent sent {len(chat_history)} messages. Expected 1. Using the first.")
-            for i, msg_data in enumerate(chat_history):
-                print(f"Critic Message {i+1}: {msg_data.get('content','')[:200]}...")
-    else:
-        last_msg_obj = evaluation_request_proxy.last_message()
-        if last_msg_obj and last_msg_obj.get("role") != "user":
-             critic_json_response = last_msg_obj.get("content","")
+    if critic_replies:
+        critic_json_response = critic_replies[-1].get('content', "") or ""
+        if len(critic_replies) > 1:
+            print(f"Warning: Critic agent sent {len(critic_replies)} messages. Expected 1. Using the last.")
+            for i, msg_data in enumerate(critic_replies):
+                print(f"Critic Message {i+1}: {(msg_data.get('content') or '')[:200]}...")
 
     if not critic_json_response:
         print("Error: No response content retrieved from the critic agent. Evaluation cannot proceed.")
 
-    return _parse_critic_evaluation(critic_json_response, user_query, agent_response)
\ No newline at end of file
+    return _parse_critic_evaluation(critic_json_response, user_query, agent_response, expected_count)
+
+# ======================
+# Rule-based Scoring & Evaluation Cache
+# ======================
+def _rule_evaluation(scores: Tuple[int, int, int, int, int], feedback: str) -> Dict:
+    evaluation = dict(zip(EXPECTED_EVALUATION_KEYS, scores))
+    evaluation["feedback"] = f"[rule-based] {feedback}"
+    return evaluation
+
+def rule_based_evaluation(agent_response: str) -> Optional[Dict]:
+    """
+    Scores trivially empty or malformed responses deterministically, without the
+    LLM. Returns None for responses that need the critic.
+    """
+    content = (agent_response or "").strip()
+    if not content:
+        return _rule_evaluation((1, 1, 1, 1, 1), "The agent returned an empty response.")
+    try:
+        parsed = json.loads(content)
+    except json.JSONDecodeError:
+        return _rule_evaluation((1, 1, 1, 1, 1),
+                                "The response is not valid JSON, so it does not follow the required list-of-papers format.")
+    if not isinstance(parsed, list):
+        return _rule_evaluation((1, 1, 1, 1, 1), "The response is JSON but not a list of papers as required.")
+    if not parsed:
+        return _rule_evaluation((1, 3, 3, 3, 1),
+                                "The agent returned a well-formed empty list: no papers were found for the query.")
+    if any(isinstance(paper, dict) and "error" in paper for paper in parsed):
+        return _rule_evaluation((1, 1, 2, 2, 1), "The search tool reported an error and no papers were returned.")
+    if not all(isinstance(paper, dict) for paper in parsed):
+        return _rule_evaluation((1, 1, 1, 1, 1), "The list contains entries that are not paper objects.")
+    return None
+
+_evaluation_cache = None
+_evaluation_cache_lock = threading.Lock()
+
+def _get_evaluation_cache() -> Optional[SearchCache]:
+    global _evaluation_cache
+    if not EVALUATION_CONFIG["cache_path"]:
+        return None
+    with _evaluation_cache_lock:
+        if _evaluation_cache is None:
+            _evaluation_cache = SearchCache(
+                path=EVALUATION_CONFIG["cache_path"],
+                ttl_seconds=EVALUATION_CONFIG["ttl_seconds"],
+                max_entries=EVALUATION_CONFIG["max_entries"],
+                table="evaluation_cache",
+                metric_prefix="evaluation_cache",
+            )
+        return _evaluation_cache
+
+def _evaluation_cache_key(user_query: str, agent_response: str, llm_config: Dict) -> str:
+    """Content hash of the pair (with JSON responses canonicalized) and the critic model."""
+    try:
+        response = json.dumps(json.loads(agent_response), sort_keys=True, separators=(",", ":"))
+    except (json.JSONDecodeError, TypeError):
+        response = (agent_response or "").strip()
+    models = [entry.get("model") for entry in llm_config.get("config_list", [])]
+    payload = json.dumps([" ".join(user_query.split()), response, models])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _is_failed_evaluation(evaluation: Dict) -> bool:
+    return all(evaluation.get(key) == 0 for key in EXPECTED_EVALUATION_KEYS if key != "feedback")
+
+def _lookup_evaluation(user_query: str, agent_response: str, llm_config: Dict,
+                       use_cache: bool = True) -> Optional[Dict]:
+    if EVALUATION_CONFIG["rule_based"]:
+        evaluation = rule_based_evaluation(agent_response)
+        if evaluation is not None:
+            tracing.set_attribute("evaluation.source", "rules")
+            return evaluation
+    cache = _get_evaluation_cache() if use_cache else None
+    if cache is not None:
+        evaluation = cache.get(_evaluation_cache_key(user_query, agent_response, llm_config))
+        if evaluation is not None:
+            tracing.set_attribute("evaluation.source", "cache")
+            return evaluation
+    return None
+
+def _store_evaluation(user_query: str, agent_response: str, llm_config: Dict, evaluation: Dict,
+                      use_cache: bool = True) -> None:
+    cache = _get_evaluation_cache() if use_cache else None
+    if cache is not None and not _is_failed_evaluation(evaluation):
+        cache.set(_evaluation_cache_key(user_query, agent_response, llm_config), evaluation)
+
+# ======================
+# Evaluation Entry Points
+# ======================
+def evaluate_response(user_query: str, agent_response: str, llm_config: Dict = LLM_CONFIG,
+                      use_cache: bool = True) -> Dict:
+    """Scores one response with the critic; use_cache=False skips the evaluation cache (rules still apply)."""
+    with tracing.span("critic.evaluate", **{"response.bytes": len(agent_response)}):
+        evaluation = _lookup_evaluation(user_query, agent_response, llm_config, use_cache)
+        if evaluation is not None:
+            return evaluation
+
+        critic_agent, evaluation_request_proxy, critic_prompt = _build_critic_chat(user_query, agent_response, llm_config)
+        evaluation_request_proxy.initiate_chat(
+            recipient=critic_agent,
+            message=critic_prompt,
+            clear_history=True,
+        )
+        evaluation = _collect_critic_evaluation(critic_agent, evaluation_request_proxy, user_query, agent_response)
+        _store_evaluation(user_query, agent_response, llm_config, evaluation, use_cache)
+        return evaluation
+
+async def aevaluate_response(user_query: str, agent_response: str, llm_config: Dict = LLM_CONFIG,
+                             use_cache: bool = True) -> Dict:
+    """Async counterpart of evaluate_response; awaits the critic and runs the cache lookups in a thread."""
+    import asyncio
+
+    with tracing.span("critic.evaluate", **{"response.bytes": len(agent_response)}):
+        evaluation = await asyncio.to_thread(_lookup_evaluation, user_query, agent_response, llm_config, use_cache)
+        if evaluation is not None:
+            return evaluation
+
+        critic_agent, evaluation_request_proxy, critic_prompt = _build_critic_chat(user_query, agent_response, llm_config)
+        await evaluation_request_proxy.a_initiate_chat(
+            recipient=critic_agent,
+            message=critic_prompt,
+            clear_history=True,
+        )
+        evaluation = _collect_critic_evaluation(critic_agent, evaluation_request_proxy, user_query, agent_response)
+        await asyncio.to_thread(_store_evaluation, user_query, agent_response, llm_config, evaluation, use_cache)
+        return evaluation
+
+def evaluate_responses(pairs: List[Tuple[str, str]], llm_config: Dict = LLM_CONFIG,
+                       batch_size: int = EVALUATION_CONFIG["batch_size"], use_cache: bool = True) -> List[Dict]:
+    """
+    Evaluates many (user_query, agent_response) pairs. Rule-scored and cached pairs
+    skip the LLM, identical pairs are evaluated once, and the rest are scored
+    batch_size at a time in a single critic call each.
+    """
+    evaluations: List[Optional[Dict]] = [None] * len(pairs)
+    pending: Dict[str, List[int]] = {}
+    for position, (user_query, agent_response) in enumerate(pairs):
+        evaluation = _lookup_evaluation(user_query, agent_response, llm_config, use_cache)
+        if evaluation is not None:
+            evaluations[position] = evaluation
+        else:
+            key = _evaluation_cache_key(user_query, agent_response, llm_config)
+            pending.setdefault(key, []).append(position)
+
+    groups = list(pending.values())
+    for start in range(0, len(groups), batch_size):
+        chunk = groups[start:start + batch_size]
+        chunk_pairs = [pairs[positions[0]] for positions in chunk]
+        if len(chunk_pairs) == 1:
+            results = [evaluate_response(*chunk_pairs[0], llm_config=llm_config, use_cache=use_cache)]
+        else:
+            with tracing.span("critic.evaluate_batch", **{"batch.size": len(chunk_pairs)}):
+                critic_agent, evaluation_request_proxy = _build_critic_agents(llm_config, batch=True)
+                evaluation_request_proxy.initiate_chat(
+                    recipient=critic_agent,
+                    message=_build_batch_critic_prompt(chunk_pairs),
+                    clear_history=True,
+                )
+                results = _collect_critic_evaluation(critic_agent, evaluation_request_proxy, "", "",
+                                                     expected_count=len(chunk_pairs))
+            for (user_query, agent_response), evaluation in zip(chunk_pairs, results):
+                _store_evaluation(user_query, agent_response, llm_config, evaluation, use_cache)
+        for positions, evaluation in zip(chunk, results):
+            for position in positions:
+                evaluations[position] = evaluation
+    return evaluations
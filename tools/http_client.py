@@ -0,0 +1,294 @@
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tools import tracing
+
+if TYPE_CHECKING:
+    import asyncio
+    import httpx
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+# ======================
+# Rate Limiting
+# ======================
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket. acquire() blocks until a token is available, so
+    concurrent callers queue up instead of exceeding the allowed request rate.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: int = 1):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Takes one token, sleeping as needed. Returns the time spent waiting."""
+        waited = 0.0
+        while True:
+            delay = self._try_acquire()
+            if delay == 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self) -> float:
+        """Like acquire(), but yields to the event loop while waiting."""
+        import asyncio
+
+        waited = 0.0
+        while True:
+            delay = self._try_acquire()
+            if delay == 0:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def _try_acquire(self) -> float:
+        """Takes a token if one is available and returns 0, else returns the wait until the next one."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate_per_second)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate_per_second
+
+
+# ======================
+# Pooled HTTP Client
+# ======================
+class _RetryPolicy:
+    """
+    Timeout, retry/backoff and rate limiting settings shared by HttpClient and
+    AsyncHttpClient. The retry decisions live here so the two clients only
+    differ in how they send, sleep and close.
+    """
+
+    def __init__(self, timeout: float = 15.0, max_retries: int = 4, backoff_factor: float = 1.0,
+                 max_backoff: float = 60.0, rate_limiter: Optional[TokenBucketRateLimiter] = None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.rate_limiter = rate_limiter
+
+    def _retries_status(self, status_code: int, attempt: int) -> bool:
+        return status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries
+
+    def _error_retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Returns the wait before retrying a failed attempt, or None once retries are exhausted."""
+        if attempt >= self.max_retries:
+            return None
+        delay = self._backoff_delay(attempt)
+        print(f"HTTP request failed ({error}); retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+        tracing.add_to_attribute("http.retries")
+        return delay
+
+    def _status_retry_delay(self, url: str, status_code: int, retry_after: Optional[str], attempt: int) -> float:
+        delay = _retry_after_delay(retry_after, self.max_backoff)
+        if delay is None:
+            delay = self._backoff_delay(attempt)
+        print(f"HTTP {status_code} from {url}; retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+        tracing.add_to_attribute("http.retries")
+        return delay
+
+    def _backoff_delay(self, attempt: int) -> float:
+        return _backoff_delay(attempt, self.backoff_factor, self.max_backoff)
+
+    @staticmethod
+    def _record_response(active, response) -> None:
+        if active is not None:
+            active.set_attribute("http.status_code", response.status_code)
+            if response.headers.get("Content-Length"):
+                active.set_attribute("http.response_bytes", int(response.headers["Content-Length"]))
+
+
+class HttpClient(_RetryPolicy):
+    """
+    requests.Session wrapper with keep-alive connection pooling, bounded timeouts,
+    exponential backoff on transient failures (honoring Retry-After) and an
+    optional shared rate limiter applied to every attempt.
+    """
+
+    def __init__(self, timeout: float = 15.0, max_retries: int = 4, backoff_factor: float = 1.0,
+                 max_backoff: float = 60.0, pool_maxsize: int = 10,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None):
+        super().__init__(timeout, max_retries, backoff_factor, max_backoff, rate_limiter)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url: str, params: Optional[Dict] = None, stream: bool = False) -> requests.Response:
+        with tracing.span("http.request", **{"http.method": "GET", "http.url": url}) as active:
+            response = self._get_with_retries(url, params, stream)
+            self._record_response(active, response)
+            return response
+
+    def _get_with_retries(self, url: str, params: Optional[Dict], stream: bool) -> requests.Response:
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                tracing.add_to_attribute("http.rate_limit_wait_seconds", self.rate_limiter.acquire())
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                delay = self._error_retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            else:
+                if not self._retries_status(response.status_code, attempt):
+                    try:
+                        response.raise_for_status()
+                    except requests.exceptions.HTTPError:
+                        # A streamed response holds its pooled connection until closed.
+                        response.close()
+                        raise
+                    return response
+                response.close()
+                delay = self._status_retry_delay(url, response.status_code, response.headers.get("Retry-After"), attempt)
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class AsyncHttpClient(_RetryPolicy):
+    """
+    Async counterpart of HttpClient built on a pooled httpx.AsyncClient, with the
+    same timeout, retry/backoff and rate limiting behavior. httpx is only imported
+    once an async client is created, keeping it off the synchronous startup path.
+    """
+
+    def __init__(self, timeout: float = 15.0, max_retries: int = 4, backoff_factor: float = 1.0,
+                 max_backoff: float = 60.0, pool_maxsize: int = 10,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None):
+        super().__init__(timeout, max_retries, backoff_factor, max_backoff, rate_limiter)
+        import httpx
+
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize),
+        )
+
+    @asynccontextmanager
+    async def stream(self, url: str, params: Optional[Dict] = None) -> AsyncIterator["httpx.Response"]:
+        """Opens a streaming GET, retrying transient failures before the body is handed over."""
+        with tracing.span("http.request", **{"http.method": "GET", "http.url": url}) as active:
+            async with self._stream_with_retries(url, params) as response:
+                self._record_response(active, response)
+                yield response
+
+    @asynccontextmanager
+    async def _stream_with_retries(self, url: str, params: Optional[Dict]) -> AsyncIterator["httpx.Response"]:
+        import asyncio
+        import httpx
+
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                tracing.add_to_attribute("http.rate_limit_wait_seconds", await self.rate_limiter.acquire_async())
+            try:
+                request = self.client.build_request("GET", url, params=params)
+                response = await self.client.send(request, stream=True)
+            except httpx.TransportError as e:
+                delay = self._error_retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            else:
+                if not self._retries_status(response.status_code, attempt):
+                    try:
+                        response.raise_for_status()
+                        yield response
+                    finally:
+                        await response.aclose()
+                    return
+                await response.aclose()
+                delay = self._status_retry_delay(url, response.status_code, response.headers.get("Retry-After"), attempt)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def _backoff_delay(attempt: int, backoff_factor: float, max_backoff: float) -> float:
+    delay = backoff_factor * (2 ** attempt)
+    return min(max_backoff, delay + random.uniform(0, backoff_factor))
+
+
+def _retry_after_delay(retry_after: Optional[str], max_backoff: float) -> Optional[float]:
+    if not retry_after:
+        return None
+    try:
+        delay = float(retry_after)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max_backoff, max(0.0, delay))
+
+
+# arXiv asks API clients to make no more than one request every three seconds.
+ARXIV_RATE_LIMITER = TokenBucketRateLimiter(rate_per_second=1 / 3)
+
+_arxiv_client: Optional[HttpClient] = None
+_async_arxiv_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpClient]" = weakref.WeakKeyDictionary()
+_arxiv_client_lock = threading.Lock()
+
+
+def get_arxiv_client() -> HttpClient:
+    """Returns the process-wide HTTP client used for all arXiv API calls."""
+    global _arxiv_client
+    with _arxiv_client_lock:
+        if _arxiv_client is None:
+            _arxiv_client = HttpClient(rate_limiter=ARXIV_RATE_LIMITER)
+        return _arxiv_client
+
+
+def get_async_arxiv_client() -> AsyncHttpClient:
+    """
+    Returns the async arXiv client for the running event loop. httpx connection
+    pools are bound to a loop, so each loop gets its own client; all of them
+    share the process-wide ARXIV_RATE_LIMITER.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    with _arxiv_client_lock:
+        client = _async_arxiv_clients.get(loop)
+        if client is None:
+            client = AsyncHttpClient(rate_limiter=ARXIV_RATE_LIMITER)
+            _async_arxiv_clients[loop] = client
+        return client
+
+
+async def aclose_async_clients() -> None:
+    """
+    Closes the running event loop's async arXiv client, if one was created. Await
+    it before the loop ends (e.g. at the end of the coroutine passed to
+    asyncio.run); otherwise the client's connection pool is never closed.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    with _arxiv_client_lock:
+        client = _async_arxiv_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,241 @@
+import argparse
+import json
+import re
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Tuple
+
+ARXIV_OAI_NS = "{http://arxiv.org/OAI/arXiv/}"
+OAI_RECORD_TAG = ARXIV_OAI_NS + "arXiv"
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def year_bounds(year: int, comparison: str) -> Tuple[int, int]:
+    """Inclusive (min_year, max_year) range for a before/after/in comparison."""
+    if comparison == "before":
+        return (0, year - 1)
+    if comparison == "after":
+        return (year + 1, 9999)
+    if comparison == "in":
+        return (year, year)
+    return (0, 9999)
+
+
+# ======================
+# Local arXiv Metadata Index
+# ======================
+class LocalPaperIndex:
+    """
+    On-disk full-text index over arXiv metadata, built on SQLite FTS5.
+
+    Title and summary are held in an FTS5 inverted index (porter-stemmed) ranked
+    with BM25, and the papers table carries an indexed year column so the
+    before/after/in filters are range scans. Ingestion is an upsert keyed on the
+    arXiv id and skips records whose update marker hasn't changed, so dumps can be
+    re-ingested incrementally. No network access is needed at query time.
+    """
+
+    def __init__(self, path: str = "arxiv_index.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS papers ("
+            " doc_id INTEGER PRIMARY KEY,"
+            " arxiv_id TEXT NOT NULL UNIQUE,"
+            " title TEXT NOT NULL,"
+            " authors TEXT NOT NULL,"
+            " year INTEGER NOT NULL,"
+            " published TEXT NOT NULL,"
+            " summary TEXT NOT NULL,"
+            " updated TEXT);"
+            "CREATE INDEX IF NOT EXISTS idx_papers_year ON papers (year);"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5("
+            " title, summary, content='', tokenize='porter unicode61');"
+        )
+        self._conn.commit()
+
+    # ----------------------
+    # Ingestion
+    # ----------------------
+    def ingest_kaggle(self, path: str, batch_size: int = 5000) -> Dict:
+        """Ingests the Kaggle arxiv-metadata-oai-snapshot JSON-lines dump."""
+        return self._ingest(self._iter_kaggle_records(path), batch_size)
+
+    def ingest_oai(self, path: str, batch_size: int = 5000) -> Dict:
+        """Ingests an OAI-PMH ListRecords response (metadataPrefix=arXiv) saved to disk."""
+        return self._ingest(self._iter_oai_records(path), batch_size)
+
+    def _ingest(self, records: Iterator[Dict], batch_size: int) -> Dict:
+        stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+        with self._lock:
+            pending = 0
+            for record in records:
+                stats[self._upsert(record)] += 1
+                pending += 1
+                if pending >= batch_size:
+                    self._conn.commit()
+                    pending = 0
+            self._conn.commit()
+        return stats
+
+    def _upsert(self, record: Dict) -> str:
+        row = self._conn.execute(
+            "SELECT doc_id, title, summary, updated FROM papers WHERE arxiv_id = ?", (record["arxiv_id"],)
+        ).fetchone()
+        if row is not None and row[3] is not None and row[3] == record["updated"]:
+            return "unchanged"
+
+        values = (record["title"], json.dumps(record["authors"]), record["year"],
+                  record["published"], record["summary"], record["updated"])
+        if row is None:
+            cursor = self._conn.execute(
+                "INSERT INTO papers (arxiv_id, title, authors, year, published, summary, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (record["arxiv_id"],) + values,
+            )
+            self._conn.execute(
+                "INSERT INTO papers_fts (rowid, title, summary) VALUES (?, ?, ?)",
+                (cursor.lastrowid, record["title"], record["summary"]),
+            )
+            return "inserted"
+
+        doc_id, old_title, old_summary, _ = row
+        # Contentless FTS5 tables need the old values to remove the old postings.
+        self._conn.execute(
+            "INSERT INTO papers_fts (papers_fts, rowid, title, summary) VALUES ('delete', ?, ?, ?)",
+            (doc_id, old_title, old_summary),
+        )
+        self._conn.execute(
+            "UPDATE papers SET title = ?, authors = ?, year = ?, published = ?, summary = ?, updated = ?"
+            " WHERE doc_id = ?",
+            values + (doc_id,),
+        )
+        self._conn.execute(
+            "INSERT INTO papers_fts (rowid, title, summary) VALUES (?, ?, ?)",
+            (doc_id, record["title"], record["summary"]),
+        )
+        return "updated"
+
+    @staticmethod
+    def _iter_kaggle_records(path: str) -> Iterator[Dict]:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                raw = json.loads(line)
+                versions = raw.get("versions") or []
+                try:
+                    published = parsedate_to_datetime(versions[0]["created"]).strftime("%Y-%m-%dT%H:%M:%SZ")
+                except (IndexError, KeyError, TypeError, ValueError):
+                    continue
+                if raw.get("authors_parsed"):
+                    authors = [" ".join(part for part in (parts[1], parts[0]) if part).strip()
+                               for parts in raw["authors_parsed"]]
+                else:
+                    authors = [name.strip() for name in (raw.get("authors") or "").split(",") if name.strip()]
+                yield {
+                    "arxiv_id": raw["id"],
+                    "title": " ".join((raw.get("title") or "N/A").split()),
+                    "authors": authors,
+                    "year": int(published[:4]),
+                    "published": published,
+                    "summary": " ".join((raw.get("abstract") or "N/A").split()),
+                    "updated": raw.get("update_date"),
+                }
+
+    @staticmethod
+    def _iter_oai_records(path: str) -> Iterator[Dict]:
+        for _, elem in ET.iterparse(path, events=("end",)):
+            if elem.tag != OAI_RECORD_TAG:
+                continue
+            created = elem.findtext(ARXIV_OAI_NS + "created")
+            arxiv_id = elem.findtext(ARXIV_OAI_NS + "id")
+            if created and arxiv_id:
+                authors = []
+                for author in elem.iter(ARXIV_OAI_NS + "author"):
+                    parts = (author.findtext(ARXIV_OAI_NS + "forenames"), author.findtext(ARXIV_OAI_NS + "keyname"))
+                    authors.append(" ".join(part for part in parts if part))
+                yield {
+                    "arxiv_id": arxiv_id,
+                    "title": " ".join((elem.findtext(ARXIV_OAI_NS + "title") or "N/A").split()),
+                    "authors": authors,
+                    "year": int(created[:4]),
+                    "published": f"{created}T00:00:00Z",
+                    "summary": " ".join((elem.findtext(ARXIV_OAI_NS + "abstract") or "N/A").split()),
+                    "updated": elem.findtext(ARXIV_OAI_NS + "updated") or created,
+                }
+            elem.clear()
+
+    # ----------------------
+    # Querying
+    # ----------------------
+    def search(self, topic: str, year: int, comparison: str, limit: int = 10) -> List[Dict]:
+        """
+        BM25-ranked search over title and summary restricted to the year window.
+        All topic terms must match; if that finds nothing, any term may match.
+        Returns entries in the same shape as AtomFeedParser yields.
+        """
+        terms = _TERM_PATTERN.findall(topic.lower())
+        if not terms:
+            return []
+        min_year, max_year = year_bounds(year, comparison)
+
+        rows = []
+        for operator in (" AND ", " OR "):
+            match_expression = operator.join(f'"{term}"' for term in terms)
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT p.arxiv_id, p.title, p.authors, p.year, p.published, p.summary"
+                    " FROM papers_fts f JOIN papers p ON p.doc_id = f.rowid"
+                    " WHERE papers_fts MATCH ? AND p.year BETWEEN ? AND ?"
+                    " ORDER BY bm25(papers_fts, 2.0, 1.0) LIMIT ?",
+                    (match_expression, min_year, max_year, limit),
+                ).fetchall()
+            if rows or len(terms) == 1:
+                break
+
+        return [
+            {
+                "title": title,
+                "authors": json.loads(authors),
+                "year": paper_year,
+                "link": f"http://arxiv.org/abs/{arxiv_id}",
+                "summary": summary,
+                "published": published,
+            }
+            for arxiv_id, title, authors, paper_year, published, summary in rows
+        ]
+
+    def count(self) -> int:
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()
+        return size
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query the local arXiv metadata index.")
+    parser.add_argument("--index", default="arxiv_index.sqlite", help="Path of the index database.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    ingest_parser = subparsers.add_parser("ingest", help="Ingest a metadata dump.")
+    ingest_parser.add_argument("dump", help="Kaggle JSON-lines snapshot or OAI-PMH XML file.")
+    ingest_parser.add_argument("--format", choices=["kaggle", "oai"], default="kaggle")
+    search_parser = subparsers.add_parser("search", help="Query the index.")
+    search_parser.add_argument("topic")
+    search_parser.add_argument("year", type=int)
+    search_parser.add_argument("comparison", choices=["after", "before", "in"])
+    args = parser.parse_args()
+
+    index = LocalPaperIndex(args.index)
+    if args.command == "ingest":
+        ingest = index.ingest_kaggle if args.format == "kaggle" else index.ingest_oai
+        print(json.dumps(ingest(args.dump), indent=2))
+    else:
+        print(json.dumps(index.search(args.topic, args.year, args.comparison), indent=2))
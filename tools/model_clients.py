@@ -0,0 +1,23 @@
+from typing import Dict
+
+# ======================
+# Custom Model Clients
+# ======================
+# autogen only instantiates a custom client for a config_list entry that sets
+# "model_client_cls" once the class has been registered on the agent. Classes
+# registered here are activated automatically for every agent we build.
+CUSTOM_MODEL_CLIENTS: Dict[str, type] = {}
+
+
+def register_model_client_class(cls: type) -> type:
+    """Class decorator that makes cls available to config_list entries by name."""
+    CUSTOM_MODEL_CLIENTS[cls.__name__] = cls
+    return cls
+
+
+def activate_custom_model_clients(agent, llm_config: Dict) -> None:
+    names = {entry.get("model_client_cls") for entry in llm_config.get("config_list", [])}
+    for name in sorted(name for name in names if name):
+        if name not in CUSTOM_MODEL_CLIENTS:
+            raise ValueError(f"config_list references unregistered model client '{name}'.")
+        agent.register_model_client(model_client_cls=CUSTOM_MODEL_CLIENTS[name])
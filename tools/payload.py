@@ -0,0 +1,103 @@
+import json
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Rough chars-per-token ratio for English text with Mistral/OpenAI-style BPE
+# tokenizers; good enough to compare payload sizes without a tokenizer dependency.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    if max_chars is None or len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0] if " " in text[:max_chars] else text[:max_chars]
+    return cut.rstrip(" ,.;:") + "..."
+
+
+def dedupe_authors(authors: Sequence[str], max_authors: Optional[int]) -> Tuple[List[str], int]:
+    """Returns the de-duplicated author names, capped at max_authors, and how many were cut off."""
+    seen = set()
+    unique = []
+    for author in authors:
+        key = " ".join(str(author).lower().split())
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(author)
+    if max_authors is not None and len(unique) > max_authors:
+        return unique[:max_authors], len(unique) - max_authors
+    return unique, 0
+
+
+# ======================
+# Tool Result Compaction
+# ======================
+def compact_results(papers: List[Dict], fields: Sequence[str], include_summary: bool = False,
+                    summary_max_chars: Optional[int] = 300, max_authors: Optional[int] = 10) -> List[Dict]:
+    """
+    Projects papers onto the configured fields before they are sent to the LLM.
+    Summaries are only kept when include_summary is set and are truncated to
+    summary_max_chars; author lists are de-duplicated and capped at max_authors,
+    with the number left out in authors_truncated; non-numeric citation
+    placeholders are dropped.
+    """
+    compacted = []
+    for paper in papers:
+        if "error" in paper:
+            compacted.append(paper)
+            continue
+        item = {}
+        for field in fields:
+            if field == "summary" or field not in paper:
+                continue
+            if field == "authors":
+                item["authors"], hidden = dedupe_authors(paper["authors"], max_authors)
+                if hidden:
+                    item["authors_truncated"] = hidden
+            elif field == "citations":
+                if isinstance(paper["citations"], int):
+                    item["citations"] = paper["citations"]
+            else:
+                item[field] = paper[field]
+        if include_summary and "summary" in paper:
+            item["summary"] = truncate_text(paper["summary"], summary_max_chars)
+        compacted.append(item)
+    return compacted
+
+
+def encode_results(papers: List[Dict], compact_json: bool = True) -> str:
+    if compact_json:
+        return json.dumps(papers, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(papers)
+
+
+class PayloadStats:
+    """Running totals of tool payload sizes, to track tokens sent to the LLM per call."""
+
+    def __init__(self):
+        self.calls = 0
+        self.chars = 0
+        self.estimated_tokens = 0
+        self.uncompacted_estimated_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, payload: str, uncompacted_payload: str) -> None:
+        with self._lock:
+            self.calls += 1
+            self.chars += len(payload)
+            self.estimated_tokens += estimate_tokens(payload)
+            self.uncompacted_estimated_tokens += estimate_tokens(uncompacted_payload)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            calls = self.calls or 1
+            return {
+                "calls": self.calls,
+                "estimated_tokens": self.estimated_tokens,
+                "estimated_tokens_per_call": self.estimated_tokens / calls,
+                "uncompacted_estimated_tokens_per_call": self.uncompacted_estimated_tokens / calls,
+                "estimated_tokens_saved": self.uncompacted_estimated_tokens - self.estimated_tokens,
+            }
@@ -0,0 +1,109 @@
+import json
+import re
+from typing import Dict, Optional
+
+PAPER_FIELDS = ("title", "authors", "year", "link")
+
+# ======================
+# Rule-based Query Parser
+# ======================
+_TOPIC_PATTERN = re.compile(
+    r"(?:papers?|articles?|research|publications?|work)\s+(?:about|on|regarding|related to)\s+(?P<topic>.+?)\s*"
+    r"(?:,\s*)?(?:that\s+(?:were|was)\s+|which\s+(?:were|was)\s+)?(?:published|released|written|from)?\s*"
+    r"(?P<comparison>after|before|in|since|prior to|post)[\s-]+(?P<year>(?:19|20)\d{2})\b",
+    re.IGNORECASE,
+)
+_CITATIONS_PATTERN = re.compile(
+    r"(?:at least|minimum of|min(?:imum)?\.?|over|more than|>=?)?\s*(?P<count>\d+)\+?\s+citations?",
+    re.IGNORECASE,
+)
+_COMPARISON_ALIASES = {
+    "after": "after",
+    "post": "after",
+    "before": "before",
+    "prior to": "before",
+    "in": "in",
+    "since": "since",
+}
+
+
+def parse_structured_query(query: str) -> Optional[Dict]:
+    """
+    Extracts topic, year, comparison and min_citations from simple queries such as
+    "Find papers about horses published after 2020 and has 10 citations".
+    Returns None when the query doesn't fit the pattern, so the caller can fall
+    back to the LLM.
+    """
+    match = _TOPIC_PATTERN.search(query)
+    if not match:
+        return None
+
+    topic = match.group("topic").strip(" ,.'\"")
+    if not topic:
+        return None
+    year = int(match.group("year"))
+    comparison = _COMPARISON_ALIASES[" ".join(match.group("comparison").lower().split())]
+    if comparison == "since":
+        # "since 2020" includes 2020 itself.
+        comparison, year = "after", year - 1
+
+    min_citations = 0
+    citations_match = _CITATIONS_PATTERN.search(query, match.end())
+    if citations_match:
+        min_citations = int(citations_match.group("count"))
+        if re.search(r"\b(?:over|more than)\s*$", query[citations_match.start():citations_match.start("count")], re.IGNORECASE):
+            min_citations += 1
+
+    return {"topic": topic, "year": year, "comparison": comparison, "min_citations": min_citations}
+
+
+_YEAR_CONSTRAINT_PATTERN = re.compile(
+    r"\b(?P<comparison>after|before|in|since|prior to|post)[\s-]+(?P<year>(?:19|20)\d{2})\b",
+    re.IGNORECASE,
+)
+
+
+def extract_query_constraints(query: str) -> Dict:
+    """
+    Loosely extracts the year, comparison and min_citations constraints from any
+    phrasing (e.g. "equine research post-2020"), plus the remaining text with those
+    phrases removed. Constraints that aren't present are None (min_citations is 0).
+    """
+    year, comparison, min_citations = None, None, 0
+    remaining = query
+    year_match = _YEAR_CONSTRAINT_PATTERN.search(query)
+    if year_match:
+        year = int(year_match.group("year"))
+        comparison = _COMPARISON_ALIASES[" ".join(year_match.group("comparison").lower().split())]
+        if comparison == "since":
+            comparison, year = "after", year - 1
+        remaining = remaining.replace(year_match.group(0), " ")
+    citations_match = _CITATIONS_PATTERN.search(remaining)
+    if citations_match and citations_match.group(0).strip():
+        min_citations = int(citations_match.group("count"))
+        if re.search(r"\b(?:over|more than)\s*$", remaining[citations_match.start():citations_match.start("count")], re.IGNORECASE):
+            min_citations += 1
+        remaining = remaining.replace(citations_match.group(0), " ")
+    return {"year": year, "comparison": comparison, "min_citations": min_citations, "text": " ".join(remaining.split())}
+
+
+# ======================
+# Tool Result Projection
+# ======================
+def project_tool_result(tool_output: str) -> Optional[str]:
+    """
+    Projects a search tool JSON payload onto the final answer schema
+    (title, authors, year, link). Returns None if the payload isn't a clean list
+    of papers (e.g. it carries an error), so the LLM still gets to handle it.
+    """
+    if not isinstance(tool_output, str):
+        return None
+    try:
+        papers = json.loads(tool_output)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(papers, list):
+        return None
+    if any(not isinstance(paper, dict) or "error" in paper for paper in papers):
+        return None
+    return json.dumps([{field: paper.get(field) for field in PAPER_FIELDS} for paper in papers])
@@ -0,0 +1,365 @@
+import argparse
+import csv
+import json
+import mmap
+import os
+import re
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from tools.citation_store import normalize_arxiv_id
+from tools.local_index import year_bounds
+
+# Fixed-width columns: file name -> array typecode. Strings are stored as ids into
+# the shared string pool; "authors_end" is the running end offset into "authors" and
+# "citations_note" holds the placeholder text when the count is unknown.
+COLUMNS = {
+    "arxiv_id": "I",
+    "title": "I",
+    "link": "I",
+    "year": "H",
+    "citations": "i",
+    "citations_note": "I",
+    "summary": "I",
+    "authors_end": "Q",
+}
+UNKNOWN_CITATIONS = -1
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+# ======================
+# Columnar Result Store
+# ======================
+class ColumnarResultStore:
+    """
+    Append-only, column-per-file store of every paper the search tool returned.
+
+    Titles, links, arXiv ids and author names are interned into one string pool
+    (strings.bin plus an end-offset column) and referenced by uint32 id (summaries
+    go to the same pool without interning, as they are unique); years,
+    citation counts and author ranges are plain typed arrays. Reads go through
+    memory maps, so opening a store with hundreds of thousands of rows costs no
+    parsing, and year filters scan a 2-byte column. Rows are de-duplicated by
+    arXiv id. queries.jsonl records which rows answered each search, so
+    lookup_query can replay an earlier search from disk.
+    """
+
+    def __init__(self, path: str = "result_store", query_ttl_seconds: Optional[float] = 24 * 3600):
+        self.path = path
+        self.query_ttl_seconds = query_ttl_seconds
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._files = {}
+        self._maps: Dict[str, Optional[mmap.mmap]] = {}
+        for name, typecode in {**COLUMNS, "authors": "I", "string_end": "Q"}.items():
+            self._files[name] = open(os.path.join(path, f"{name}.{typecode}"), "ab")
+        self._files["strings"] = open(os.path.join(path, "strings.bin"), "ab")
+        self._string_ids: Optional[Dict[str, int]] = None
+        self._row_by_arxiv_id: Optional[Dict[int, int]] = None
+        self._recover()
+        self._queries: Dict[str, Dict] = {}
+        queries_path = os.path.join(path, "queries.jsonl")
+        if os.path.exists(queries_path):
+            with open(queries_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._queries[record["key"]] = record
+        self._queries_file = open(queries_path, "a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _recover(self) -> None:
+        """
+        Truncates every file back to the last complete row, so a write torn by a
+        crash can't leave columns of different lengths (which would misalign every
+        later append) or pool bytes that no string_end offset covers.
+        """
+        self._rows = min(self._size(name) // array(typecode).itemsize for name, typecode in COLUMNS.items())
+        for name, typecode in COLUMNS.items():
+            self._truncate(name, self._rows * array(typecode).itemsize)
+
+        self._strings_written = self._size("string_end") // 8
+        self._truncate("string_end", self._strings_written * 8)
+        ends = self._column("string_end")
+        try:
+            pool_size = self._size("strings")
+            # Strings are flushed before their end offsets, but trim any offset past the pool all the same.
+            while self._strings_written and ends[self._strings_written - 1] > pool_size:
+                self._strings_written -= 1
+            self._pool_bytes = ends[self._strings_written - 1] if self._strings_written else 0
+        finally:
+            ends.release()
+        self._truncate("string_end", self._strings_written * 8)
+        self._truncate("strings", self._pool_bytes)
+
+        authors_end = self._column("authors_end")
+        try:
+            self._authors_written = authors_end[self._rows - 1] if self._rows else 0
+        finally:
+            authors_end.release()
+        self._truncate("authors", self._authors_written * 4)
+
+    def _truncate(self, name: str, size: int) -> None:
+        if self._size(name) > size:
+            mapped = self._maps.pop(name, None)
+            if mapped is not None:
+                mapped.close()
+            self._files[name].truncate(size)
+
+    def _size(self, name: str) -> int:
+        return os.fstat(self._files[name].fileno()).st_size
+
+    def _map(self, name: str) -> Optional[mmap.mmap]:
+        """Read-only map of a column file, remapped when the file has grown since the last read."""
+        current = self._maps.get(name)
+        size = self._size(name)
+        if current is not None and len(current) == size:
+            return current
+        if current is not None:
+            current.close()
+        with open(self._files[name].name, "rb") as f:
+            self._maps[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        return self._maps[name]
+
+    def _column(self, name: str) -> memoryview:
+        typecode = COLUMNS.get(name) or {"authors": "I", "string_end": "Q"}[name]
+        mapped = self._map(name)
+        return memoryview(mapped).cast(typecode) if mapped is not None else memoryview(array(typecode))
+
+    # ---- String pool ----
+    def _string(self, string_id: int) -> str:
+        ends = self._column("string_end")
+        try:
+            start = ends[string_id - 1] if string_id else 0
+            end = ends[string_id]
+        finally:
+            ends.release()
+        return self._map("strings")[start:end].decode("utf-8")
+
+    def _intern(self, value: str) -> int:
+        if self._string_ids is None:
+            self._string_ids = self._load_interned_strings()
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = self._add_string(value)
+        return string_id
+
+    def _load_interned_strings(self) -> Dict[str, int]:
+        """
+        Decodes only the strings the interned columns refer to; summaries share the
+        pool but are never interned, so they stay on disk.
+        """
+        string_ids = set()
+        for name in ("arxiv_id", "title", "link", "citations_note"):
+            view = self._column(name)
+            try:
+                string_ids.update(view[:self._rows].tolist())
+            finally:
+                view.release()
+        authors = self._column("authors")
+        try:
+            string_ids.update(authors[:self._authors_written].tolist())
+        finally:
+            authors.release()
+        return {self._string(string_id): string_id for string_id in sorted(string_ids)}
+
+    def _add_string(self, value: str) -> int:
+        encoded = value.encode("utf-8")
+        self._files["strings"].write(encoded)
+        self._pool_bytes += len(encoded)
+        self._files["string_end"].write(array("Q", [self._pool_bytes]).tobytes())
+        self._strings_written += 1
+        return self._strings_written - 1
+
+    # ---- Writes ----
+    def append(self, papers: Iterable[Dict]) -> List[int]:
+        """
+        Appends papers that aren't stored yet and returns the row id of every paper,
+        in order. Papers without an arXiv id (e.g. from other sources) are keyed by link.
+        """
+        row_ids = []
+        with self._lock:
+            if self._row_by_arxiv_id is None:
+                ids = self._column("arxiv_id")
+                try:
+                    self._row_by_arxiv_id = {string_id: row for row, string_id in enumerate(ids[:self._rows])}
+                finally:
+                    ids.release()
+            columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+            authors = array("I")
+            for paper in papers:
+                if "error" in paper:
+                    continue
+                key = normalize_arxiv_id(paper.get("link", "")) if "arxiv.org/" in paper.get("link", "") else None
+                key_id = self._intern(key or paper.get("link") or paper.get("title", ""))
+                row = self._row_by_arxiv_id.get(key_id)
+                if row is None:
+                    row = self._rows
+                    self._rows += 1
+                    self._row_by_arxiv_id[key_id] = row
+                    authors.extend(self._intern(str(author)) for author in paper.get("authors", []))
+                    columns["arxiv_id"].append(key_id)
+                    columns["title"].append(self._intern(paper.get("title", "")))
+                    columns["link"].append(self._intern(paper.get("link", "")))
+                    columns["year"].append(int(paper.get("year") or 0))
+                    citations = paper.get("citations")
+                    columns["citations"].append(citations if isinstance(citations, int) else UNKNOWN_CITATIONS)
+                    columns["citations_note"].append(self._intern("" if isinstance(citations, int) else str(citations)))
+                    columns["summary"].append(self._add_string(paper.get("summary") or ""))
+                    columns["authors_end"].append(self._authors_written + len(authors))
+                row_ids.append(row)
+            # Strings and authors are flushed before the columns, so any row _recover keeps after a crash
+            # only points at strings and authors that were fully written.
+            self._authors_written += len(authors)
+            self._files["authors"].write(authors.tobytes())
+            for name in ("strings", "string_end", "authors"):
+                self._files[name].flush()
+            for name, values in columns.items():
+                self._files[name].write(values.tobytes())
+                self._files[name].flush()
+        return row_ids
+
+    def record_query(self, key: str, row_ids: List[int]) -> None:
+        with self._lock:
+            previous = self._queries.get(key)
+            if previous is not None and previous["rows"] == row_ids and not self._expired(previous):
+                return
+            record = {"key": key, "rows": row_ids, "stored_at": time.time()}
+            self._queries[key] = record
+            self._queries_file.write(json.dumps(record) + "\n")
+            self._queries_file.flush()
+
+    # ---- Reads ----
+    def lookup_query(self, key: str) -> Optional[List[Dict]]:
+        """The papers stored for an earlier identical search, or None if there is none (or it expired)."""
+        with self._lock:
+            record = self._queries.get(key)
+        if record is None or self._expired(record):
+            return None
+        return self.rows(record["rows"])
+
+    def _expired(self, record: Dict) -> bool:
+        return self.query_ttl_seconds is not None and time.time() - record["stored_at"] > self.query_ttl_seconds
+
+    def rows(self, row_ids: Iterable[int], include_summary: bool = True) -> List[Dict]:
+        with self._lock:
+            views = {name: self._column(name) for name in (*COLUMNS, "authors")}
+            try:
+                papers = []
+                for row in row_ids:
+                    author_start = views["authors_end"][row - 1] if row else 0
+                    author_ids = views["authors"][author_start:views["authors_end"][row]].tolist()
+                    citations = views["citations"][row]
+                    if citations == UNKNOWN_CITATIONS:
+                        citations = self._string(views["citations_note"][row]) or "N/A"
+                    paper = {
+                        "title": self._string(views["title"][row]),
+                        "authors": [self._string(author_id) for author_id in author_ids],
+                        "year": views["year"][row],
+                        "link": self._string(views["link"][row]),
+                    }
+                    if include_summary:
+                        paper["summary"] = self._string(views["summary"][row]) or "N/A"
+                    paper["citations"] = citations
+                    papers.append(paper)
+                return papers
+            finally:
+                for view in views.values():
+                    view.release()
+
+    def filter(self, year: Optional[int] = None, comparison: Optional[str] = None,
+               topic: Optional[str] = None, limit: Optional[int] = None) -> List[int]:
+        """
+        Row ids matching a year comparison and every term of topic (matched against
+        titles), newest rows first. Each distinct title is only decoded once.
+        """
+        min_year, max_year = year_bounds(year, comparison) if year is not None else (0, 9999)
+        terms = [term.lower() for term in _TERM_PATTERN.findall(topic or "")]
+        matches = []
+        title_matches: Dict[int, bool] = {}
+        with self._lock:
+            years = self._column("year")
+            titles = self._column("title")
+            try:
+                for row in range(self._rows - 1, -1, -1):
+                    if not min_year <= years[row] <= max_year:
+                        continue
+                    if terms:
+                        title_id = titles[row]
+                        matched = title_matches.get(title_id)
+                        if matched is None:
+                            words = set(_TERM_PATTERN.findall(self._string(title_id).lower()))
+                            matched = title_matches[title_id] = all(term in words for term in terms)
+                        if not matched:
+                            continue
+                    matches.append(row)
+                    if limit is not None and len(matches) >= limit:
+                        break
+            finally:
+                years.release()
+                titles.release()
+        return matches
+
+    # ---- Export ----
+    def export(self, output_path: str, output_format: str = "csv") -> int:
+        """Writes every row as csv, jsonl or (with pyarrow installed) parquet; returns the row count."""
+        papers = self.rows(range(self._rows), include_summary=False)
+        if output_format == "jsonl":
+            with open(output_path, "w", encoding="utf-8") as f:
+                for paper in papers:
+                    f.write(json.dumps(paper) + "\n")
+        elif output_format == "csv":
+            with open(output_path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=["title", "authors", "year", "link", "citations"])
+                writer.writeheader()
+                for paper in papers:
+                    writer.writerow({**paper, "authors": "; ".join(paper["authors"])})
+        elif output_format == "parquet":
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Parquet export requires the pyarrow package.") from e
+            pq.write_table(pa.Table.from_pylist(papers), output_path)
+        else:
+            raise ValueError(f"Unknown export format '{output_format}'.")
+        return len(papers)
+
+    def close(self) -> None:
+        with self._lock:
+            for mapped in self._maps.values():
+                if mapped is not None:
+                    mapped.close()
+            for f in self._files.values():
+                f.close()
+            self._queries_file.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect, filter or export a columnar result store.")
+    parser.add_argument("store", help="Directory of the result store.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("stats", help="Print row and query counts.")
+    filter_parser = subcommands.add_parser("filter", help="Print stored papers matching a year and/or topic.")
+    filter_parser.add_argument("--topic")
+    filter_parser.add_argument("--year", type=int)
+    filter_parser.add_argument("--comparison", choices=["after", "before", "in"], default="in")
+    filter_parser.add_argument("--limit", type=int, default=20)
+    export_parser = subcommands.add_parser("export", help="Export every row.")
+    export_parser.add_argument("output")
+    export_parser.add_argument("--format", choices=["csv", "jsonl", "parquet"], default="csv")
+    args = parser.parse_args()
+
+    store = ColumnarResultStore(args.store)
+    if args.command == "stats":
+        print(json.dumps({"rows": len(store), "queries": len(store._queries)}, indent=2))
+    elif args.command == "filter":
+        rows = store.filter(args.year, args.comparison, args.topic, args.limit)
+        print(json.dumps(store.rows(rows, include_summary=False), indent=2))
+    else:
+        print(f"Exported {store.export(args.output, args.format)} rows to {args.output}.")
+    store.close()
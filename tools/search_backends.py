@@ -0,0 +1,215 @@
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+
+from tools.citation_store import normalize_arxiv_id
+from tools.http_client import HttpClient, TokenBucketRateLimiter
+
+OPENALEX_API_URL = "https://api.openalex.org/works"
+# Reciprocal-rank-fusion constant: damps the advantage of the very top ranks.
+RRF_K = 60
+
+
+# ======================
+# Search Backends
+# ======================
+class SearchBackend(ABC):
+    """
+    A paper source queried alongside the primary (arXiv or local index) search.
+    search() returns entries shaped like the Atom parser's output (title, authors,
+    year, link, summary) and may add "doi" and an integer "citations". Subclasses
+    must implement search(); asearch() defaults to running it in a thread.
+    """
+
+    name = "backend"
+
+    @abstractmethod
+    def search(self, topic: str, year: int, comparison: str, limit: int) -> List[Dict]:
+        """Returns at most limit entries for topic that satisfy the year comparison."""
+
+    async def asearch(self, topic: str, year: int, comparison: str, limit: int) -> List[Dict]:
+        import asyncio
+
+        return await asyncio.to_thread(self.search, topic, year, comparison, limit)
+
+
+SEARCH_BACKENDS: Dict[str, type] = {}
+
+
+def register_search_backend(cls: type) -> type:
+    """Class decorator that makes cls available to FEDERATED_SEARCH_CONFIG by its name attribute."""
+    SEARCH_BACKENDS[cls.name] = cls
+    return cls
+
+
+def build_search_backends(names: Sequence[str]) -> List[SearchBackend]:
+    backends = []
+    for name in names:
+        if name not in SEARCH_BACKENDS:
+            raise ValueError(f"Unknown search backend '{name}'; registered: {sorted(SEARCH_BACKENDS)}.")
+        backends.append(SEARCH_BACKENDS[name]())
+    return backends
+
+
+def _matches_year(paper_year: int, year: int, comparison: str) -> bool:
+    if comparison == "before":
+        return paper_year < year
+    if comparison == "after":
+        return paper_year > year
+    if comparison == "in":
+        return paper_year == year
+    return True
+
+
+class StaticBackend(SearchBackend):
+    """
+    In-memory backend for tests and offline runs: matches every topic term against
+    title and summary, optionally after an artificial delay or by raising an error.
+    """
+
+    def __init__(self, name: str, papers: List[Dict], latency_seconds: float = 0.0,
+                 error: Optional[Exception] = None):
+        self.name = name
+        self.papers = papers
+        self.latency_seconds = latency_seconds
+        self.error = error
+
+    def search(self, topic: str, year: int, comparison: str, limit: int) -> List[Dict]:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return self._match(topic, year, comparison, limit)
+
+    async def asearch(self, topic: str, year: int, comparison: str, limit: int) -> List[Dict]:
+        if self.latency_seconds:
+            import asyncio
+
+            await asyncio.sleep(self.latency_seconds)
+        return self._match(topic, year, comparison, limit)
+
+    def _match(self, topic: str, year: int, comparison: str, limit: int) -> List[Dict]:
+        if self.error is not None:
+            raise self.error
+        terms = topic.lower().split()
+        matches = []
+        for paper in self.papers:
+            text = f"{paper.get('title', '')} {paper.get('summary', '')}".lower()
+            if all(term in text for term in terms) and _matches_year(paper["year"], year, comparison):
+                matches.append(paper)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+
+@register_search_backend
+class OpenAlexBackend(SearchBackend):
+    """
+    OpenAlex works search, which covers all disciplines and reports DOIs and
+    citation counts. Requests go through their own pooled client and rate limiter,
+    independent of the arXiv one.
+    """
+
+    name = "openalex"
+
+    def __init__(self, http_client: Optional[HttpClient] = None, api_url: str = OPENALEX_API_URL,
+                 mailto: Optional[str] = None):
+        self.http_client = http_client or HttpClient(timeout=10.0, max_retries=2,
+                                                     rate_limiter=TokenBucketRateLimiter(rate_per_second=5))
+        self.api_url = api_url
+        self.mailto = mailto
+
+    def search(self, topic: str, year: int, comparison: str, limit: int) -> List[Dict]:
+        params = {"search": topic, "per-page": limit}
+        year_filter = {"before": f"<{year}", "after": f">{year}", "in": str(year)}.get(comparison)
+        if year_filter:
+            params["filter"] = f"publication_year:{year_filter}"
+        if self.mailto:
+            params["mailto"] = self.mailto
+        response = self.http_client.get(self.api_url, params=params)
+        return [entry for entry in map(self._work_to_entry, response.json().get("results", [])) if entry]
+
+    @staticmethod
+    def _work_to_entry(work: Dict) -> Optional[Dict]:
+        if not work.get("publication_year"):
+            return None
+        location = work.get("primary_location") or {}
+        return {
+            "title": (work.get("display_name") or "N/A").strip(),
+            "authors": [
+                (authorship.get("author") or {}).get("display_name") or "N/A"
+                for authorship in work.get("authorships", [])
+            ],
+            "year": work["publication_year"],
+            "link": location.get("landing_page_url") or work.get("doi") or work.get("id") or "N/A",
+            "summary": _inverted_index_to_text(work.get("abstract_inverted_index")) or "N/A",
+            "doi": work.get("doi"),
+            "citations": work.get("cited_by_count"),
+        }
+
+
+def _inverted_index_to_text(inverted_index: Optional[Dict[str, List[int]]]) -> str:
+    if not inverted_index:
+        return ""
+    positions = {}
+    for word, offsets in inverted_index.items():
+        for offset in offsets:
+            positions[offset] = word
+    return " ".join(positions[offset] for offset in sorted(positions))
+
+
+# ======================
+# Merge & Rank
+# ======================
+def normalize_title(title: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", (title or "").lower()))
+
+
+def paper_identity_keys(paper: Dict) -> List[str]:
+    """Keys under which two records count as the same paper: DOI, arXiv id and normalized title."""
+    keys = []
+    doi = paper.get("doi")
+    if doi:
+        keys.append("doi:" + doi.lower().split("doi.org/", 1)[-1])
+    link = paper.get("link") or ""
+    if "arxiv.org/" in link:
+        arxiv_id = normalize_arxiv_id(link)
+        if arxiv_id:
+            keys.append("arxiv:" + arxiv_id)
+    title = normalize_title(paper.get("title"))
+    if title and title != "n a":
+        keys.append("title:" + title)
+    return keys
+
+
+def merge_results(results_by_source: Dict[str, List[Dict]], limit: int) -> List[Dict]:
+    """
+    Collapses duplicates across sources and ranks the merged papers by reciprocal
+    rank fusion, so papers that several sources rank highly come first. Each paper
+    lists the sources that returned it, and missing DOIs or citation counts are
+    filled in from the other copies.
+    """
+    merged: List[Dict] = []
+    scores: List[float] = []
+    index_by_key: Dict[str, int] = {}
+    for source, papers in results_by_source.items():
+        for rank, paper in enumerate(papers):
+            keys = paper_identity_keys(paper)
+            position = next((index_by_key[key] for key in keys if key in index_by_key), None)
+            if position is None:
+                position = len(merged)
+                merged.append({**paper, "sources": []})
+                scores.append(0.0)
+            else:
+                existing = merged[position]
+                if not existing.get("doi") and paper.get("doi"):
+                    existing["doi"] = paper["doi"]
+                if isinstance(paper.get("citations"), int) and (
+                        not isinstance(existing.get("citations"), int) or paper["citations"] > existing["citations"]):
+                    existing["citations"] = paper["citations"]
+            if source not in merged[position]["sources"]:
+                merged[position]["sources"].append(source)
+                scores[position] += 1.0 / (RRF_K + rank + 1)
+            for key in keys:
+                index_by_key.setdefault(key, position)
+    order = sorted(range(len(merged)), key=lambda i: scores[i], reverse=True)
+    return [merged[i] for i in order[:limit]]
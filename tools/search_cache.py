@@ -0,0 +1,115 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from tools import tracing
+
+
+# ======================
+# Search Result Cache (SQLite)
+# ======================
+class SearchCache:
+    """
+    Persistent cache for search results, keyed on normalized query parameters.
+    Entries expire after ttl_seconds and the table is kept to max_entries by
+    evicting the least recently used rows.
+    """
+
+    def __init__(self, path: str = ".search_cache.sqlite", ttl_seconds: float = 24 * 3600, max_entries: int = 1000,
+                 table: str = "search_cache", metric_prefix: str = "cache"):
+        """
+        table: SQLite table the entries live in, so other caches can reuse this class
+            without sharing rows with search results.
+        metric_prefix: hits and misses are recorded as <metric_prefix>.hits/.misses span attributes.
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.table = table
+        self.metric_prefix = metric_prefix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_accessed ON {table} (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(topic: str, year: int, comparison: str, **extra) -> str:
+        normalized = {
+            "topic": " ".join(str(topic).lower().split()),
+            "year": int(year),
+            "comparison": str(comparison).strip().lower(),
+            **extra,
+        }
+        return json.dumps(normalized, sort_keys=True)
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                tracing.add_to_attribute(f"{self.metric_prefix}.misses")
+                return None
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                tracing.add_to_attribute(f"{self.metric_prefix}.misses")
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        tracing.add_to_attribute(f"{self.metric_prefix}.hits")
+        return json.loads(value)
+
+    def set(self, key: str, value: List[Dict]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        if self.ttl_seconds is not None:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f" SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            (size,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": size,
+        }
@@ -0,0 +1,254 @@
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tools import tracing
+from tools.query_parser import extract_query_constraints
+
+# Words that carry no topic information in a research question.
+_FILLER_WORDS = frozenset(
+    "a an and any are about all article articles by can find for from get give has have i in is me "
+    "list look looking me of on or paper papers please publication publications published regarding "
+    "related research released search show some studies study that the to want was were which with "
+    "work works written".split()
+)
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_topic_text(text: str) -> str:
+    """Lowercases the query text, drops filler words and naive plurals, leaving the topic terms."""
+    words = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        if word in _FILLER_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return " ".join(words)
+
+
+# ======================
+# Local Embedders (CPU only)
+# ======================
+class SentenceTransformerEmbedder:
+    """Small sentence-transformers model run on the CPU; matches synonyms such as "equine"/"horses"."""
+
+    def __init__(self, model_name: str):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "The sentence-transformers package is required for semantic_cache embedding_model; "
+                "install it or unset the model to disable the cache."
+            ) from e
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self._lock = threading.Lock()
+        self.name = f"st-{model_name}"
+
+    def embed(self, text: str) -> np.ndarray:
+        with self._lock:
+            vector = self._model.encode(text, normalize_embeddings=True)
+        return np.asarray(vector, dtype=np.float32)
+
+
+def get_embedder(model_name: Optional[str] = None):
+    """
+    Returns the embedder for model_name, or None if no model is configured or it
+    can't be loaded. There is deliberately no lexical fallback: term-overlap
+    vectors score different topics that share most words ("... segmentation" /
+    "... classification") above any useful threshold.
+    """
+    if not model_name:
+        return None
+    try:
+        return SentenceTransformerEmbedder(model_name)
+    except ImportError as e:
+        print(f"Warning: {e} The semantic query cache is disabled.")
+        return None
+
+
+class _VectorGroup:
+    """Stacked embeddings of one constraint group, so a lookup is a single matrix-vector product."""
+
+    def __init__(self, ids: List[int], vectors: List[np.ndarray], created_at: List[float]):
+        self.ids = np.array(ids, dtype=np.int64)
+        self.created_at = np.array(created_at, dtype=np.float64)
+        self.matrix = np.vstack(vectors).astype(np.float32, copy=False)
+
+    def add(self, row_id: int, vector: np.ndarray, created_at: float) -> None:
+        self.ids = np.append(self.ids, row_id)
+        self.created_at = np.append(self.created_at, created_at)
+        self.matrix = np.vstack([self.matrix, vector])
+
+    def remove(self, row_ids) -> None:
+        keep = ~np.isin(self.ids, list(row_ids))
+        self.ids, self.created_at, self.matrix = self.ids[keep], self.created_at[keep], self.matrix[keep]
+
+    def nearest(self, embedding: np.ndarray, now: float, ttl_seconds: Optional[float]) -> Tuple[Optional[int], float]:
+        """Returns the id and cosine similarity of the closest unexpired vector, or (None, -1.0)."""
+        if not len(self.ids):
+            return None, -1.0
+        similarities = self.matrix @ embedding
+        if ttl_seconds is not None:
+            similarities[now - self.created_at > ttl_seconds] = -np.inf
+        best = int(np.argmax(similarities))
+        if similarities[best] == -np.inf:
+            return None, -1.0
+        return int(self.ids[best]), float(similarities[best])
+
+
+# ======================
+# Semantic Query Cache (SQLite)
+# ======================
+class SemanticQueryCache:
+    """
+    Caches final agent answers per research question. The year, comparison and
+    min_citations extracted from the query must match exactly, as must the scope
+    (a fingerprint of the search configuration that produced the answer); the
+    remaining topic text is embedded and the nearest cached question with cosine
+    similarity of at least similarity_threshold is returned. Vectors are kept in
+    memory as one matrix per group, and the table is bounded by least-recently-used
+    eviction.
+    """
+
+    def __init__(self, path: str, embedder, similarity_threshold: float = 0.85,
+                 max_entries: int = 2000, ttl_seconds: Optional[float] = 7 * 24 * 3600):
+        self.path = path
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.embedder = embedder
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_cache ("
+            " id INTEGER PRIMARY KEY,"
+            " embedder TEXT NOT NULL,"
+            " scope TEXT NOT NULL DEFAULT '',"
+            " year INTEGER NOT NULL,"
+            " comparison TEXT NOT NULL,"
+            " min_citations INTEGER NOT NULL,"
+            " query TEXT NOT NULL,"
+            " embedding BLOB NOT NULL,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        if "scope" not in {column for _, column, *_ in self._conn.execute("PRAGMA table_info(semantic_cache)")}:
+            # Tables written before answers were scoped by search configuration.
+            self._conn.execute("ALTER TABLE semantic_cache ADD COLUMN scope TEXT NOT NULL DEFAULT ''")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_semantic_cache_accessed ON semantic_cache (accessed_at)")
+        self._conn.commit()
+        # (scope, year, comparison, min_citations) -> stacked embeddings of that group's rows
+        self._vectors: Dict[Tuple, _VectorGroup] = {}
+        rows: Dict[Tuple, Tuple[List, List, List]] = {}
+        for row_id, scope, year, comparison, min_citations, blob, created_at in self._conn.execute(
+            "SELECT id, scope, year, comparison, min_citations, embedding, created_at"
+            " FROM semantic_cache WHERE embedder = ?",
+            (self.embedder.name,),
+        ):
+            ids, vectors, created = rows.setdefault((scope, year, comparison, min_citations), ([], [], []))
+            ids.append(row_id)
+            vectors.append(np.frombuffer(blob, dtype=np.float32))
+            created.append(created_at)
+        for group, (ids, vectors, created) in rows.items():
+            self._vectors[group] = _VectorGroup(ids, vectors, created)
+
+    def _prepare(self, query: str, scope: str) -> Tuple[Tuple, str]:
+        constraints = extract_query_constraints(query)
+        group = (scope, constraints["year"] or 0, constraints["comparison"] or "", constraints["min_citations"])
+        return group, normalize_topic_text(constraints["text"])
+
+    def _embed(self, topic_text: str) -> np.ndarray:
+        return np.asarray(self.embedder.embed(topic_text), dtype=np.float32)
+
+    def get(self, query: str, scope: str = "") -> Optional[str]:
+        group, topic_text = self._prepare(query, scope)
+        best_id, best_similarity = None, -1.0
+        if topic_text:
+            embedding = self._embed(topic_text)
+            now = time.time()
+            with self._lock:
+                if group in self._vectors:
+                    best_id, best_similarity = self._vectors[group].nearest(embedding, now, self.ttl_seconds)
+                if best_id is not None and best_similarity >= self.similarity_threshold:
+                    self._conn.execute("UPDATE semantic_cache SET accessed_at = ? WHERE id = ?", (now, best_id))
+                    self._conn.commit()
+                    (response,) = self._conn.execute(
+                        "SELECT response FROM semantic_cache WHERE id = ?", (best_id,)
+                    ).fetchone()
+                    self.hits += 1
+                    tracing.add_to_attribute("semantic_cache.hits")
+                    tracing.set_attribute("semantic_cache.similarity", best_similarity)
+                    return response
+        with self._lock:
+            self.misses += 1
+        tracing.add_to_attribute("semantic_cache.misses")
+        if best_id is not None:
+            tracing.set_attribute("semantic_cache.similarity", best_similarity)
+        return None
+
+    def set(self, query: str, response: str, scope: str = "") -> None:
+        group, topic_text = self._prepare(query, scope)
+        if not topic_text:
+            return
+        embedding = self._embed(topic_text)
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO semantic_cache"
+                " (embedder, scope, year, comparison, min_citations, query, embedding, response, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.embedder.name, *group, query, embedding.tobytes(), response, now, now),
+            )
+            if group in self._vectors:
+                self._vectors[group].add(cursor.lastrowid, embedding, now)
+            else:
+                self._vectors[group] = _VectorGroup([cursor.lastrowid], [embedding], [now])
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        expired = []
+        if self.ttl_seconds is not None:
+            expired = self._conn.execute(
+                "SELECT id FROM semantic_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).fetchall()
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM semantic_cache").fetchone()
+        overflow = count - len(expired) - self.max_entries
+        if overflow > 0:
+            expired_ids = {row_id for (row_id,) in expired}
+            expired += [
+                row for row in self._conn.execute("SELECT id FROM semantic_cache ORDER BY accessed_at ASC")
+                if row[0] not in expired_ids
+            ][:overflow]
+        if not expired:
+            return
+        self._conn.executemany("DELETE FROM semantic_cache WHERE id = ?", expired)
+        removed = {row_id for (row_id,) in expired}
+        for vectors in self._vectors.values():
+            vectors.remove(removed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM semantic_cache")
+            self._conn.commit()
+            self._vectors.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM semantic_cache").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": size,
+            "embedder": self.embedder.name,
+        }
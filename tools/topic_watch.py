@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import WATCH_CONFIG
+from tools import tracing
+from tools.atom_parser import AtomFeedParser
+from tools.citation_store import normalize_arxiv_id
+from tools.http_client import HttpClient, get_arxiv_client
+from tools.websearch_tool import ARXIV_API_URL, build_arxiv_params, is_last_page, submitted_since
+
+
+def topic_key(topic: str) -> str:
+    return " ".join(topic.lower().split())
+
+
+# ======================
+# Watch State (JSON file)
+# ======================
+class WatchState:
+    """
+    Per-topic high-water marks: the newest `published` timestamp seen and the
+    arXiv ids seen most recently (bounded to max_seen_ids). Saved atomically.
+    """
+
+    def __init__(self, path: str = ".watch_state.json", max_seen_ids: int = 500):
+        self.path = path
+        self.max_seen_ids = max_seen_ids
+        self._lock = threading.Lock()
+        self.topics: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.topics = json.load(f)
+
+    def get(self, topic: str) -> Dict:
+        with self._lock:
+            return dict(self.topics.get(topic_key(topic), {"published": None, "seen_ids": []}))
+
+    def advance(self, topic: str, papers: List[Dict]) -> None:
+        """Moves the topic's high-water mark to the newest of the given papers and saves the state."""
+        with self._lock:
+            entry = self.topics.setdefault(topic_key(topic), {"published": None, "seen_ids": []})
+            published = [paper["published"] for paper in papers if paper.get("published")]
+            if published:
+                entry["published"] = max([entry["published"] or "", *published])
+            seen_ids = [paper["arxiv_id"] for paper in papers] + entry["seen_ids"]
+            entry["seen_ids"] = list(dict.fromkeys(seen_ids))[:self.max_seen_ids]
+            entry["checked_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            self._save()
+
+    def _save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.topics, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+# ======================
+# Topic Watcher
+# ======================
+class TopicWatcher:
+    """
+    Fetches only the arXiv entries that appeared since a topic's last check.
+    The query is restricted to submissions at or after the high-water mark and
+    results come oldest first, so a quiet topic costs one small request and a
+    burst capped at max_new_per_run leaves the mark at the newest paper actually
+    reported; the rest are picked up by the next check. Ids already seen at the
+    boundary timestamp are skipped. A topic without state returns its newest
+    page_size entries as the baseline.
+    """
+
+    def __init__(self, state: WatchState, http_client: Optional[HttpClient] = None,
+                 api_url: str = ARXIV_API_URL, page_size: int = 10, max_new_per_run: int = 100):
+        self.state = state
+        self.http_client = http_client or get_arxiv_client()
+        self.api_url = api_url
+        self.page_size = page_size
+        self.max_new_per_run = max_new_per_run
+
+    def check(self, topic: str) -> List[Dict]:
+        """Returns the new papers for topic (newest first) and advances its high-water mark."""
+        with tracing.span("watch.check", topic=topic) as check_span:
+            mark = self.state.get(topic)
+            papers = self._fetch_since(topic, mark["published"], set(mark["seen_ids"]))
+            self.state.advance(topic, papers)
+            if check_span is not None:
+                check_span.set_attribute("watch.new_papers", len(papers))
+            return sorted(papers, key=lambda paper: paper["published"], reverse=True)
+
+    def _fetch_since(self, topic: str, since: Optional[str], seen_ids: set) -> List[Dict]:
+        if since:
+            # submittedDate has minute resolution, so the boundary minute is re-fetched and de-duplicated by id.
+            params = build_arxiv_params(topic, self.page_size, date_range=submitted_since(since), sort_order="ascending")
+        else:
+            params = build_arxiv_params(topic, self.page_size)
+
+        papers = []
+        start = 0
+        while True:
+            params["start"] = start
+            parser = AtomFeedParser()
+            response = self.http_client.get(self.api_url, params=params, stream=True)
+            try:
+                response.raw.decode_content = True
+                for entry in parser.iter_papers(response.raw):
+                    if since and entry["published"] < since:
+                        continue
+                    arxiv_id = normalize_arxiv_id(entry["link"])
+                    if arxiv_id in seen_ids:
+                        continue
+                    papers.append({**entry, "arxiv_id": arxiv_id})
+                    if len(papers) >= self.max_new_per_run:
+                        return papers
+            finally:
+                response.close()
+
+            start += parser.entry_count
+            if not since or is_last_page(parser, params["start"], self.page_size):
+                return papers
+
+
+# ======================
+# Staggered Scheduler
+# ======================
+class WatchScheduler:
+    """
+    Polls many topics once per interval, spreading their checks evenly across the
+    interval instead of bursting them at the start. All requests still go through
+    the shared arXiv rate limiter, so a long topic list never exceeds it.
+    """
+
+    def __init__(self, watcher: TopicWatcher, topics: List[str], interval_seconds: float = 24 * 3600):
+        self.watcher = watcher
+        self.topics = list(dict.fromkeys(topics))
+        self.interval_seconds = interval_seconds
+
+    def run_once(self, on_delta) -> None:
+        """Checks every topic back to back (e.g. from cron), calling on_delta(topic, papers)."""
+        for topic in self.topics:
+            self._check(topic, on_delta)
+
+    def run_forever(self, on_delta, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        if not self.topics:
+            return
+        spacing = self.interval_seconds / len(self.topics)
+        started = time.monotonic()
+        due = [(started + i * spacing, topic) for i, topic in enumerate(self.topics)]
+        while not stop.is_set():
+            due.sort()
+            next_due, topic = due[0]
+            if stop.wait(max(0.0, next_due - time.monotonic())):
+                return
+            self._check(topic, on_delta)
+            due[0] = (next_due + self.interval_seconds, topic)
+
+    def _check(self, topic: str, on_delta) -> None:
+        try:
+            papers = self.watcher.check(topic)
+        except Exception as e:
+            # One failing topic shouldn't stop the rest; its mark is unchanged, so the next run retries it.
+            print(f"Watch check failed for '{topic}': {e}")
+            return
+        on_delta(topic, papers)
+
+
+def load_topics(path: str) -> List[str]:
+    """One topic per line; blank lines and lines starting with '#' are ignored."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report papers published on watched arXiv topics since the last run.")
+    parser.add_argument("topics", help="Text file with one topic per line.")
+    parser.add_argument("output", help="JSONL file each topic's new papers are appended to.")
+    parser.add_argument("--state", default=WATCH_CONFIG["state_path"], help="High-water mark state file.")
+    parser.add_argument("--forever", action="store_true",
+                        help="Keep running, checking each topic once per --interval with staggered start times.")
+    parser.add_argument("--interval", type=float, default=WATCH_CONFIG["interval_seconds"])
+    args = parser.parse_args()
+
+    watcher = TopicWatcher(WatchState(args.state), page_size=WATCH_CONFIG["page_size"],
+                           max_new_per_run=WATCH_CONFIG["max_new_per_run"])
+    scheduler = WatchScheduler(watcher, load_topics(args.topics), interval_seconds=args.interval)
+
+    with open(args.output, "a", encoding="utf-8") as output_file:
+        def write_delta(topic: str, papers: List[Dict]) -> None:
+            checked_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            output_file.write(json.dumps({"topic": topic, "checked_at": checked_at, "new_papers": papers}) + "\n")
+            output_file.flush()
+            print(f"[{topic}] {len(papers)} new")
+
+        if args.forever:
+            scheduler.run_forever(write_delta)
+        else:
+            scheduler.run_once(write_delta)
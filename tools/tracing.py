@@ -0,0 +1,284 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Numeric span attributes whose name ends in one of these are also summed into counters.
+COUNTED_ATTRIBUTE_SUFFIXES = ("tokens", "bytes", "hits", "misses", "retries", "entries")
+
+
+# ======================
+# Spans
+# ======================
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    @property
+    def duration_seconds(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def add(self, key: str, value: float = 1) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + value
+
+    def to_otlp(self) -> Dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+# ======================
+# Metrics
+# ======================
+class Metrics:
+    """In-process counters and histograms rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            # [bucket counts..., count, sum]
+            histogram = self._histograms.setdefault(key, [0] * (len(DURATION_BUCKETS) + 2))
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    histogram[i] += 1
+            histogram[-2] += 1
+            histogram[-1] += value
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self._counters}):
+                lines.append(f"# TYPE {name} counter")
+                for (metric, labels), value in sorted(self._counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+            for name in sorted({name for name, _ in self._histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    for bound, count in zip(DURATION_BUCKETS, histogram):
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', str(bound)),))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram[-2]}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram[-2]}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Writes the metrics atomically, e.g. for node_exporter's textfile collector."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    def serve(self, port: int, host: str = "0.0.0.0") -> "ThreadingHTTPServer":
+        """Starts a background HTTP server exposing /metrics."""
+        # Imported here so processes that never serve metrics don't load the HTTP server stack.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def _format_labels(labels: Tuple) -> str:
+    if not labels:
+        return ""
+    escaped = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{key}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+# ======================
+# Tracer
+# ======================
+class Tracer:
+    """
+    Minimal span recorder. Spans nest through a context variable, so parent/child
+    links follow both threads and asyncio tasks. Finished spans are kept in a
+    bounded buffer for OTLP JSON export, and every span feeds a duration histogram
+    plus counters for numeric attributes such as tokens, bytes, cache hits and retries.
+    """
+
+    def __init__(self, metrics: Metrics, max_spans: int = 10000, enabled: bool = True):
+        self.metrics = metrics
+        self.enabled = enabled
+        self.service_name = "research-paper-agent"
+        self._finished = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        if not self.enabled:
+            yield None
+            return
+        parent = _current_span.get()
+        span = Span(name, parent.trace_id if parent else os.urandom(16).hex(),
+                    parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self._record(span)
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self._finished.append(span)
+        self.metrics.observe("research_agent_span_duration_seconds", span.duration_seconds, span=span.name)
+        if span.error:
+            self.metrics.inc("research_agent_span_errors_total", span=span.name)
+        for key, value in span.attributes.items():
+            if key.endswith(COUNTED_ATTRIBUTE_SUFFIXES) and isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.metrics.inc(f"research_agent_{key.replace('.', '_')}_total", value, span=span.name)
+
+    def finished_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._finished)
+
+    def export_otlp_json(self) -> Dict:
+        """Finished spans in the OTLP/JSON trace format (ExportTraceServiceRequest)."""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{
+                    "scope": {"name": "tools.tracing"},
+                    "spans": [span.to_otlp() for span in self.finished_spans()],
+                }],
+            }]
+        }
+
+    def write_otlp_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.export_otlp_json(), f)
+
+
+METRICS = Metrics()
+TRACER = Tracer(METRICS)
+
+
+def span(name: str, **attributes):
+    return TRACER.span(name, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def set_attribute(key: str, value) -> None:
+    """Sets an attribute on the active span, if any."""
+    active = _current_span.get()
+    if active is not None:
+        active.set_attribute(key, value)
+
+
+def add_to_attribute(key: str, value: float = 1) -> None:
+    """Adds to a numeric attribute on the active span, if any."""
+    active = _current_span.get()
+    if active is not None:
+        active.add(key, value)
+
+
+def trace_llm_calls(agent) -> None:
+    """
+    Wraps the agent's autogen client so every completion request is recorded as an
+    llm.completion span carrying the prompt/completion token counts.
+    """
+    client = getattr(agent, "client", None)
+    if client is None or getattr(client, "_traced", False):
+        return
+    create = client.create
+
+    def traced_create(*args, **kwargs):
+        with span("llm.completion", **{"llm.agent": agent.name}) as active:
+            response = create(*args, **kwargs)
+            usage = getattr(response, "usage", None)
+            if active is not None and usage is not None:
+                active.set_attribute("llm.prompt_tokens", getattr(usage, "prompt_tokens", 0) or 0)
+                active.set_attribute("llm.completion_tokens", getattr(usage, "completion_tokens", 0) or 0)
+            return response
+
+    client.create = traced_create
+    client._traced = True
+
+
+def export_telemetry(config: Dict) -> None:
+    """Writes traces and metrics to the paths set in TRACING_CONFIG, if any."""
+    if config.get("otlp_json_path"):
+        TRACER.write_otlp_json(config["otlp_json_path"])
+    if config.get("prometheus_textfile"):
+        METRICS.write_textfile(config["prometheus_textfile"])
@@ -1,76 +1,489 @@
+import contextvars
+import sys
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, wait
 import requests
-from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 import json
 
+from tools.atom_parser import AtomFeedParser
+from tools import tracing
+from tools.citation_store import CitationStore
+from tools.http_client import AsyncHttpClient, HttpClient, get_arxiv_client, get_async_arxiv_client
+from tools.local_index import LocalPaperIndex
+from tools.payload import PayloadStats, compact_results, encode_results, estimate_tokens
+from tools.result_store import ColumnarResultStore
+from tools.search_backends import SearchBackend, merge_results
+from tools.search_cache import SearchCache
+
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+# Open bounds of arXiv's submittedDate range syntax (YYYYMMDDHHMM).
+SUBMITTED_DATE_MIN = "190001010000"
+SUBMITTED_DATE_MAX = "999912312359"
+
+
+# ======================
+# arXiv Query Construction
+# ======================
+def submitted_date_range(year: Optional[int], comparison: Optional[str]) -> Optional[Tuple[str, str]]:
+    """The submittedDate bounds matching a year filter, or None without one."""
+    if comparison == "before":
+        return (SUBMITTED_DATE_MIN, f"{year - 1:04d}12312359")
+    if comparison == "after":
+        return (f"{year + 1:04d}01010000", SUBMITTED_DATE_MAX)
+    if comparison == "in":
+        return (f"{year:04d}01010000", f"{year:04d}12312359")
+    return None
+
+
+def submitted_since(published: str) -> Tuple[str, str]:
+    """The submittedDate bounds from an Atom timestamp ("2024-05-01T12:34:56Z") onwards, at minute resolution."""
+    return ("".join(ch for ch in published if ch.isdigit())[:12], SUBMITTED_DATE_MAX)
+
+
+def build_search_query(query: str, year: Optional[int], comparison: Optional[str],
+                       date_range: Optional[Tuple[str, str]] = None) -> str:
+    """
+    Builds the arXiv search_query, pushing the year filter down as a submittedDate
+    range so arXiv only returns entries that can pass the year check on results.
+    An explicit date_range (YYYYMMDDHHMM bounds) takes the place of the year filter.
+    The topic is grouped so the date range applies to all of its terms, not just the last.
+    """
+    search_query = f"all:{query}"
+    date_range = date_range or submitted_date_range(year, comparison)
+    if date_range:
+        search_query = f"({search_query}) AND submittedDate:[{date_range[0]} TO {date_range[1]}]"
+    return search_query
+
+
+def build_arxiv_params(query: str, page_size: int, year: Optional[int] = None, comparison: Optional[str] = None,
+                       date_range: Optional[Tuple[str, str]] = None, sort_order: str = "descending") -> Dict:
+    """Query parameters for one page of an arXiv search; callers set "start" per page."""
+    return {
+        "search_query": build_search_query(query, year, comparison, date_range),
+        "max_results": page_size,
+        "sortBy": "submittedDate",
+        "sortOrder": sort_order
+    }
+
+
+def is_last_page(parser: AtomFeedParser, start: int, page_size: int) -> bool:
+    """True once a page came back short or reached the feed's totalResults."""
+    return parser.entry_count < page_size or start + parser.entry_count >= parser.total_results
+
+
 # ======================
 # Web Search Tool (arXiv version)
 # ======================
 class ResearchPaperSearchTool:
-    def search(self, topic: str, year: int, comparison: str, min_citations: int) -> str:
+    def __init__(self, max_results: int = 10, page_size: int = 25, max_pages: int = 4,
+                 cache: Optional[SearchCache] = None, http_client: Optional[HttpClient] = None,
+                 async_http_client: Optional[AsyncHttpClient] = None,
+                 local_index: Optional[LocalPaperIndex] = None,
+                 citation_store: Optional[CitationStore] = None,
+                 payload_config: Optional[Dict] = None, api_url: str = ARXIV_API_URL,
+                 backends: Optional[List[SearchBackend]] = None, deadline_seconds: float = 10.0,
+                 result_store: Optional[ColumnarResultStore] = None, serve_from_result_store: bool = False):
+        """
+        max_results: number of matching papers to return.
+        page_size: entries requested from arXiv per round trip.
+        max_pages: upper bound on round trips per search.
+        cache: optional SearchCache consulted before hitting arXiv.
+        http_client: defaults to the shared, rate-limited arXiv client.
+        async_http_client: used by asearch; defaults to the shared client of the running loop.
+        local_index: if given, searches are answered offline from this index instead of arXiv.
+        citation_store: if given, results carry citation counts and are filtered by min_citations.
+        payload_config: field projection/compaction applied to the JSON returned to the LLM
+            (see RESULT_PAYLOAD_CONFIG); None returns every field uncompacted.
+        api_url: arXiv query endpoint, overridable to point at a mirror or stub server.
+        backends: extra sources queried in parallel with arXiv (or the local index);
+            results are merged, de-duplicated and ranked.
+        deadline_seconds: with backends, sources that haven't answered by then are
+            dropped from the result.
+        result_store: if given, every result is appended to this columnar store.
+        serve_from_result_store: also answer repeat arXiv/local searches from result_store,
+            ahead of cache; stored rows keep the citation counts they were written with.
+        """
+        self.max_results = max_results
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.cache = cache
+        self.http_client = http_client or get_arxiv_client()
+        self.async_http_client = async_http_client
+        self.local_index = local_index
+        self.citation_store = citation_store
+        self.payload_config = payload_config
+        self.payload_stats = PayloadStats()
+        self.api_url = api_url
+        self.backends = backends or []
+        self.deadline_seconds = deadline_seconds
+        self.result_store = result_store
+        self.serve_from_result_store = serve_from_result_store
+
+    @property
+    def primary_source(self) -> str:
+        return "local" if self.local_index is not None else "arxiv"
+
+    def config_fingerprint(self) -> str:
+        """
+        Identifies the settings that shape this tool's results (sources, citation
+        store, result count and payload), so caches of answers built on top of
+        the tool don't serve an answer produced under a different configuration.
+        """
+        return json.dumps({
+            "source": self.local_index.path if self.local_index is not None else self.api_url,
+            "backends": sorted(backend.name for backend in self.backends),
+            "citation_store": self._citation_generation(),
+            "max_results": self.max_results,
+            "payload": self.payload_config,
+        }, sort_keys=True, default=str)
+
+    def search(self, topic: str, year: int, comparison: str, min_citations: int, bypass_cache: bool = False,
+               include_summary: Optional[bool] = None) -> str:
         """
         Searches for research papers.
-        Note: The min_citations parameter is accepted, but the current arXiv API backend
-        does not provide citation data, so results are not filtered by it.
-        The 'citations' field in the results will reflect this.
+        Note: arXiv itself does not provide citation data. With a citation_store,
+        each result's 'citations' field holds its count and papers below
+        min_citations (or missing from the store) are dropped; without one,
+        min_citations is ignored and the 'citations' field reflects this.
+        Set bypass_cache to force a fresh arXiv request (the result still refreshes the cache).
+        include_summary overrides the payload_config setting for abstracts.
+        """
+        with self._search_span(topic, year, comparison):
+            try:
+                if self.backends:
+                    results, _ = self.federated_search(topic, year, comparison, min_citations, bypass_cache)
+                else:
+                    results = self._search_primary(topic, year, comparison, min_citations, bypass_cache)
+                return self._encode_payload(results, include_summary)
+            except Exception as e:
+                return self._error_payload(e)
+
+    async def asearch(self, topic: str, year: int, comparison: str, min_citations: int, bypass_cache: bool = False,
+                      include_summary: Optional[bool] = None) -> str:
+        """
+        Async counterpart of search(); returns the same JSON payload without blocking
+        the event loop on the arXiv request or on the cache, store and index lookups.
         """
+        with self._search_span(topic, year, comparison):
+            try:
+                if self.backends:
+                    results, _ = await self.afederated_search(topic, year, comparison, min_citations, bypass_cache)
+                else:
+                    results = await self._asearch_primary(topic, year, comparison, min_citations, bypass_cache)
+                return self._encode_payload(results, include_summary)
+            except Exception as e:
+                return self._error_payload(e)
+
+    def _search_span(self, topic: str, year: int, comparison: str):
+        return tracing.span("search_tool.search", topic=topic, year=year, comparison=comparison,
+                            backend="federated" if self.backends else self.primary_source)
+
+    def federated_search(self, topic: str, year: int, comparison: str, min_citations: int,
+                         bypass_cache: bool = False) -> Tuple[List[Dict], Dict[str, str]]:
+        """
+        Queries the primary source and every backend in parallel, waits at most
+        deadline_seconds, and merges whatever answered. Returns the merged papers
+        and each source's status: "ok", "timeout" or "error: ...". Sources that
+        miss the deadline keep running in the background but are ignored.
+        """
+        calls = {self.primary_source: lambda: self._search_primary(topic, year, comparison, min_citations, bypass_cache)}
+        for backend in self.backends:
+            calls[backend.name] = lambda backend=backend: self._search_backend(backend, topic, year, comparison, min_citations)
+
+        executor = ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="search-backend")
         try:
-            results = self._search_arxiv(topic, year, comparison, min_citations_requested=min_citations)
-            return json.dumps(results)
-        except requests.exceptions.RequestException as re:
-            print(f"HTTP Request error during search: {str(re)}")
-            return json.dumps([{"error": "Failed to connect to arXiv API.", "details": str(re)}])
-        except ET.ParseError as pe:
-            print(f"XML Parsing error: {str(pe)}")
-            return json.dumps([{"error": "Failed to parse arXiv API response.", "details": str(pe)}])
-        except Exception as e:
-            print(f"Generic search error: {str(e)}")
-            return json.dumps([{"error": "An unexpected error occurred during search.", "details": str(e)}])
+            # Each thread runs in a copy of this context so its spans nest under the search span.
+            futures = {name: executor.submit(contextvars.copy_context().run, call) for name, call in calls.items()}
+            done, _ = wait(futures.values(), timeout=self.deadline_seconds)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return self._merge_outcomes(self._collect_outcomes(futures, done))
+
+    async def afederated_search(self, topic: str, year: int, comparison: str, min_citations: int,
+                                bypass_cache: bool = False) -> Tuple[List[Dict], Dict[str, str]]:
+        """Async counterpart of federated_search(); late sources are cancelled at the deadline."""
+        import asyncio
+
+        tasks = {self.primary_source: asyncio.ensure_future(
+            self._asearch_primary(topic, year, comparison, min_citations, bypass_cache))}
+        for backend in self.backends:
+            tasks[backend.name] = asyncio.ensure_future(
+                self._asearch_backend(backend, topic, year, comparison, min_citations))
+        done, pending = await asyncio.wait(tasks.values(), timeout=self.deadline_seconds)
+        for task in pending:
+            task.cancel()
+        return self._merge_outcomes(self._collect_outcomes(tasks, done))
+
+    @staticmethod
+    def _collect_outcomes(futures: Dict[str, object], done) -> Dict[str, object]:
+        """Maps each source's future (or asyncio task) to what _merge_outcomes expects."""
+        outcomes = {}
+        for name, future in futures.items():
+            if future not in done:
+                outcomes[name] = None
+            elif future.exception() is not None:
+                outcomes[name] = future.exception()
+            else:
+                outcomes[name] = future.result()
+        return outcomes
+
+    def _merge_outcomes(self, outcomes: Dict[str, object]) -> Tuple[List[Dict], Dict[str, str]]:
+        """outcomes maps each source to its papers, the exception it raised, or None on timeout."""
+        statuses = {}
+        results_by_source = {}
+        for name, outcome in outcomes.items():
+            if outcome is None:
+                statuses[name] = "timeout"
+            elif isinstance(outcome, BaseException):
+                statuses[name] = f"error: {type(outcome).__name__}: {outcome}"
+            else:
+                statuses[name] = "ok"
+                results_by_source[name] = outcome
+        tracing.set_attribute("federation.answered", ",".join(sorted(results_by_source)))
+        tracing.set_attribute("federation.statuses", json.dumps(statuses, sort_keys=True))
+
+        primary_outcome = outcomes[self.primary_source]
+        if not results_by_source and isinstance(primary_outcome, BaseException):
+            # Nothing answered, so report the primary source's failure as a non-federated search would.
+            raise primary_outcome
+        return merge_results(results_by_source, self.max_results), statuses
+
+    def _search_primary(self, topic: str, year: int, comparison: str, min_citations: int,
+                        bypass_cache: bool = False) -> List[Dict]:
+        results = self._lookup_primary(topic, year, comparison, min_citations, bypass_cache)
+        if results is None:
+            if self.local_index is not None:
+                results = self._search_local(topic, year, comparison, min_citations)
+            else:
+                results = self._search_arxiv(topic, year, comparison, min_citations)
+            self._remember_primary(topic, year, comparison, min_citations, results)
+        return results
+
+    async def _asearch_primary(self, topic: str, year: int, comparison: str, min_citations: int,
+                               bypass_cache: bool = False) -> List[Dict]:
+        import asyncio
+
+        # The result store, cache and local index are blocking sqlite/mmap calls, so they run in a thread.
+        results = await asyncio.to_thread(self._lookup_primary, topic, year, comparison, min_citations, bypass_cache)
+        if results is None:
+            if self.local_index is not None:
+                results = await asyncio.to_thread(self._search_local, topic, year, comparison, min_citations)
+            else:
+                results = await self._asearch_arxiv(topic, year, comparison, min_citations)
+            await asyncio.to_thread(self._remember_primary, topic, year, comparison, min_citations, results)
+        return results
+
+    def _lookup_primary(self, topic: str, year: int, comparison: str, min_citations: int,
+                        bypass_cache: bool) -> Optional[List[Dict]]:
+        """Answers a primary search from the result store or the cache, or returns None."""
+        if bypass_cache:
+            return None
+        if self.result_store is not None and self.serve_from_result_store:
+            results = self.result_store.lookup_query(self._store_key(topic, year, comparison, min_citations))
+            if results is not None:
+                tracing.set_attribute("result_store.hit", True)
+                return results
+        if self.cache is not None and self.local_index is None:
+            return self.cache.get(self._cache_key(topic, year, comparison, min_citations))
+        return None
+
+    def _remember_primary(self, topic: str, year: int, comparison: str, min_citations: int,
+                          results: List[Dict]) -> None:
+        """Writes freshly fetched primary results to the cache and the result store."""
+        if self.cache is not None and self.local_index is None:
+            self.cache.set(self._cache_key(topic, year, comparison, min_citations), results)
+        if self.result_store is not None:
+            row_ids = self.result_store.append(results)
+            self.result_store.record_query(self._store_key(topic, year, comparison, min_citations), row_ids)
+
+    def _store_key(self, topic: str, year: int, comparison: str, min_citations: int) -> str:
+        return SearchCache.make_key(topic, year, comparison, min_citations=min_citations,
+                                    max_results=self.max_results, source=self.primary_source,
+                                    citation_store=self._citation_generation())
+
+    def _citation_generation(self) -> Optional[str]:
+        # Results depend on whether (and which) citation store filled in counts and applied min_citations.
+        return self.citation_store.generation if self.citation_store is not None else None
+
+    def _search_backend(self, backend: SearchBackend, topic: str, year: int, comparison: str,
+                        min_citations: int) -> List[Dict]:
+        with tracing.span("search_backend.search", source=backend.name) as backend_span:
+            entries = backend.search(topic, year, comparison, limit=self.max_results)
+            return self._parse_backend_entries(backend_span, entries, year, comparison, min_citations)
+
+    async def _asearch_backend(self, backend: SearchBackend, topic: str, year: int, comparison: str,
+                               min_citations: int) -> List[Dict]:
+        with tracing.span("search_backend.search", source=backend.name) as backend_span:
+            entries = await backend.asearch(topic, year, comparison, limit=self.max_results)
+            return self._parse_backend_entries(backend_span, entries, year, comparison, min_citations)
+
+    def _parse_backend_entries(self, backend_span, entries: List[Dict], year: int, comparison: str,
+                               min_citations: int) -> List[Dict]:
+        papers = []
+        for entry in entries:
+            paper_dict = self._parse_entry(entry, year, comparison, min_citations)
+            if paper_dict:
+                papers.append(paper_dict)
+        if backend_span is not None:
+            backend_span.set_attribute("result.papers", len(papers))
+        return papers
+
+    def _encode_payload(self, results: List[Dict], include_summary: Optional[bool] = None) -> str:
+        full_payload = json.dumps(results)
+        if self.payload_config is None:
+            payload = full_payload
+        else:
+            config = self.payload_config
+            if include_summary is None:
+                include_summary = config.get("include_summary", False)
+            compacted = compact_results(
+                results,
+                fields=config.get("fields", ("title", "authors", "year", "link")),
+                include_summary=include_summary,
+                summary_max_chars=config.get("summary_max_chars"),
+                max_authors=config.get("max_authors"),
+            )
+            payload = encode_results(compacted, compact_json=config.get("compact_json", True))
+        self.payload_stats.record(payload, full_payload)
+        tracing.set_attribute("result.papers", len(results))
+        tracing.set_attribute("payload.bytes", len(payload))
+        tracing.set_attribute("payload.estimated_tokens", estimate_tokens(payload))
+        return payload
+
+    @staticmethod
+    def _error_payload(e: Exception) -> str:
+        tracing.set_attribute("error", f"{type(e).__name__}: {e}")
+        # httpx is only loaded by the async client, so an httpx error implies it is in sys.modules.
+        httpx = sys.modules.get("httpx")
+        http_errors = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx else ())
+        if isinstance(e, http_errors):
+            print(f"HTTP Request error during search: {str(e)}")
+            return json.dumps([{"error": "Failed to connect to arXiv API.", "details": str(e)}])
+        if isinstance(e, ET.ParseError):
+            print(f"XML Parsing error: {str(e)}")
+            return json.dumps([{"error": "Failed to parse arXiv API response.", "details": str(e)}])
+        print(f"Generic search error: {str(e)}")
+        return json.dumps([{"error": "An unexpected error occurred during search.", "details": str(e)}])
+
+    def _cache_key(self, topic: str, year: int, comparison: str, min_citations: int) -> str:
+        return self.cache.make_key(topic, year, comparison, min_citations=min_citations, max_results=self.max_results,
+                                   citation_store=self._citation_generation())
+
+    def _search_local(self, query: str, year: int, comparison: str, min_citations_requested: int) -> List[Dict]:
+        """
+        Over-fetches from the index when the citation floor drops entries: the limit
+        doubles until max_results papers pass, the matches run out, or as many
+        entries were scanned as an arXiv search would (page_size * max_pages).
+        """
+        max_scanned = max(self.max_results, self.page_size * self.max_pages)
+        limit = self.max_results
+        while True:
+            entries = self.local_index.search(query, year, comparison, limit=limit)
+            papers = []
+            if self._accept_entries(entries, papers, year, comparison, min_citations_requested):
+                return papers
+            if len(entries) < limit or limit >= max_scanned:
+                return papers
+            limit = min(limit * 2, max_scanned)
 
     def _search_arxiv(self, query: str, year: int, comparison: str, min_citations_requested: int) -> List[Dict]:
-        url = "http://export.arxiv.org/api/query"
-        params = {
-            "search_query": f"all:{query}",
-            "start": 0,
-            "max_results": 10,
-            "sortBy": "submittedDate",
-            "sortOrder": "descending"
-        }
+        params = build_arxiv_params(query, self.page_size, year, comparison)
+
+        papers = []
+        for page in range(self.max_pages):
+            params["start"] = page * self.page_size
+            parser = AtomFeedParser()
+            response = self.http_client.get(self.api_url, params=params, stream=True)
+            try:
+                # The body is streamed, so this span covers both reading and parsing it.
+                with tracing.span("atom.parse", start=params["start"]) as parse_span:
+                    try:
+                        response.raw.decode_content = True
+                        if self._accept_entries(parser.iter_papers(response.raw), papers,
+                                                year, comparison, min_citations_requested):
+                            return papers
+                    finally:
+                        self._record_parse(parse_span, parser)
+            finally:
+                response.close()
 
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        root = ET.fromstring(response.content)
+            if is_last_page(parser, params["start"], self.page_size):
+                break
+        return papers
+
+    async def _asearch_arxiv(self, query: str, year: int, comparison: str, min_citations_requested: int) -> List[Dict]:
+        http_client = self.async_http_client or get_async_arxiv_client()
+        params = build_arxiv_params(query, self.page_size, year, comparison)
 
         papers = []
-        for entry in root.findall('{http://www.w3.org/2005/Atom}entry'):
+        for page in range(self.max_pages):
+            params["start"] = page * self.page_size
+            parser = AtomFeedParser()
+            async with http_client.stream(self.api_url, params=params) as response:
+                with tracing.span("atom.parse", start=params["start"]) as parse_span:
+                    try:
+                        async for chunk in response.aiter_bytes():
+                            if self._accept_entries(parser.feed(chunk), papers,
+                                                    year, comparison, min_citations_requested):
+                                return papers
+                        parser.close()
+                    finally:
+                        self._record_parse(parse_span, parser)
+
+            if is_last_page(parser, params["start"], self.page_size):
+                break
+        return papers
+
+    def _accept_entries(self, entries: Iterable[Dict], papers: List[Dict], year: int, comparison: str,
+                        min_citations_requested: int) -> bool:
+        """Appends the entries that pass _parse_entry to papers; True once max_results is reached."""
+        for entry in entries:
             paper_dict = self._parse_entry(entry, year, comparison, min_citations_requested)
             if paper_dict:
                 papers.append(paper_dict)
-        return papers[:10] # return top 10 papers
+                if len(papers) >= self.max_results:
+                    return True
+        return False
 
-    def _parse_entry(self, entry, target_year: int, comparison: str, min_citations_requested: int) -> Dict:
-        try:
-            published_str = entry.findtext('{http://www.w3.org/2005/Atom}published')
-            if not published_str:
-                return None
-            paper_year = datetime.strptime(published_str, '%Y-%m-%dT%H:%M:%SZ').year
+    @staticmethod
+    def _record_parse(parse_span, parser: AtomFeedParser) -> None:
+        if parse_span is not None:
+            parse_span.set_attribute("parse.bytes", parser.bytes_parsed)
+            parse_span.set_attribute("parse.entries", parser.entry_count)
 
-            if comparison == "before" and paper_year >= target_year:
-                return None
-            if comparison == "after" and paper_year <= target_year:
+    def _parse_entry(self, entry: Dict, target_year: int, comparison: str, min_citations_requested: int) -> Optional[Dict]:
+        paper_year = entry["year"]
+        if comparison == "before" and paper_year >= target_year:
+            return None
+        if comparison == "after" and paper_year <= target_year:
+            return None
+        if comparison == "in" and paper_year != target_year:
+            return None
+
+        # Backends such as OpenAlex report their own counts; the citation store takes precedence.
+        citations = entry.get("citations")
+        if self.citation_store is not None:
+            stored = self.citation_store.get(entry["link"])
+            citations = stored if stored is not None else citations
+        if isinstance(citations, int):
+            if min_citations_requested and citations < min_citations_requested:
                 return None
-            if comparison == "in" and paper_year != target_year:
+        elif self.citation_store is not None:
+            if min_citations_requested:
                 return None
+            citations = "N/A (not in citation store)"
+        else:
+            citations = "N/A (arXiv API)"
 
-            return {
-                "title": entry.findtext('{http://www.w3.org/2005/Atom}title', 'N/A').strip(),
-                "authors": [author.findtext('{http://www.w3.org/2005/Atom}name', 'N/A')
-                            for author in entry.findall('{http://www.w3.org/2005/Atom}author')],
-                "year": paper_year,
-                "link": entry.findtext('{http://www.w3.org/2005/Atom}id', 'N/A'),
-                "summary": entry.findtext('{http://www.w3.org/2005/Atom}summary', 'N/A').strip(),
-                "citations": "N/A (arXiv API)"
-            }
-        except Exception as e:
-            return None
\ No newline at end of file
+        paper = {
+            "title": entry["title"],
+            "authors": entry["authors"],
+            "year": paper_year,
+            "link": entry["link"],
+            "summary": entry["summary"],
+            "citations": citations
+        }
+        if entry.get("doi"):
+            paper["doi"] = entry["doi"]
+        return paper